@@ -0,0 +1,63 @@
+"""Benchmark remove_diacritics against the original NFKD-only implementation.
+
+Run from the repository root with:
+
+    python benchmarks/bench_remove_diacritics.py
+
+The test data is mostly plain ASCII names with some accented ones, roughly
+what a HEAT export looks like.
+"""
+
+import random
+import timeit
+
+import pandas as pd
+
+from heat_helper.names import _strip_diacritics_nfkd, remove_diacritics
+
+N_ROWS = 100_000
+REPEATS = 5
+
+ASCII_NAMES = ["Jane Doe", "Muhammad Khan", "Olivia Smith", "Jack O'Neill", "Amelia Jones"]
+ACCENTED_NAMES = ["Chloë Brontë", "José Muñoz", "Zoë Łukasz", "Renée Dvořák", "Siân Ó Súilleabháin"]
+
+
+def original(text: str) -> str:
+    """remove_diacritics before the ASCII and translation table fast paths."""
+    return _strip_diacritics_nfkd(text)
+
+
+def make_names(accented_share: float) -> list[str]:
+    rng = random.Random(0)
+    return [
+        rng.choice(ACCENTED_NAMES if rng.random() < accented_share else ASCII_NAMES)
+        for _ in range(N_ROWS)
+    ]
+
+
+def best_of(statement) -> float:
+    return min(timeit.repeat(statement, number=1, repeat=REPEATS))
+
+
+def main() -> None:
+    print(f"{N_ROWS:,} names, best of {REPEATS} runs (seconds)")
+    print(f"{'accented':>9} {'original':>9} {'scalar':>9} {'series':>9} {'unique':>9}")
+    for accented_share in (0.0, 0.1, 0.5, 1.0):
+        names = make_names(accented_share)
+        repeated = pd.Series(names)
+        # Unique names defeat the Series path's distinct-value step
+        unique = pd.Series([f"{name} {i}" for i, name in enumerate(names)])
+        assert remove_diacritics(unique).tolist() == [original(name) for name in unique]
+
+        t_original = best_of(lambda: [original(name) for name in names])
+        t_scalar = best_of(lambda: [remove_diacritics(name) for name in names])
+        t_series = best_of(lambda: remove_diacritics(repeated))
+        t_unique = best_of(lambda: remove_diacritics(unique))
+        print(
+            f"{accented_share:>9.0%} {t_original:>9.3f} {t_scalar:>9.3f} "
+            f"{t_series:>9.3f} {t_unique:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
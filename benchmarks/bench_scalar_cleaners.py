@@ -0,0 +1,104 @@
+"""Micro-benchmarks for the public scalar cleaners.
+
+These functions are usually called once per row, so a small slowdown in any of
+them adds up on a large DataFrame. Run from the repository root with:
+
+    python benchmarks/bench_scalar_cleaners.py
+
+To check for regressions, save the timings before a change and compare after:
+
+    python benchmarks/bench_scalar_cleaners.py --save before.json
+    python benchmarks/bench_scalar_cleaners.py --compare before.json
+
+Timings more than --tolerance (default 20%) slower than the saved ones are
+flagged, and the script exits with status 1.
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from datetime import date
+
+import pandas as pd
+
+import heat_helper as hh
+
+CALLS = 20_000
+REPEATS = 5
+
+NAMES = ["JANE DOE", "chloë  o'neill", "sarah - jane smith", "mcdonald", "Jane Doe 2", "Zoë Łukasz"]
+POSTCODES = ["sw1a 1aa", "M1 1AE", "b33  8th", "CR2 6XH", "dn551pt", "not a postcode"]
+YEAR_GROUPS = ["Year 7", "Y10", "reception", 9, "year group 11", "13"]
+DATES = [date(2010, 3, 4), date(2008, 12, 25), date(2012, 9, 1), date(2015, 1, 31)]
+COLUMNS = pd.DataFrame(columns=["First Name", "LastName", "Date of Birth", "Post-Code", "studentID", "Year Group"])
+
+# Name, function, arguments it is called with (cycled through)
+CASES = [
+    ("format_name", hh.format_name, [(name,) for name in NAMES]),
+    ("find_numbers_in_text", hh.find_numbers_in_text, [(name,) for name in NAMES]),
+    ("remove_numbers", hh.remove_numbers, [(name,) for name in NAMES]),
+    ("remove_diacritics", hh.remove_diacritics, [(name,) for name in NAMES]),
+    ("remove_punctuation", hh.remove_punctuation, [(name,) for name in NAMES]),
+    ("create_full_name", hh.create_full_name, [("Jane", "Doe"), (" Mary ", "Smith", "Ann")]),
+    ("canonical_first_name", hh.canonical_first_name, [("Mike",), ("Jane",), ("BEX",)]),
+    ("format_postcode", lambda p: hh.format_postcode(p, errors="coerce"), [(p,) for p in POSTCODES]),
+    ("clean_year_group", hh.clean_year_group, [(y,) for y in YEAR_GROUPS]),
+    ("calculate_year_group_from_date", hh.calculate_year_group_from_date, [(d,) for d in DATES]),
+    ("calculate_dob_range_from_year_group", hh.calculate_dob_range_from_year_group, [(y,) for y in YEAR_GROUPS]),
+    ("reverse_date", hh.reverse_date, [(d,) for d in DATES]),
+    ("convert_col_snake_case", hh.convert_col_snake_case, [(COLUMNS,)]),
+]
+
+
+def time_case(function, arguments) -> float:
+    """Best time per call, in microseconds."""
+    calls = [arguments[i % len(arguments)] for i in range(CALLS)]
+
+    def run():
+        for args in calls:
+            function(*args)
+
+    return min(timeit.repeat(run, number=1, repeat=REPEATS)) / CALLS * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save", help="write the timings to this JSON file")
+    parser.add_argument("--compare", help="compare the timings with this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown when comparing (default 0.2)")
+    parser.add_argument("cases", nargs="*", help="only run these functions")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    timings = {}
+    regressions = []
+    print(f"{CALLS:,} calls, best of {REPEATS} runs (microseconds per call)")
+    for name, function, arguments in CASES:
+        if args.cases and name not in args.cases:
+            continue
+        timings[name] = time_case(function, arguments)
+        line = f"{name:<38} {timings[name]:>9.2f}"
+        if name in baseline:
+            change = timings[name] / baseline[name] - 1
+            line += f" {change:>+8.0%}"
+            if change > args.tolerance:
+                line += "  SLOWER"
+                regressions.append(name)
+        print(line)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(timings, f, indent=2)
+    if regressions:
+        print(f"Slower than {args.compare}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,11 +9,20 @@ from .names import (
     create_full_name,
     remove_diacritics,
     remove_punctuation,
+    clean_names,
+    canonical_first_name,
 )
 
 from .dates import reverse_date, calculate_dob_range_from_year_group
 
-from .postcode import format_postcode
+from .postcode import (
+    format_postcode,
+    split_postcode,
+    build_postcode_index,
+    postcode_exists,
+    lookup_postcode,
+    correct_postcode,
+)
 
 from .yeargroup import clean_year_group, calculate_year_group_from_date
 
@@ -25,7 +34,15 @@ from .matching import (
 
 from .updates import get_updates, get_contextual_updates
 
-from .duplicates import find_duplicates
+from .duplicates import (
+    find_duplicates,
+    build_duplicate_index,
+    find_new_duplicates,
+    find_heat_duplicates,
+    resolve_duplicates,
+    find_duplicates_in_csv,
+    find_duplicates_in_files,
+)
 
 def __getattr__(name):
     # Deferred so that importing heat_helper does not import validation.py,
@@ -44,6 +61,11 @@ __all__ = [
     "calculate_dob_range_from_year_group",
     "clean_year_group",
     "format_postcode",
+    "split_postcode",
+    "build_postcode_index",
+    "postcode_exists",
+    "lookup_postcode",
+    "correct_postcode",
     "get_excel_filepaths_in_folder",
     "format_name",
     "find_numbers_in_text",
@@ -59,6 +81,14 @@ __all__ = [
     "get_contextual_updates",
     "convert_col_snake_case",
     "find_duplicates",
+    "build_duplicate_index",
+    "find_new_duplicates",
+    "find_heat_duplicates",
+    "resolve_duplicates",
+    "find_duplicates_in_csv",
+    "find_duplicates_in_files",
     "remove_punctuation",
+    "clean_names",
+    "canonical_first_name",
     "create_error_report"
 ]
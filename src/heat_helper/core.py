@@ -1,6 +1,7 @@
 import re
 from datetime import date
 import math
+import numpy as np
 import pandas as pd
 
 
@@ -29,9 +30,58 @@ POSTCODE_REGEX = r"^[A-Z]{1,2}[0-9][A-Z0-9]? [0-9][A-Z]{2}$"
 # Used to calculate current academic year for year group / date manipulation functions
 CURRENT_ACADEMIC_YEAR_START = _calc_current_academic_year_start(date.today())
 
+# Used to find and remove numbers in text
+_DIGITS = re.compile(r"[0-9]+")
+
+# Patterns used by the helper functions below, compiled once rather than on every call
+_POSTCODE = re.compile(POSTCODE_REGEX)
+_YEAR_GROUP_NUMBER = re.compile(r"\d+")
+_CAMEL_WORD = re.compile("(.)([A-Z][a-z]+)")
+_CAMEL_BOUNDARY = re.compile("([a-z0-9])([A-Z])")
+_NOT_SNAKE = re.compile(r"[^a-zA-Z0-9\s_]")
+_SNAKE_SEPARATORS = re.compile(r"[_\s]+")
+
 # Used to remove punctuation except hyphens and apostrophes
 PUNCTUATION = '!@#£$%^&*()_=+`~,.<>/?;:"\\|[]'
 
+# Used by canonical_first_name: formal first name -> common nicknames for it.
+# Only nicknames that point to one name for one gender are included. A nickname is left
+# out if it is short for more than one name (Ed: Edward, Edwin, Edmund; Fred: Frederick,
+# Alfred; Rick: Richard, Frederick, Eric), if it is used by both genders (Alex, Sam, Dan:
+# Danielle, Rob: Roberta, Nick: Nicola, Steph: Stephen), if it is short for names spelt
+# more than one way (Larry: Lawrence, Laurence; Kate: Katherine, Catherine), or if it is
+# a common name in its own right (Ben, Jake, Freddie, Lottie, Pippa). A wrong alias
+# would make two different students match exactly, so when in doubt a nickname is left out.
+NICKNAMES = {
+    "Barbara": ("babs",),
+    "Benjamin": ("benji",),
+    "David": ("dave", "davey"),
+    "Dorothy": ("dot", "dottie"),
+    "Elizabeth": ("liz", "lizzie", "lizzy", "betty", "bess", "bessie"),
+    "Gillian": ("gill",),
+    "Gregory": ("greg",),
+    "James": ("jim", "jimmy"),
+    "Joshua": ("josh",),
+    "Kenneth": ("ken",),
+    "Kevin": ("kev",),
+    "Margaret": ("maggie", "peggy"),
+    "Michael": ("mike", "mikey"),
+    "Natasha": ("tash",),
+    "Pamela": ("pam",),
+    "Patricia": ("trish",),
+    "Peter": ("pete",),
+    "Rebecca": ("becky", "becca", "bex"),
+    "Reginald": ("reg",),
+    "Richard": ("rich", "richie", "dick"),
+    "Robert": ("bob",),
+    "Sebastian": ("seb",),
+    "Thomas": ("tom", "tommy"),
+    "Timothy": ("tim", "timmy"),
+    "Vincent": ("vince",),
+    "Walter": ("walt",),
+    "William": ("bill",),
+}
+
 # For matching functions
 STUDENT_HEAT_ID = "Student HEAT ID"
 
@@ -66,7 +116,7 @@ def _parse_year_group_to_int(year_group: str | int | pd.Series) -> int | pd.Seri
         clean_input = year_group.strip().lower()
         if clean_input in RECEPTION_ALIASES:
             return 0
-        match = re.search(r"\d+", clean_input)
+        match = _YEAR_GROUP_NUMBER.search(clean_input)
         if not match:
             raise InvalidYearGroupError(year_group)
         int_year_group = int(match.group())
@@ -82,7 +132,7 @@ def _parse_year_group_to_int(year_group: str | int | pd.Series) -> int | pd.Seri
 
 
 def _string_contains_int(string: str) -> bool:
-    return bool(re.search(r"[0-9]+", string))
+    return _DIGITS.search(string) is not None
 
 
 def _is_valid_postcode(postcode: str) -> bool:
@@ -103,16 +153,61 @@ def _is_valid_postcode(postcode: str) -> bool:
         return False
 
     # Check against the Regex
-    return bool(re.match(POSTCODE_REGEX, postcode))
+    return _POSTCODE.match(postcode) is not None
 
 
 def _to_snake(name: str) -> str:
     # 1. Handle CamelCase (e.g., FirstName -> First_Name)
-    s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name.strip())
-    s2 = re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1)
+    s1 = _CAMEL_WORD.sub(r"\1_\2", name.strip())
+    s2 = _CAMEL_BOUNDARY.sub(r"\1_\2", s1)
 
     # 2. Remove special characters (keep only alphanumeric and spaces)
-    clean = re.sub(r"[^a-zA-Z0-9\s_]", "", s2)
+    clean = _NOT_SNAKE.sub("", s2)
 
     # 3. Collapse whitespace, lower, and underscore
-    return re.sub(r"[_\s]+", "_", clean.strip()).lower()
+    return _SNAKE_SEPARATORS.sub("_", clean.strip()).lower()
+
+
+def _factorize_distinct(series: pd.Series) -> tuple[np.ndarray, pd.Series]:
+    """Splits a Series into its distinct values and a code per row.
+
+    Cleaning columns with many repeats (year groups, school names, postcodes) is
+    much quicker when each distinct value is cleaned once and the results are
+    mapped back with `distinct_results.take(codes)`.
+
+    Values are only treated as the same if they are equal AND of the same type,
+    because pandas alone would group 1, 1.0 and True (or None and NaN) together
+    and the cleaners treat these differently. Each distinct value is the first
+    original object seen, in order of first appearance.
+
+    Returns:
+        An array of codes (one per row of series) and an object Series of the
+        distinct values, positioned by code.
+    """
+    values = series.to_numpy(dtype=object)
+    try:
+        value_codes, _ = pd.factorize(values, use_na_sentinel=False)
+    except TypeError:
+        # Unhashable values (e.g. lists) cannot be grouped, so every row is distinct
+        return np.arange(len(values)), pd.Series(values, dtype=object)
+
+    # Columns of only strings (checked in C by infer_dtype) need no type codes
+    if series.dtype == object and pd.api.types.infer_dtype(values, skipna=False) != "string":
+        type_ids = {}
+        type_codes = np.fromiter(
+            (type_ids.setdefault(type(value), len(type_ids)) for value in values),
+            dtype=np.int64,
+            count=len(values),
+        )
+        value_codes = value_codes.astype(np.int64) * max(len(type_ids), 1) + type_codes
+    codes, _ = pd.factorize(value_codes)
+    _, first_rows = np.unique(codes, return_index=True)
+    return codes, pd.Series(values[first_rows], dtype=object)
+
+
+def _take_distinct(series: pd.Series, codes: np.ndarray, results) -> pd.Series:
+    """Maps results for each distinct value (from _factorize_distinct) back onto every row of series."""
+    distinct = np.empty(len(results), dtype=object)
+    distinct[:] = list(results)
+    return pd.Series(distinct.take(codes), index=series.index, name=series.name, dtype=object)
+
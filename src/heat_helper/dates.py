@@ -2,10 +2,11 @@
 from datetime import date
 
 # Import external libraries
+import numpy as np
 import pandas as pd
 
 # Import helper functions
-from heat_helper.core import _parse_year_group_to_int, CURRENT_ACADEMIC_YEAR_START
+from heat_helper.core import _factorize_distinct, _parse_year_group_to_int, CURRENT_ACADEMIC_YEAR_START
 from heat_helper.exceptions import InvalidYearGroupError, FELevelError
 from .logger import get_logger, log_series_summary
 
@@ -52,19 +53,21 @@ def calculate_dob_range_from_year_group(
     """Calculates the expected DOB range (Sep 1 to Aug 31) for a given year group (1 to 13) in England.
     Includes some logic to try to handle Reception if entered as 'Reception', 'R', or 'Year R'.
 
+    Also accepts a pandas Series (DataFrame column), in which case each distinct year group is only parsed once and the dates are calculated for the whole column at once.
+
     Args:
         year_group: The year group you want to find the date of birth range for. Examples: 'Year 10', 'Y10', 10. Note: Reception should be entered as Reception, Year R or R.
         start_year (optional): The year in which the academic year starts for the academic year you want to calculate. Example: for 2025/2026 enter 2025. You can enter any year here and it will return the date of birth range for someone in that year group during the specified academic year. Default is start of current academic year.
-        errors (optional): default = 'raise' which raises all errors. 'ignore' and 'coerce' returns None, None.
+        errors (optional): default = 'raise' which raises all errors. 'ignore' and 'coerce' returns None, None, or NaT for a Series.
 
     Raises:
         InvalidYearGroupError: Raised when `year_group` input cannot be parsed or is out of range.
         FELevelError: Raised if FE Levels are in `year_group`.
         TypeError: Raised if `year_group` cannot be parsed to a valid int.
-        ValueError: Raised if 'year_group' is an empty column (Series) in a pandas DataFrame.
+        ValueError: Raised if 'year_group' is an empty column (Series) in a pandas DataFrame, or if start_year gives dates of birth pandas cannot hold (before 1678 or after 2261).
 
     Returns:
-        The date of birth range. First date is start of the academic year; second date is the end of the academic year. Example: 01/09/2013, 31/08/2014."""
+        The date of birth range. First date is start of the academic year; second date is the end of the academic year. Example: 01/09/2013, 31/08/2014. For a Series, two datetime64[ns] Series of start and end dates with the same index, with NaT where the year group could not be resolved."""
 
     try:
         if not isinstance(start_year, int):
@@ -73,26 +76,57 @@ def calculate_dob_range_from_year_group(
         if isinstance(year_group, pd.Series):
             if year_group.empty:
                 raise ValueError("year_group: column is empty, cannot calculate date of birth range.")
-            results = year_group.apply(
-                calculate_dob_range_from_year_group,
-                start_year=start_year,
-                errors=errors,
+            # Parse each distinct year group once; -1 marks ones that could not be parsed
+            codes, distinct = _factorize_distinct(year_group)
+            year_numbers = np.full(len(distinct), -1, dtype=np.int64)
+            for i, value in enumerate(distinct):
+                try:
+                    year_numbers[i] = _parse_year_group_to_int(value)
+                except (InvalidYearGroupError, TypeError, FELevelError):
+                    if errors not in ("coerce", "ignore"):
+                        raise
+                    logger.debug(
+                        "calculate_dob_range_from_year_group: could not resolve %r; returning NaT", value
+                    )
+
+            # datetime64[ns] only holds Sep 1677 to Apr 2262, so both the Sep 1 start and
+            # the Aug 31 end must fall in years strictly inside those
+            dob_start_years = start_year - (year_numbers + 5)
+            in_range = (dob_start_years > pd.Timestamp.min.year) & (dob_start_years + 1 < pd.Timestamp.max.year)
+            out_of_range = (year_numbers >= 0) & ~in_range
+            if out_of_range.any():
+                if errors not in ("coerce", "ignore"):
+                    raise ValueError(
+                        f"start_year {start_year} gives dates of birth outside the range pandas can hold "
+                        f"({pd.Timestamp.min.date()} to {pd.Timestamp.max.date()})."
+                    )
+                logger.debug(
+                    "calculate_dob_range_from_year_group: %d year groups give dates of birth out of range; returning NaT",
+                    int(out_of_range.sum()),
+                )
+
+            # Sep 1 of the start year as months since 1970, so the dates are built in numpy
+            parsed = (year_numbers >= 0) & in_range
+            months = ((np.where(parsed, dob_start_years, 1970) - 1970) * 12 + 8).astype("datetime64[M]")
+            starts = np.where(parsed, months.astype("datetime64[ns]"), np.datetime64("NaT", "ns"))
+            ends = np.where(
+                parsed,
+                (months + 12).astype("datetime64[ns]") - np.timedelta64(1, "D"),
+                np.datetime64("NaT", "ns"),
             )
 
-            start_dates, end_dates = zip(*results)
-
-            failed = sum(1 for d in start_dates if d is None)
+            n_parsed = int(parsed[codes].sum())
             log_series_summary(
                 logger,
                 "calculate_dob_range_from_year_group",
                 len(year_group),
-                parsed=len(year_group) - failed,
-                unresolved=failed,
+                parsed=n_parsed,
+                unresolved=len(year_group) - n_parsed,
             )
 
             return (
-                pd.Series(start_dates, index=year_group.index),
-                pd.Series(end_dates, index=year_group.index),
+                pd.Series(starts[codes], index=year_group.index),
+                pd.Series(ends[codes], index=year_group.index),
             )
 
         # Individual values
@@ -1,11 +1,595 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 from rapidfuzz import fuzz, process
 
+from heat_helper.core import STUDENT_HEAT_ID
 from heat_helper.exceptions import ColumnDoesNotExistError
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Internal column names used while searching for duplicates. The string-typed key
+# holds the ID of each record; all the grouping/union logic joins IDs into strings,
+# so IDs are normalised to str once rather than assuming str input.
+_KEY = "_dupe_key"
+_MATCH_NAME = "_match_name"
+_IS_NEW = "_is_new"
+DUPLICATES_COL = "Potential Duplicates"
+HEAT_DUPLICATES_COL = "Potential HEAT Duplicates"
+CLUSTER_COL = "Duplicate Cluster"
+SOURCE_FILE_COL = "Source File"
+SOURCE_ROW_COL = "Source Row"
+OUTPUT_TYPES = ("string", "clusters", "pairs")
+SURVIVORSHIP_RULES = ("first", "most_recent", "most_frequent")
+
+
+class _DisjointSet:
+    """Union-find over record keys, used to chain pairwise matches into clusters."""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, i):
+        root = self.parent.setdefault(i, i)
+        if root == i:
+            return i
+        # Walk to the root, then point every node on the path straight at it
+        path = []
+        while self.parent[root] != root:
+            path.append(root)
+            root = self.parent[root]
+        for node in path + [i]:
+            self.parent[node] = root
+        return root
+
+    def union(self, i, j):
+        # Merge the sets containing i and j
+        root_i = self.find(i)
+        root_j = self.find(j)
+        if root_i != root_j:
+            self.parent[root_i] = root_j
+
+    def clusters(self, keys) -> dict:
+        """Groups keys by their root, keeping only groups with more than one member."""
+        groups = {}
+        for key in keys:
+            groups.setdefault(self.find(key), []).append(key)
+        return {root: members for root, members in groups.items() if len(members) > 1}
+
+
+def _check_settings(
+    threshold: int,
+    fuzzy_type: str,
+    output: str = "string",
+    tile_size: int | None = None,
+    dob_tolerance: int | None = None,
+) -> None:
+    if not (0 <= threshold <= 100):
+        raise ValueError("Threshold must be an integer between 0 and 100")
+
+    if fuzzy_type not in ["strict", "permissive"]:
+        raise ValueError("fuzzy_type must be 'strict' or 'permissive'")
+
+    if output not in OUTPUT_TYPES:
+        raise ValueError("output must be 'string', 'clusters' or 'pairs'")
+
+    if tile_size is not None and (
+        isinstance(tile_size, bool) or not isinstance(tile_size, int) or tile_size < 1
+    ):
+        raise ValueError("tile_size must be a positive integer or None")
+
+    if dob_tolerance is not None and (
+        isinstance(dob_tolerance, bool) or not isinstance(dob_tolerance, int) or dob_tolerance < 0
+    ):
+        raise ValueError("dob_tolerance must be a non-negative integer or None")
+
+
+def _check_columns(
+    df: pd.DataFrame,
+    name_col: str | list[str],
+    date_of_birth_col: str,
+    postcode_col: str,
+    df_name: str | None = None,
+) -> None:
+    # Messages name the DataFrame itself unless a friendlier label is given
+    label = df if df_name is None else df_name
+    names = [name_col] if isinstance(name_col, str) else list(name_col)
+    for col in names + [date_of_birth_col, postcode_col]:
+        if col not in df.columns:
+            raise ColumnDoesNotExistError(f"'{col}' not found in {label} columns")
+
+
+def _clean_text(series: pd.Series) -> pd.Series:
+    """Strips text, collapses inner whitespace to one space and fills missing values with ''."""
+    return series.str.strip().replace(r"\s+", " ", regex=True).fillna("")
+
+
+def _prepare_records(
+    df: pd.DataFrame,
+    name_col: str | list[str],
+    date_of_birth_col: str,
+    postcode_col: str,
+    id_col: str | None,
+) -> tuple[pd.DataFrame, list[str], str]:
+    """Copies df and adds the cleaned columns shared by every duplicate search.
+
+    Returns the prepared copy, the list of columns an exact duplicate must share,
+    and the name of the ID column (created as 'Duplicate ID' if id_col is None).
+    """
+    new_df = df.copy()
+
+    # Set up col list depending on if name_col is a list or single str
+    if isinstance(name_col, list):
+        new_df[_MATCH_NAME] = (
+            new_df[name_col].fillna("").astype(str).agg(" ".join, axis=1)
+        )
+        col_list = name_col + [date_of_birth_col, postcode_col]
+    else:
+        col_list = [name_col, date_of_birth_col, postcode_col]
+        new_df[_MATCH_NAME] = new_df[name_col]
+    # Blank names have nothing to fuzzy match on, so they can only be exact duplicates
+    blank = new_df[_MATCH_NAME].astype(object).fillna("").astype(str).str.strip() == ""
+    new_df[_MATCH_NAME] = new_df[_MATCH_NAME].astype(object).where(~blank, None)
+
+    # String Column Cleaning
+    for col in col_list:
+        if new_df[col].dtype == "object":
+            new_df[col] = _clean_text(new_df[col])
+
+    # Set up ID column if not passed to function
+    if id_col is None:
+        new_df["Duplicate ID"] = "#" + pd.Series(
+            range(1, len(new_df) + 1),
+            index=new_df.index).astype(str)
+        id_col = "Duplicate ID"
+
+    new_df[_KEY] = new_df[id_col].astype(str)
+    return new_df, col_list, id_col
+
+
+def _block_columns(date_of_birth_col: str, postcode_col: str, fuzzy_type: str) -> list[str]:
+    if fuzzy_type == "strict":
+        return [date_of_birth_col, postcode_col]
+    return [date_of_birth_col]
+
+
+def _exact_group_ids(new_df: pd.DataFrame, col_list: list[str]) -> np.ndarray:
+    """Labels each record with the group of records sharing all of col_list.
+
+    The key columns are hashed into a single uint64 per row and grouped on that,
+    rather than grouping on every column at once. Object columns have already
+    been cleaned to strings by _prepare_records, so equal hashes mean equal keys
+    (barring a 64-bit collision). Records with a missing value in any of col_list
+    are never exact matches and are labelled -1.
+    """
+    keys = new_df[col_list]
+    row_hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    group_ids, _ = pd.factorize(row_hashes)
+    group_ids[keys.isna().any(axis=1).to_numpy()] = -1
+    return group_ids
+
+
+def _exact_pairs(
+    group_ids: np.ndarray, only_with: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the positions of every pair of records in the same exact group.
+
+    Args:
+        only_with: Optional boolean mask. When given, only pairs involving at
+            least one True record are returned.
+    """
+    groups = pd.DataFrame({"group": group_ids, "pos": np.arange(len(group_ids))})
+    # If there is more than one item in the group, it's a duplicate
+    groups = groups[(groups["group"] >= 0) & groups["group"].duplicated(keep=False)]
+    joined = groups.merge(groups, on="group")
+    joined = joined[joined["pos_x"] < joined["pos_y"]]
+    a, b = joined["pos_x"].to_numpy(), joined["pos_y"].to_numpy()
+    if only_with is not None:
+        keep = only_with[a] | only_with[b]
+        a, b = a[keep], b[keep]
+    return a, b
+
+
+def _block_pairs(
+    query_names: list,
+    choice_names: list,
+    threshold: int,
+    twin_protection: bool,
+    twin_protection_threshold: int,
+    upper: bool = False,
+    tile_size: int | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Scores every query name against every choice name within one block.
+
+    Scores are requested from rapidfuzz as uint8 with score_cutoff=threshold, so
+    anything below the threshold comes back as 0 and the matrix takes one byte
+    per cell rather than four.
+
+    Args:
+        upper: Set when the queries are also the first len(query_names) choices,
+            so only pairs with choice position > query position are kept. This
+            skips self-matches and counts each pair once.
+        tile_size: If set, the matrix is computed tile_size query rows at a time
+            and each strip is discarded once its pairs are extracted, so peak
+            memory is tile_size x len(choice_names) bytes however big the block.
+
+    Returns:
+        Three aligned arrays: query positions, choice positions and (whole number)
+        scores of the pairs at or above threshold which survive twin protection.
+    """
+    query_missing = pd.isna(np.asarray(query_names, dtype=object))
+    choice_missing = pd.isna(np.asarray(choice_names, dtype=object))
+    strip = tile_size or max(len(query_names), 1)
+
+    found_rows, found_cols, found_scores = [], [], []
+    for start in range(0, len(query_names), strip):
+        stop = min(start + strip, len(query_names))
+        # In the upper triangle no choice left of the strip's first row is kept
+        offset = start if upper else 0
+        score_matrix = process.cdist(
+            query_names[start:stop],
+            choice_names[offset:],
+            scorer=fuzz.token_sort_ratio,
+            dtype=np.uint8,
+            score_cutoff=threshold,
+        )
+        keep = score_matrix > 0 if threshold > 0 else np.ones(score_matrix.shape, dtype=bool)
+        # cdist does not define a score for a missing name, so never match one
+        keep &= ~query_missing[start:stop, None]
+        keep &= ~choice_missing[offset:]
+        if upper:
+            keep &= (
+                np.arange(offset, len(choice_names)) > np.arange(start, stop)[:, None]
+            )
+        strip_rows, strip_cols = np.nonzero(keep)
+        found_scores.append(score_matrix[strip_rows, strip_cols])
+        found_rows.append(strip_rows + start)
+        found_cols.append(strip_cols + offset)
+
+    if not found_rows:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, np.array([], dtype=np.uint8)
+    rows = np.concatenate(found_rows)
+    cols = np.concatenate(found_cols)
+    scores = np.concatenate(found_scores)
+
+    if twin_protection and len(rows):
+        not_twins = _not_twins(
+            [query_names[p] for p in rows],
+            [choice_names[p] for p in cols],
+            twin_protection_threshold,
+        )
+        rows, cols, scores = rows[not_twins], cols[not_twins], scores[not_twins]
+
+    return rows, cols, scores
+
+
+def _not_twins(names_a: list, names_b: list, twin_protection_threshold: int) -> np.ndarray:
+    """Returns a mask of the name pairs whose first names match closely enough.
+
+    Compare ONLY the first names (the name before the first space). If the full
+    strings match, but the first names are clearly different, assume they are
+    twins (or siblings) so the pair should be dropped.
+    """
+    first_name_scores = process.cpdist(
+        [str(name).split(" ")[0] for name in names_a],
+        [str(name).split(" ")[0] for name in names_b],
+        scorer=fuzz.ratio,
+    )
+    return first_name_scores >= twin_protection_threshold
+
+
+def _fuzzy_pairs(
+    new_df: pd.DataFrame,
+    block_cols: list[str],
+    threshold: int,
+    twin_protection: bool,
+    twin_protection_threshold: int,
+    is_new: np.ndarray | None = None,
+    tile_size: int | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Fuzzy matches names within each block of new_df.
+
+    When is_new is given, only pairs involving at least one new record are
+    scored: each block's new records are compared with every record in the
+    block, new records first, rather than every record with every other.
+
+    Returns:
+        Positions (in new_df) of both records in each matching pair, and scores.
+    """
+    names = new_df[_MATCH_NAME].to_numpy(dtype=object)
+    found_a, found_b, found_scores = [], [], []
+
+    for positions in new_df.groupby(block_cols, observed=True).indices.values():
+        if len(positions) < 2:
+            continue
+
+        if is_new is not None:
+            # New rows first, so the upper-triangle mask also skips new-new repeats
+            positions = positions[np.argsort(~is_new[positions], kind="stable")]
+            n_queries = int(is_new[positions].sum())
+        else:
+            n_queries = len(positions)
+
+        block_names = names[positions].tolist()
+        rows, cols, scores = _block_pairs(
+            block_names[:n_queries],
+            block_names,
+            threshold,
+            twin_protection,
+            twin_protection_threshold,
+            upper=True,
+            tile_size=tile_size,
+        )
+        found_a.append(positions[rows])
+        found_b.append(positions[cols])
+        found_scores.append(scores)
+
+    if not found_a:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, np.array([], dtype=np.uint8)
+    return np.concatenate(found_a), np.concatenate(found_b), np.concatenate(found_scores)
+
+
+def _dob_tolerance_pairs(
+    new_df: pd.DataFrame,
+    block_cols: list[str],
+    dob_tolerance: int,
+    threshold: int,
+    twin_protection: bool,
+    twin_protection_threshold: int,
+    is_new: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Fuzzy matches names of records whose dates of birth are close but not equal.
+
+    Rather than comparing across blocks, each record emits extra blocking keys
+    derived from its date of birth (as a day number): the date itself and the dates
+    1 to dob_tolerance days later, and the date with day and month swapped. The
+    date itself pairs text dates written in different formats, such as '01/02/2010'
+    and '2010-02-01'; pairs with the same raw value are left to the normal blocks.
+    These are joined to every
+    record's real date of birth (and postcode, when blocking on it), so candidate
+    pairs are found by one merge and only those are scored, with cpdist.
+
+    Returns:
+        Positions of both records in each matching pair ('a' before 'b'), scores,
+        and whether each pair was found through a day/month swap.
+    """
+    dob_col = block_cols[0]
+    dob = new_df[dob_col]
+    if pd.api.types.is_datetime64_any_dtype(dob):
+        dates = dob.dt.normalize()
+    else:
+        # Text dates may mix formats, so parse each distinct value once, day first
+        codes, uniques = pd.factorize(dob)
+        parsed = pd.to_datetime(
+            pd.Series(uniques, dtype=object), errors="coerce", format="mixed", dayfirst=True
+        ).to_numpy()
+        dates = pd.Series(
+            np.where(codes >= 0, parsed[codes], np.datetime64("NaT")),
+            index=dob.index,
+            dtype="datetime64[ns]",
+        )
+    days = dates.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    valid = dates.notna().to_numpy()
+
+    # A swap is only a different, real date when the day could also be a month
+    day = dates.dt.day.to_numpy()
+    month = dates.dt.month.to_numpy()
+    swappable = valid & (day <= 12) & (day != month)
+    swapped = pd.to_datetime(
+        pd.DataFrame({
+            "year": dates.dt.year.where(swappable),
+            "month": dates.dt.day.where(swappable),
+            "day": dates.dt.month.where(swappable),
+        }),
+        errors="coerce",
+    ).to_numpy(dtype="datetime64[D]").astype(np.int64)
+
+    positions = np.arange(len(new_df))
+    extra_cols = {col: new_df[col].to_numpy() for col in block_cols[1:]}
+    canonical = pd.DataFrame(
+        {"key": days[valid], "pos": positions[valid],
+         **{col: values[valid] for col, values in extra_cols.items()}}
+    )
+
+    derived = []
+    for offset in range(0, dob_tolerance + 1):
+        derived.append(canonical.assign(key=canonical["key"] + offset, swap=False))
+    derived.append(pd.DataFrame(
+        {"key": swapped[swappable], "pos": positions[swappable], "swap": True,
+         **{col: values[swappable] for col, values in extra_cols.items()}}
+    ))
+    candidates = pd.concat(derived, ignore_index=True).merge(
+        canonical, on=["key"] + block_cols[1:], suffixes=("_x", "_y")
+    )
+
+    # Records with the same raw date of birth are already compared in their block
+    raw_codes, _ = pd.factorize(dob)
+    candidates = candidates[
+        raw_codes[candidates["pos_x"].to_numpy()] != raw_codes[candidates["pos_y"].to_numpy()]
+    ]
+    a = np.minimum(candidates["pos_x"], candidates["pos_y"]).to_numpy()
+    b = np.maximum(candidates["pos_x"], candidates["pos_y"]).to_numpy()
+    swap = candidates["swap"].to_numpy(dtype=bool)
+    if is_new is not None:
+        keep = is_new[a] | is_new[b]
+        a, b, swap = a[keep], b[keep], swap[keep]
+
+    # A swapped pair is found from both records; report it once, as a swap
+    pairs = pd.DataFrame({"a": a, "b": b, "swap": swap})
+    pairs = pairs.sort_values("swap", ascending=False, kind="stable")
+    pairs = pairs.drop_duplicates(["a", "b"]).sort_values(["a", "b"])
+    a, b = pairs["a"].to_numpy(), pairs["b"].to_numpy()
+    swap = pairs["swap"].to_numpy(dtype=bool)
+
+    names = new_df[_MATCH_NAME].to_numpy(dtype=object)
+    scores = process.cpdist(
+        names[a].tolist(),
+        names[b].tolist(),
+        scorer=fuzz.token_sort_ratio,
+        dtype=np.uint8,
+        score_cutoff=threshold,
+    )
+    keep = scores > 0 if threshold > 0 else np.ones(len(a), dtype=bool)
+    # cpdist does not define a score for a missing name, so never match one
+    keep &= ~(pd.isna(names[a]) | pd.isna(names[b]))
+    a, b, scores, swap = a[keep], b[keep], scores[keep], swap[keep]
+
+    if twin_protection and len(a):
+        not_twins = _not_twins(names[a], names[b], twin_protection_threshold)
+        a, b, scores, swap = a[not_twins], b[not_twins], scores[not_twins], swap[not_twins]
+
+    return a, b, scores, swap
+
+
+def _find_pairs(
+    new_df: pd.DataFrame,
+    col_list: list[str],
+    block_cols: list[str],
+    threshold: int,
+    twin_protection: bool,
+    twin_protection_threshold: int,
+    is_new: np.ndarray | None = None,
+    tile_size: int | None = None,
+    dob_tolerance: int | None = None,
+) -> pd.DataFrame:
+    """Runs the exact then fuzzy phases over a prepared DataFrame.
+
+    If dob_tolerance is set, a third phase also matches records whose dates of
+    birth (block_cols[0]) are day/month swapped, within dob_tolerance days, or the
+    same date written differently.
+
+    Returns:
+        One row per matching pair: the positions of both records in new_df
+        ('a' before 'b'), the score, and the reason ('exact', 'fuzzy', 'dob_swap'
+        or 'dob_near'). A pair found by both phases is reported once, as exact.
+    """
+    # Exact Matches
+    group_ids = _exact_group_ids(new_df, col_list)
+    exact_a, exact_b = _exact_pairs(group_ids, is_new)
+
+    # Fuzzy Matching
+    fuzzy_a, fuzzy_b, fuzzy_scores = _fuzzy_pairs(
+        new_df,
+        block_cols,
+        threshold,
+        twin_protection,
+        twin_protection_threshold,
+        is_new,
+        tile_size,
+    )
+    not_exact = (group_ids[fuzzy_a] < 0) | (group_ids[fuzzy_a] != group_ids[fuzzy_b])
+    fuzzy_a, fuzzy_b = fuzzy_a[not_exact], fuzzy_b[not_exact]
+    a = np.concatenate([exact_a, np.minimum(fuzzy_a, fuzzy_b)])
+    b = np.concatenate([exact_b, np.maximum(fuzzy_a, fuzzy_b)])
+
+    pairs = pd.DataFrame({
+        "a": a,
+        "b": b,
+        "score": np.concatenate(
+            [np.full(len(exact_a), 100, dtype=np.uint8), fuzzy_scores[not_exact]]
+        ),
+        "reason": ["exact"] * len(exact_a) + ["fuzzy"] * int(not_exact.sum()),
+    })
+    if dob_tolerance is None:
+        return pairs
+
+    # Different raw dates of birth are never in the same block, so these pairs are new
+    near_a, near_b, near_scores, swapped = _dob_tolerance_pairs(
+        new_df,
+        block_cols,
+        dob_tolerance,
+        threshold,
+        twin_protection,
+        twin_protection_threshold,
+        is_new,
+    )
+    near_pairs = pd.DataFrame({
+        "a": near_a,
+        "b": near_b,
+        "score": near_scores,
+        "reason": np.where(swapped, "dob_swap", "dob_near"),
+    })
+    return pd.concat([pairs, near_pairs], ignore_index=True)
+
+
+def _cluster_members(n_records: int, pairs: pd.DataFrame) -> list[list[int]]:
+    """Chains pairwise matches into clusters of record positions (multi-member only)."""
+    dsu = _DisjointSet()
+    for i, j in zip(pairs["a"].tolist(), pairs["b"].tolist()):
+        dsu.union(i, j)
+    return list(dsu.clusters(range(n_records)).values())
+
+
+def _cluster_strings(keys: list, clusters: list[list]) -> dict:
+    """Maps each key in a cluster to the comma-joined, sorted IDs of its cluster."""
+    id_to_string_map = {}
+    for members in clusters:
+        member_keys = [keys[m] for m in members]
+        member_str = ", ".join(sorted(member_keys))
+        for key in member_keys:
+            id_to_string_map[key] = member_str
+    return id_to_string_map
+
+
+def _format_results(
+    new_df: pd.DataFrame, id_col: str, pairs: pd.DataFrame, output: str
+) -> pd.DataFrame:
+    """Turns the pairs found in a prepared DataFrame into the requested output.
+
+    Returns new_df (without the internal columns) with 'Potential Duplicates' or
+    'Duplicate Cluster' added, or the table of pairs if output is 'pairs'.
+    """
+    if output == "pairs":
+        ids = new_df[id_col].to_numpy()
+        pair_table = pd.DataFrame({
+            "id_a": ids[pairs["a"].to_numpy()],
+            "id_b": ids[pairs["b"].to_numpy()],
+            "score": pairs["score"].to_numpy(),
+            "reason": pairs["reason"].to_numpy(),
+        })
+        logger.info("%d potential duplicate pairs found.", len(pair_table))
+        return pair_table
+
+    clusters = _cluster_members(len(new_df), pairs)
+    dupe_count = sum(len(members) for members in clusters)
+
+    if output == "clusters":
+        # Number clusters in order of their first record, so the IDs are stable
+        cluster_ids = np.zeros(len(new_df), dtype=np.int64)
+        for number, members in enumerate(sorted(clusters, key=min), start=1):
+            cluster_ids[members] = number
+        cluster_col = pd.array(cluster_ids, dtype="Int64")
+        cluster_col[cluster_ids == 0] = pd.NA
+        new_df[CLUSTER_COL] = cluster_col
+        new_df.drop(columns=[_MATCH_NAME, _KEY], inplace=True)
+        logger.info("%d records are potential duplicates.", dupe_count)
+        return new_df
+
+    # Apply the map
+    id_to_string_map = _cluster_strings(new_df[_KEY].tolist(), clusters)
+    new_df[DUPLICATES_COL] = new_df[_KEY].map(id_to_string_map).fillna("")
+
+    new_df = new_df.sort_values([DUPLICATES_COL, _KEY], ascending=False)
+
+    # Final clean up
+    new_df.drop(columns=[c for c in (_MATCH_NAME, _KEY) if c in new_df.columns],
+                inplace=True)
+
+    new_df[DUPLICATES_COL] = new_df[DUPLICATES_COL].replace(
+        r"^\s*$", None, regex=True
+    )
+
+    logger.info("%d records are potential duplicates.", dupe_count)
+
+    return new_df
+
 
 def find_duplicates(
     df: pd.DataFrame,
@@ -17,11 +601,14 @@ def find_duplicates(
     fuzzy_type: str = "permissive",
     twin_protection: bool = True,
     twin_protection_threshold: int = 70,
+    output: str = "string",
+    tile_size: int | None = None,
+    dob_tolerance: int | None = None,
 ) -> pd.DataFrame:
     """Attempts to find duplicate records within one DataFrame.
     The function looks for exact matches on any columns passed to name_col, date_of_birth_col and postcode_col,
     and then attempts to fuzzy match names using either date_of_birth_col or date_of_birth_col and postcode_col
-    to create blocks of potential matches. Strictness of duplicate matching can be controlled using threshold
+    to create blocks of potential matches. Records with a blank name are only ever exact duplicates, never fuzzy matches. Strictness of duplicate matching can be controlled using threshold
     (% match for fuzzy name matching), fuzzy type (permission or strict) which pools potential duplicates for matching by
     using either date of birth or date of birth and postcode, and setting twin_protection to True/False. Twin Protection isolates
     first names in potential matches to filter out people with totally different first names. This is not totally failsafe and may
@@ -32,8 +619,9 @@ def find_duplicates(
     are always reported as having no duplicates. Clean or filter nulls in these
     columns before calling.
 
-    Note: the returned DataFrame is sorted by 'Potential Duplicates' and the ID
-    column, so row order will differ from the input.
+    Note: with the default output='string', the returned DataFrame is sorted by
+    'Potential Duplicates' and the ID column, so row order will differ from the input.
+    With output='clusters' the input order is kept.
 
     Args:
         df (pd.DataFrame): The DataFrame contain records to check for duplicates.
@@ -45,171 +633,807 @@ def find_duplicates(
         fuzzy_type (str, optional): Controls whether date_of_birth_col or date_of_birth_col and postcode_col are used to create blocks for fuzzy matching. 'permissive' uses only date_of_birth_col, so will find duplicates with different postcodes. 'strict' uses both columns, so will only return potential duplicates where both date of birth and postcode match. Defaults to "permissive".
         twin_protection (bool, optional): If True, this filters out suspected twins whose first names match by less than twin_protection_threshold from returned potential duplicates. Defaults to True.
         twin_protection_threshold (int, optional): The threshold for first name matching when twin_protection is True. Defaults to 70.
+        tile_size (int, optional): Limits memory use on very large blocks. Names within a block are scored against each other as a matrix of one byte per pair, so a block of 20,000 records with the same date of birth needs about 400MB at once. Setting tile_size scores tile_size records at a time instead, keeping memory to roughly tile_size x block size bytes, for the same results. Defaults to None (whole blocks at once).
+        dob_tolerance (int, optional): If set, names are also fuzzy matched between records whose dates of birth have the day and month swapped (e.g. 03/04/2012 and 04/03/2012) or are up to dob_tolerance days apart, to catch typos. 0 checks only swapped dates and the same date written in different formats (e.g. 01/02/2010 and 2010-02-01). Text dates of birth are read with pd.to_datetime (day first if ambiguous, e.g. 03/04/2012 is 3 April), and values which cannot be read as dates are skipped. When fuzzy_type is 'strict', the postcode must still match. Defaults to None (dates of birth must match exactly).
+        output (str, optional): What to return. 'string' adds a 'Potential Duplicates' column listing the IDs in each record's cluster. 'clusters' adds an integer 'Duplicate Cluster' column instead, shared by every record in a cluster and empty (<NA>) for records with no potential duplicates. 'pairs' returns only a table of the matching pairs. Defaults to "string".
 
     Raises:
         TypeError: Raised if df is not a DataFrame.
-        ValueError: Raised if threshold is not a value between 0 and 100 or if fuzzy_type is not 'strict' or 'permissive'.
+        ValueError: Raised if threshold is not a value between 0 and 100, if fuzzy_type is not 'strict' or 'permissive', if output is not 'string', 'clusters' or 'pairs', if tile_size is not a positive integer, or if dob_tolerance is not a non-negative integer.
         ColumnDoesNotExistError: Raised if any of the columns passed as args are not in df.
 
     Returns:
-        A DataFrame with a column called 'Potential Duplicates' which contains a list of IDs for any potential duplicates found by the function.
+        A DataFrame with a column called 'Potential Duplicates' which contains a list of IDs for any potential duplicates found by the function (or 'Duplicate Cluster' if output='clusters').
+        If output='pairs', a DataFrame with one row per matching pair instead: 'id_a' and 'id_b' (the two IDs), 'score' (the fuzzy name score as a whole number, 100 for exact matches) and 'reason' ('exact' or 'fuzzy', or 'dob_swap' / 'dob_near' for pairs found through dob_tolerance).
+        Pairs are the direct matches only; clusters also chain records matched through a third record.
     """
     # Error Handling
     if not isinstance(df, pd.DataFrame):
         raise TypeError(f"{df} is not a DataFrame")
 
-    if not (0 <= threshold <= 100):
-        raise ValueError("Threshold must be an integer between 0 and 100")
+    _check_settings(threshold, fuzzy_type, output, tile_size, dob_tolerance)
+    _check_columns(df, name_col, date_of_birth_col, postcode_col)
 
-    if fuzzy_type not in ["strict", "permissive"]:
-        raise ValueError("fuzzy_type must be 'strict' or 'permissive'")
+    new_df, col_list, id_col = _prepare_records(
+        df, name_col, date_of_birth_col, postcode_col, id_col
+    )
 
-    # Check cols exist
-    if isinstance(name_col, str):
-        if name_col not in df.columns:
-            raise ColumnDoesNotExistError(f"'{name_col}' not found in {df} columns")
-    else:
-        for name in name_col:
-            if name not in df.columns:
-                raise ColumnDoesNotExistError(f"'{name}' not found in {df} columns")
+    logger.debug("find_duplicates: searching %d records for duplicates", len(df))
+
+    pairs = _find_pairs(
+        new_df,
+        col_list,
+        _block_columns(date_of_birth_col, postcode_col, fuzzy_type),
+        threshold,
+        twin_protection,
+        twin_protection_threshold,
+        tile_size=tile_size,
+        dob_tolerance=dob_tolerance,
+    )
+
+    return _format_results(new_df, id_col, pairs, output)
+
+
+def build_duplicate_index(
+    df: pd.DataFrame,
+    name_col: str | list[str],
+    date_of_birth_col: str,
+    postcode_col: str,
+    id_col: str,
+    threshold: int = 80,
+    fuzzy_type: str = "permissive",
+    twin_protection: bool = True,
+    twin_protection_threshold: int = 70,
+    tile_size: int | None = None,
+) -> pd.DataFrame:
+    """Builds a duplicate index over an existing (master) dataset, so that new records can later be checked against it with find_new_duplicates
+    without searching the whole master dataset again.
+    The index is a slim DataFrame holding the ID, the cleaned name, date of birth and postcode columns, and the 'Potential Duplicates' found
+    in the master dataset. It is an ordinary DataFrame, so it can be saved between runs with e.g. `index.to_pickle('dupe_index.pkl')` and
+    read back with `pd.read_pickle`. Pickle keeps column types intact; if you save to CSV instead, make sure the date of birth column reads
+    back with the same type as in your new data.
+
+    Building the index takes as long as running find_duplicates over the master dataset. The settings used here (threshold, fuzzy_type and
+    twin protection) should be passed unchanged to find_new_duplicates.
+
+    Args:
+        df (pd.DataFrame): The master DataFrame to index.
+        name_col (str | list[str]): The column or list of columns contain names. Pass a list in the order the columns should be joined to create a full name e.g. ['First Name', 'Middle Name', 'Last Name'].
+        date_of_birth_col (str): The column containing date of birth.
+        postcode_col (str): The column containing postcode.
+        id_col (str): The column containing a unique ID for each record. Required, because IDs must stay the same between runs.
+        threshold (int, optional): The threshold for fuzzy matching. The percentage match of the name. Defaults to 80.
+        fuzzy_type (str, optional): 'permissive' blocks on date of birth only, 'strict' on date of birth and postcode. See find_duplicates. Defaults to "permissive".
+        twin_protection (bool, optional): If True, filters out suspected twins. See find_duplicates. Defaults to True.
+        twin_protection_threshold (int, optional): The threshold for first name matching when twin_protection is True. Defaults to 70.
+        tile_size (int, optional): Scores very large blocks tile_size records at a time to limit memory use. See find_duplicates. Defaults to None.
+
+    Raises:
+        TypeError: Raised if df is not a DataFrame.
+        ValueError: Raised if threshold is not a value between 0 and 100, if fuzzy_type is not 'strict' or 'permissive', or if tile_size is not a positive integer.
+        ColumnDoesNotExistError: Raised if any of the columns passed as args are not in df.
+
+    Returns:
+        The duplicate index, one row per record in df.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError(f"df must be a DataFrame, not {type(df).__name__}")
+    _check_settings(threshold, fuzzy_type, tile_size=tile_size)
+    _check_columns(df, name_col, date_of_birth_col, postcode_col, "df")
+    if id_col not in df.columns:
+        raise ColumnDoesNotExistError(f"'{id_col}' not found in df columns")
+
+    new_df, col_list, _ = _prepare_records(
+        df, name_col, date_of_birth_col, postcode_col, id_col
+    )
+    pairs = _find_pairs(
+        new_df,
+        col_list,
+        _block_columns(date_of_birth_col, postcode_col, fuzzy_type),
+        threshold,
+        twin_protection,
+        twin_protection_threshold,
+        tile_size=tile_size,
+    )
+    id_to_string_map = _cluster_strings(
+        new_df[_KEY].tolist(), _cluster_members(len(new_df), pairs)
+    )
+    clusters = new_df[_KEY].map(id_to_string_map).astype(object)
+    new_df[DUPLICATES_COL] = clusters.where(clusters.notna(), None)
 
-    if date_of_birth_col not in df.columns:
-        raise ColumnDoesNotExistError(
-            f"'{date_of_birth_col}' not found in {df} columns"
+    index_cols = [id_col] + [c for c in col_list if c != id_col] + [_MATCH_NAME, DUPLICATES_COL]
+    index = new_df[index_cols].reset_index(drop=True)
+
+    logger.info(
+        "Duplicate index built over %d records (%d potential duplicates).",
+        len(index),
+        index[DUPLICATES_COL].notna().sum(),
+    )
+    return index
+
+
+def find_new_duplicates(
+    new_df: pd.DataFrame,
+    index: pd.DataFrame,
+    name_col: str | list[str],
+    date_of_birth_col: str,
+    postcode_col: str,
+    id_col: str,
+    threshold: int = 80,
+    fuzzy_type: str = "permissive",
+    twin_protection: bool = True,
+    twin_protection_threshold: int = 70,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Checks new records for duplicates against a duplicate index built with build_duplicate_index, and against each other.
+    Only the blocks (dates of birth, or date of birth and postcode) that contain a new record are searched, and within them only pairs
+    involving a new record are scored, so the cost depends on the size of new_df rather than the master dataset. The clusters found are
+    the same as running find_duplicates over the master and new records together.
+
+    new_df must use the same column names as the data the index was built from, and the same settings (threshold, fuzzy_type and twin
+    protection) should be used.
+
+    Args:
+        new_df (pd.DataFrame): The new records to check.
+        index (pd.DataFrame): A duplicate index returned by build_duplicate_index (or by a previous call to this function).
+        name_col (str | list[str]): The column or list of columns contain names, as passed to build_duplicate_index.
+        date_of_birth_col (str): The column containing date of birth.
+        postcode_col (str): The column containing postcode.
+        id_col (str): The column containing a unique ID for each record. New IDs must not already be in the index.
+        threshold (int, optional): The threshold for fuzzy matching. The percentage match of the name. Defaults to 80.
+        fuzzy_type (str, optional): 'permissive' blocks on date of birth only, 'strict' on date of birth and postcode. Defaults to "permissive".
+        twin_protection (bool, optional): If True, filters out suspected twins. Defaults to True.
+        twin_protection_threshold (int, optional): The threshold for first name matching when twin_protection is True. Defaults to 70.
+
+    Raises:
+        TypeError: Raised if new_df or index are not DataFrames.
+        ValueError: Raised if threshold or fuzzy_type are invalid, or if any ID in new_df is already in the index.
+        ColumnDoesNotExistError: Raised if any of the columns passed as args are not in new_df or index.
+
+    Returns:
+        Two DataFrames. The first holds the cluster updates: one row for every record (new or existing) whose cluster gained a new member,
+        with its ID, its updated 'Potential Duplicates' and a 'New Record' column. The second is the updated index including the new
+        records, to save and pass to the next call.
+    """
+    if not isinstance(new_df, pd.DataFrame) or not isinstance(index, pd.DataFrame):
+        raise TypeError("new_df and index must be pandas DataFrames.")
+    _check_settings(threshold, fuzzy_type)
+    _check_columns(new_df, name_col, date_of_birth_col, postcode_col, "new_df")
+    _check_columns(index, name_col, date_of_birth_col, postcode_col, "index")
+    for col in (id_col, _MATCH_NAME, DUPLICATES_COL):
+        if col not in index.columns:
+            raise ColumnDoesNotExistError(f"'{col}' not found in index columns")
+    if id_col not in new_df.columns:
+        raise ColumnDoesNotExistError(f"'{id_col}' not found in new_df columns")
+
+    prepared, col_list, _ = _prepare_records(
+        new_df, name_col, date_of_birth_col, postcode_col, id_col
+    )
+    index_keys = index[id_col].astype(str)
+    clashing = prepared[_KEY].isin(index_keys)
+    if clashing.any():
+        raise ValueError(
+            f"{int(clashing.sum())} ID(s) in new_df are already in the index, e.g. "
+            f"'{prepared.loc[clashing, _KEY].iloc[0]}'. IDs must be unique across runs."
         )
 
-    if postcode_col not in df.columns:
-        raise ColumnDoesNotExistError(f"'{postcode_col}' not found in {df} columns")
+    block_cols = _block_columns(date_of_birth_col, postcode_col, fuzzy_type)
+    index_cols = [id_col] + [c for c in col_list if c != id_col] + [_MATCH_NAME]
 
-    new_df = df.copy()
+    # Only existing records sharing a block with a new record can be affected
+    new_blocks = pd.MultiIndex.from_frame(prepared[block_cols].dropna())
+    in_new_block = pd.MultiIndex.from_frame(index[block_cols]).isin(new_blocks)
+    existing = index.loc[in_new_block, index_cols].assign(**{_KEY: index_keys[in_new_block]})
 
-    # Set up col list depending on if name_col is a list or single str
-    if isinstance(name_col, list):
-        new_df["_match_name"] = (
-            new_df[name_col].fillna("").astype(str).agg(" ".join, axis=1)
+    candidates = pd.concat(
+        [
+            prepared[index_cols + [_KEY]].assign(**{_IS_NEW: True}),
+            existing.assign(**{_IS_NEW: False}),
+        ],
+        ignore_index=True,
+    )
+    logger.debug(
+        "find_new_duplicates: comparing %d new records with %d existing records",
+        len(prepared),
+        len(existing),
+    )
+
+    pairs = _find_pairs(
+        candidates,
+        col_list,
+        block_cols,
+        threshold,
+        twin_protection,
+        twin_protection_threshold,
+        is_new=candidates[_IS_NEW].to_numpy(),
+    )
+    dsu = _DisjointSet()
+    candidate_keys = candidates[_KEY].to_numpy()
+    for i, j in zip(candidate_keys[pairs["a"].to_numpy()], candidate_keys[pairs["b"].to_numpy()]):
+        dsu.union(i, j)
+
+    # Pull in the existing clusters of any indexed record that matched a new one
+    new_keys = set(prepared[_KEY])
+    matched_existing = [k for k in dsu.parent if k not in new_keys]
+    if matched_existing:
+        labels = index[DUPLICATES_COL].where(index_keys.isin(matched_existing)).dropna()
+        members = index_keys[index[DUPLICATES_COL].isin(labels)]
+        first_member = members.groupby(index.loc[members.index, DUPLICATES_COL]).transform("first")
+        for key, first in zip(members, first_member):
+            dsu.union(first, key)
+
+    affected_map = {}
+    for cluster in dsu.clusters(list(dsu.parent)).values():
+        if new_keys.isdisjoint(cluster):
+            continue
+        member_str = ", ".join(sorted(cluster))
+        for member in cluster:
+            affected_map[member] = member_str
+
+    # Updated index: existing rows with their clusters refreshed, then the new rows
+    updated_existing = index.copy()
+    is_affected = index_keys.isin(affected_map)
+    updated_existing.loc[is_affected, DUPLICATES_COL] = index_keys[is_affected].map(affected_map)
+    new_clusters = prepared[_KEY].map(affected_map).astype(object)
+    new_rows = prepared[index_cols].assign(
+        **{DUPLICATES_COL: new_clusters.where(new_clusters.notna(), None)}
+    )
+    updated_index = pd.concat([updated_existing, new_rows], ignore_index=True)
+
+    updates = pd.concat(
+        [
+            updated_existing.loc[is_affected, [id_col, DUPLICATES_COL]].assign(**{"New Record": False}),
+            new_rows.loc[new_rows[DUPLICATES_COL].notna(), [id_col, DUPLICATES_COL]].assign(**{"New Record": True}),
+        ],
+        ignore_index=True,
+    )
+    updates = updates.sort_values(
+        [DUPLICATES_COL, id_col], ascending=False, key=lambda s: s.astype(str), ignore_index=True
+    )
+
+    logger.info(
+        "%d new records checked; %d records in clusters with a new potential duplicate.",
+        len(prepared),
+        len(updates),
+    )
+    return updates, updated_index
+
+
+def find_heat_duplicates(
+    df: pd.DataFrame,
+    heat_df: pd.DataFrame,
+    name_col: str | list[str],
+    date_of_birth_col: str,
+    postcode_col: str,
+    heat_name_col: str | list[str],
+    heat_date_of_birth_col: str,
+    heat_postcode_col: str,
+    heat_id_col: str = STUDENT_HEAT_ID,
+    threshold: int = 80,
+    fuzzy_type: str = "permissive",
+    twin_protection: bool = True,
+    twin_protection_threshold: int = 70,
+) -> pd.DataFrame:
+    """Checks each record in df for potential duplicates in your HEAT Student Export before uploading.
+    Both DataFrames are blocked on the same keys as find_duplicates (date of birth, or date of birth and postcode if fuzzy_type is 'strict')
+    and, within each block, names in df are only fuzzy matched against names in heat_df. Records in df are not compared with each other and
+    HEAT records are not compared with each other; use find_duplicates on df first if it may contain duplicates itself.
+    Threshold and twin protection work exactly as in find_duplicates. Exact matches are found too, as they score 100.
+
+    Note: the date of birth columns in df and heat_df must hold the same type (e.g. both datetime, or both text in the same format),
+    as are postcodes when fuzzy_type is 'strict'; otherwise no blocks will line up and no duplicates are found.
+
+    Args:
+        df (pd.DataFrame): The DataFrame of records you want to upload.
+        heat_df (pd.DataFrame): The DataFrame containing your HEAT Student Export.
+        name_col (str | list[str]): The column or list of columns in df containing names. Pass a list in the order the columns should be joined to create a full name e.g. ['First Name', 'Last Name'].
+        date_of_birth_col (str): The column in df containing date of birth.
+        postcode_col (str): The column in df containing postcode.
+        heat_name_col (str | list[str]): The column or list of columns in heat_df containing names.
+        heat_date_of_birth_col (str): The column in heat_df containing date of birth.
+        heat_postcode_col (str): The column in heat_df containing postcode.
+        heat_id_col (str, optional): The column in heat_df containing the HEAT Student ID. Defaults to 'Student HEAT ID'.
+        threshold (int, optional): The threshold for fuzzy matching. The percentage match of the name. Defaults to 80.
+        fuzzy_type (str, optional): 'permissive' blocks on date of birth only, 'strict' on date of birth and postcode. Defaults to "permissive".
+        twin_protection (bool, optional): If True, filters out suspected twins whose first names match by less than twin_protection_threshold. Defaults to True.
+        twin_protection_threshold (int, optional): The threshold for first name matching when twin_protection is True. Defaults to 70.
+
+    Raises:
+        TypeError: Raised if df or heat_df are not DataFrames.
+        ValueError: Raised if threshold is not a value between 0 and 100 or if fuzzy_type is not 'strict' or 'permissive'.
+        ColumnDoesNotExistError: Raised if any of the columns passed as args are not in their DataFrame.
+
+    Returns:
+        A copy of df, in its original order, with a column called 'Potential HEAT Duplicates' containing the HEAT IDs of any potential duplicates.
+    """
+    if not isinstance(df, pd.DataFrame) or not isinstance(heat_df, pd.DataFrame):
+        raise TypeError("df and heat_df must be pandas DataFrames.")
+    _check_settings(threshold, fuzzy_type)
+    _check_columns(df, name_col, date_of_birth_col, postcode_col, "df")
+    _check_columns(heat_df, heat_name_col, heat_date_of_birth_col, heat_postcode_col, "heat_df")
+    if heat_id_col not in heat_df.columns:
+        raise ColumnDoesNotExistError(f"'{heat_id_col}' not found in heat_df columns")
+
+    new_df, _, _ = _prepare_records(df, name_col, date_of_birth_col, postcode_col, None)
+    heat, _, _ = _prepare_records(
+        heat_df, heat_name_col, heat_date_of_birth_col, heat_postcode_col, heat_id_col
+    )
+
+    # Stack both sides under shared block column names so one groupby lines them up
+    block_cols = _block_columns(date_of_birth_col, postcode_col, fuzzy_type)
+    heat_block_cols = _block_columns(heat_date_of_birth_col, heat_postcode_col, fuzzy_type)
+    shared = [f"_block_{n}" for n in range(len(block_cols))]
+    new_side = new_df[block_cols + [_MATCH_NAME]].set_axis(shared + [_MATCH_NAME], axis=1)
+    new_side[_KEY] = np.arange(len(new_df))
+    heat_side = heat[heat_block_cols + [_MATCH_NAME]].set_axis(shared + [_MATCH_NAME], axis=1)
+    heat_side[_KEY] = heat[_KEY].to_numpy()
+    stacked = pd.concat(
+        [new_side.assign(**{_IS_NEW: True}), heat_side.assign(**{_IS_NEW: False})],
+        ignore_index=True,
+    )
+
+    logger.debug(
+        "find_heat_duplicates: checking %d records against %d HEAT records",
+        len(new_df),
+        len(heat),
+    )
+
+    found = {}
+    for _, block_df in stacked.groupby(shared):
+        is_new = block_df[_IS_NEW].to_numpy()
+        if is_new.all() or not is_new.any():
+            continue
+        queries = block_df[is_new]
+        choices = block_df[~is_new]
+
+        rows, cols, _ = _block_pairs(
+            queries[_MATCH_NAME].tolist(),
+            choices[_MATCH_NAME].tolist(),
+            threshold,
+            twin_protection,
+            twin_protection_threshold,
         )
-        col_list = name_col + [date_of_birth_col, postcode_col]
-    else:
-        col_list = [name_col, date_of_birth_col, postcode_col]
-        new_df["_match_name"] = new_df[name_col]
+        positions = queries[_KEY].to_numpy()
+        heat_ids = choices[_KEY].to_numpy()
+        for i, j in zip(rows, cols):
+            found.setdefault(positions[i], set()).add(heat_ids[j])
 
-    # String Column Cleaning
-    for col in col_list:
-        if new_df[col].dtype == "object":
-            new_df[col] = (
-                new_df[col].str.strip().replace(r"\s+", " ", regex=True).fillna("")
+    matches = [", ".join(sorted(found[pos])) if pos in found else None for pos in range(len(new_df))]
+    result = df.copy()
+    result[HEAT_DUPLICATES_COL] = pd.Series(matches, index=df.index, dtype=object)
+
+    logger.info("%d records have potential duplicates in HEAT.", len(found))
+    return result
+
+
+def resolve_duplicates(
+    df: pd.DataFrame,
+    cluster_col: str = DUPLICATES_COL,
+    rules: dict[str, str] | None = None,
+    date_col: str | None = None,
+    default_rule: str = "first",
+) -> pd.DataFrame:
+    """Merges each cluster of potential duplicates found by find_duplicates into one surviving (golden) record.
+    Records with no potential duplicates are returned unchanged. Within each cluster, records are ranked most complete first
+    (most non-empty columns), then most recent first if date_col is given, then in their original order. The top-ranked record
+    survives and keeps its index label, and each column is filled according to its rule:
+
+    Blank or whitespace-only text, which find_duplicates uses for missing names, dates of birth and postcodes, counts as empty.
+
+    - 'first': the first non-empty value in that ranking, so gaps in the most complete record are filled from the others.
+    - 'most_recent': the non-empty value from the record with the latest date_col.
+    - 'most_frequent': the most common non-empty value in the cluster; ties go to the value ranked first.
+
+    All rules are applied with groupby aggregations over the whole DataFrame, so this is fast on large numbers of clusters.
+    Check the clusters before resolving them: twin protection is not foolproof and resolving a cluster discards all but one record.
+
+    Args:
+        df (pd.DataFrame): The output of find_duplicates.
+        cluster_col (str, optional): The column identifying each record's cluster. Use 'Duplicate Cluster' if you called find_duplicates with output='clusters'. Records where this is empty are not duplicates. Defaults to 'Potential Duplicates'.
+        rules (dict[str, str], optional): Rules for individual columns, e.g. {'Postcode': 'most_recent', 'School': 'most_frequent'}. Defaults to None.
+        date_col (str, optional): A date column used to rank records by recency. Required if any column uses 'most_recent'. Defaults to None.
+        default_rule (str, optional): The rule for every column not named in rules. Defaults to 'first'.
+
+    Raises:
+        TypeError: Raised if df is not a DataFrame.
+        ColumnDoesNotExistError: Raised if cluster_col, date_col or a column in rules is not in df.
+        ValueError: Raised if a rule is not 'first', 'most_recent' or 'most_frequent', or if 'most_recent' is used without date_col.
+
+    Returns:
+        A DataFrame with one row per cluster plus every record that had no potential duplicates, in the original order of the surviving records.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError(f"df must be a DataFrame, not {type(df).__name__}")
+    rules = dict(rules or {})
+    for col in [cluster_col] + ([date_col] if date_col is not None else []) + list(rules):
+        if col not in df.columns:
+            raise ColumnDoesNotExistError(f"'{col}' not found in df columns")
+    for rule in [default_rule] + list(rules.values()):
+        if rule not in SURVIVORSHIP_RULES:
+            raise ValueError(
+                f"Invalid rule '{rule}'. Must be 'first', 'most_recent' or 'most_frequent'."
             )
 
-    # Set up ID column if not passed to function
-    if id_col is None:
-        new_df["Duplicate ID"] = "#" + pd.Series(
-            range(1, len(new_df) + 1), 
-            index=new_df.index).astype(str)
-        id_col = "Duplicate ID"
+    col_rules = {col: rules.get(col, default_rule) for col in df.columns if col != cluster_col}
+    if date_col is None and "most_recent" in col_rules.values():
+        raise ValueError("date_col must be set to use the 'most_recent' rule.")
 
-    logger.debug("find_duplicates: searching %d records for duplicates", len(df))
+    in_cluster = df[cluster_col].notna().to_numpy()
+    singles = df[~in_cluster]
+    clustered = df[in_cluster]
+    if clustered.empty:
+        logger.info("No potential duplicates to resolve.")
+        return df.copy()
 
-    # Internal string-typed key: all the grouping/union logic below joins IDs
-    # into strings, so normalise once here rather than assuming str input.
-    _KEY = "_dupe_key"
-    new_df[_KEY] = new_df[id_col].astype(str)
+    # find_duplicates fills missing names, DOBs and postcodes with "", so blank
+    # text counts as empty when ranking records and choosing values
+    original = clustered
+    text_cols = [
+        col for col in clustered.columns
+        if col != cluster_col and pd.api.types.is_string_dtype(clustered[col].dtype)
+    ]
+    if text_cols:
+        clustered = clustered.copy()
+        clustered[text_cols] = clustered[text_cols].replace(r"^\s*$", None, regex=True)
 
-    # Exact Matches
-    def _format_duplicate_list(group_series):
-        # If there is more than one item in the group, it's a duplicate
-        if len(group_series) > 1:
-            return ", ".join(sorted(group_series))
-        return ""
+    cluster_ids, _ = pd.factorize(clustered[cluster_col])
+    position = np.arange(len(clustered))
+    completeness = clustered.notna().sum(axis=1).to_numpy()
+    # lexsort uses the last key as the primary one: cluster, completeness, recency
+    sort_keys = [position, -completeness]
+    by_recency = None
+    if date_col is not None:
+        # Negated so the latest date sorts first; NaT ranks last
+        dates = pd.to_datetime(clustered[date_col], errors="coerce")
+        recency = -dates.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        recency[dates.isna().to_numpy()] = np.iinfo(np.int64).max
+        by_recency = np.lexsort((position, recency, cluster_ids))
+        sort_keys = [position, recency, -completeness]
+    ranked = np.lexsort((*sort_keys, cluster_ids))
+
+    ranked_df = clustered.iloc[ranked]
+    ranked_groups = cluster_ids[ranked]
+    # groupby.first takes the first non-null value of every column in one pass
+    resolved = ranked_df.groupby(ranked_groups, sort=True).first()
+
+    recent_cols = [c for c, rule in col_rules.items() if rule == "most_recent"]
+    if recent_cols:
+        resolved[recent_cols] = (
+            clustered.iloc[by_recency][recent_cols]
+            .groupby(cluster_ids[by_recency], sort=True)
+            .first()
+        )
+
+    for col in [c for c, rule in col_rules.items() if rule == "most_frequent"]:
+        values = pd.DataFrame({
+            "group": ranked_groups,
+            "value": ranked_df[col].to_numpy(),
+            "rank": position,
+        }).dropna(subset=["value"])
+        counts = values.groupby(["group", "value"], sort=False).agg(
+            count=("rank", "size"), first_rank=("rank", "min")
+        ).reset_index()
+        winners = counts.sort_values(
+            ["group", "count", "first_rank"], ascending=[True, False, True]
+        ).drop_duplicates("group")
+        resolved[col] = winners.set_index("group")["value"].reindex(resolved.index)
 
-    new_df["Potential Duplicates"] = (
-        new_df.groupby(col_list)[_KEY].transform(_format_duplicate_list).fillna("")
+    # The top-ranked record of each cluster survives under its own index label
+    first_in_group = np.flatnonzero(np.r_[True, ranked_groups[1:] != ranked_groups[:-1]])
+    survivor_positions = ranked[first_in_group]
+    resolved.index = clustered.index[survivor_positions]
+    resolved[cluster_col] = clustered[cluster_col].iloc[survivor_positions].to_numpy()
+    resolved = resolved[df.columns]
+    # Columns empty across the whole cluster keep the survivor's own blank value
+    resolved = resolved.where(resolved.notna(), original.iloc[survivor_positions])
+
+    # Return survivors and single records in their original order
+    original_order = np.concatenate([
+        np.flatnonzero(~in_cluster),
+        np.flatnonzero(in_cluster)[survivor_positions],
+    ])
+    result = pd.concat([singles, resolved])
+    result = result.iloc[np.argsort(original_order, kind="stable")]
+
+    logger.info(
+        "%d potential duplicates resolved into %d records.", len(clustered), len(resolved)
     )
+    return result
 
-    # Fuzzy Matching
-    parent = {}
 
-    def find_root(i):
-        if parent.setdefault(i, i) != i:
-            parent[i] = find_root(parent[i])
-        return parent[i]
+def _clean_block_keys(chunk: pd.DataFrame, block_cols: list[str]) -> pd.DataFrame:
+    """Cleans block key columns the same way as _prepare_records, for partitioning."""
+    return pd.DataFrame({col: _clean_text(chunk[col]) for col in block_cols})
 
-    def union(i, j):
-        # Merge the sets containing i and j
-        root_i = find_root(i)
-        root_j = find_root(j)
-        if root_i != root_j:
-            parent[root_i] = root_j
 
-    has_dupe = new_df[new_df["Potential Duplicates"] != ""]
-    for row_ids in has_dupe["Potential Duplicates"]:
-        ids_in_group = row_ids.split(", ")
-        first_id = ids_in_group[0]
-        for other_id in ids_in_group[1:]:
-            union(first_id, other_id)
+def find_duplicates_in_csv(
+    filepath: str,
+    output_path: str,
+    name_col: str | list[str],
+    date_of_birth_col: str,
+    postcode_col: str,
+    id_col: str | None = None,
+    threshold: int = 80,
+    fuzzy_type: str = "permissive",
+    twin_protection: bool = True,
+    twin_protection_threshold: int = 70,
+    output: str = "string",
+    tile_size: int | None = None,
+    chunksize: int = 100_000,
+    partitions: int = 64,
+) -> int:
+    """Runs find_duplicates over a CSV file too large to load into memory at once, writing the results to another CSV file.
+    The input is read chunksize rows at a time and each row is written to one of several temporary partition files on disk, chosen from its
+    date of birth (or date of birth and postcode if fuzzy_type is 'strict'). Records that could be duplicates always share these values, so
+    each partition can then be searched on its own with find_duplicates and the results are the same as searching the whole file.
+    Peak memory is set by the largest partition (roughly the file size divided by partitions) rather than the whole file; increase partitions
+    for bigger files.
 
-    # Run Fuzzy Matching
-    if fuzzy_type == "strict":
-        blocks = new_df.groupby([date_of_birth_col, postcode_col])
-    else:
-        blocks = new_df.groupby(date_of_birth_col)
+    All columns are read as text, so dates of birth are compared as written in the file. Rows are written to output_path partition by
+    partition, so their order differs from the input.
 
-    for _, block_df in blocks:
-        if len(block_df) < 2:
-            continue
+    Args:
+        filepath (str): The CSV file to search.
+        output_path (str): The CSV file to write the results to. Overwritten if it exists.
+        name_col (str | list[str]): The column or list of columns contain names. Pass a list in the order the columns should be joined to create a full name e.g. ['First Name', 'Middle Name', 'Last Name'].
+        date_of_birth_col (str): The column containing date of birth.
+        postcode_col (str): The column containing postcode.
+        id_col (str, optional): A column containing an ID for each record. Otherwise a 'Duplicate ID' column is created, numbering rows in file order. Defaults to None.
+        threshold (int, optional): The threshold for fuzzy matching. The percentage match of the name. Defaults to 80.
+        fuzzy_type (str, optional): 'permissive' blocks on date of birth only, 'strict' on date of birth and postcode. Defaults to "permissive".
+        twin_protection (bool, optional): If True, filters out suspected twins. See find_duplicates. Defaults to True.
+        twin_protection_threshold (int, optional): The threshold for first name matching when twin_protection is True. Defaults to 70.
+        output (str, optional): 'string', 'clusters' or 'pairs', as in find_duplicates. With 'pairs' only the pair table is written. Defaults to "string".
+        tile_size (int, optional): Scores very large blocks tile_size records at a time to limit memory use. See find_duplicates. Defaults to None.
+        chunksize (int, optional): Number of rows read from filepath at a time. Defaults to 100,000.
+        partitions (int, optional): Number of temporary partition files to split the data into. Defaults to 64.
 
-        names = block_df["_match_name"].tolist()
-        ids = block_df[_KEY].tolist()
+    Raises:
+        FileNotFoundError: Raised if filepath does not exist.
+        ValueError: Raised if threshold, fuzzy_type, output or tile_size are invalid, if chunksize or partitions are not positive, or if output_path is the same file as filepath.
+        ColumnDoesNotExistError: Raised if any of the columns passed as args are not in the file.
 
-        # Calculate similarity matrix
-        score_matrix = process.cdist(names, names, scorer=fuzz.token_sort_ratio)
+    Returns:
+        The number of records that are potential duplicates, or the number of pairs if output='pairs'.
+    """
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"The file '{filepath}' does not exist.")
+    if os.path.abspath(filepath) == os.path.abspath(output_path):
+        raise ValueError("output_path must be different from filepath.")
+    _check_settings(threshold, fuzzy_type, output, tile_size)
+    if chunksize < 1 or partitions < 1:
+        raise ValueError("chunksize and partitions must be positive integers.")
 
-        for i in range(len(score_matrix)):
-            for j in range(i + 1, len(score_matrix)):
-                if score_matrix[i][j] >= threshold:
-                    if twin_protection:
-                        # Split name on first space. 0 = Name before first space
-                        name_1 = names[i].split(" ")[0]
-                        name_2 = names[j].split(" ")[0]
+    block_cols = _block_columns(date_of_birth_col, postcode_col, fuzzy_type)
+    result_id_col = "Duplicate ID" if id_col is None else id_col
 
-                        # Compare ONLY the first names
-                        first_name_score = fuzz.ratio(name_1, name_2)
+    with tempfile.TemporaryDirectory(prefix="heat_helper_") as spill_dir:
+        # Pass 1: spill every row to the partition file for its block key
+        written = set()
+        rows_read = 0
+        for chunk in pd.read_csv(filepath, chunksize=chunksize, dtype=str):
+            if rows_read == 0:
+                _check_columns(chunk, name_col, date_of_birth_col, postcode_col, filepath)
+                if id_col is not None and id_col not in chunk.columns:
+                    raise ColumnDoesNotExistError(f"'{id_col}' not found in {filepath} columns")
+            if id_col is None:
+                chunk["Duplicate ID"] = "#" + pd.Series(
+                    range(rows_read + 1, rows_read + len(chunk) + 1), index=chunk.index
+                ).astype(str)
+            rows_read += len(chunk)
 
-                        # If the full strings match, but the first names are clearly different,
-                        # assume they are twins (or siblings) and SKIP the union.
-                        if first_name_score < twin_protection_threshold:
-                            continue
+            keys = _clean_block_keys(chunk, block_cols)
+            partition = pd.util.hash_pandas_object(keys, index=False).to_numpy() % partitions
+            for number, part in chunk.groupby(partition):
+                part_path = os.path.join(spill_dir, f"part_{number}.csv")
+                part.to_csv(part_path, mode="a", header=number not in written, index=False)
+                written.add(number)
 
-                    # If fuzzy match found, Union the two IDs
-                    union(ids[i], ids[j])
+        logger.debug(
+            "find_duplicates_in_csv: %d rows spilled to %d partitions", rows_read, len(written)
+        )
 
-    clusters = {}
-    for i in new_df[_KEY]:
-        root = find_root(i)
-        if root not in clusters:
-            clusters[root] = []
-        clusters[root].append(i)
+        # Pass 2: search one partition at a time
+        found = 0
+        cluster_offset = 0
+        header = True
+        for number in sorted(written):
+            part = pd.read_csv(os.path.join(spill_dir, f"part_{number}.csv"), dtype=str)
+            result = find_duplicates(
+                part,
+                name_col,
+                date_of_birth_col,
+                postcode_col,
+                id_col=result_id_col,
+                threshold=threshold,
+                fuzzy_type=fuzzy_type,
+                twin_protection=twin_protection,
+                twin_protection_threshold=twin_protection_threshold,
+                output=output,
+                tile_size=tile_size,
+            )
+            if output == "pairs":
+                found += len(result)
+            elif output == "clusters":
+                # Keep cluster numbers unique across partitions
+                in_cluster = int(result[CLUSTER_COL].notna().sum())
+                if in_cluster:
+                    result[CLUSTER_COL] += cluster_offset
+                    cluster_offset = int(result[CLUSTER_COL].max())
+                found += in_cluster
+            else:
+                found += int(result[DUPLICATES_COL].notna().sum())
+            result.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+            header = False
 
-    id_to_string_map = {}
-    for root, members in clusters.items():
-        if len(members) > 1:
-            member_str = ", ".join(sorted(members))
-            for member in members:
-                id_to_string_map[member] = member_str
+    if header:
+        # Empty input: still leave a header-only output file
+        if output == "pairs":
+            columns = ["id_a", "id_b", "score", "reason"]
+        else:
+            columns = pd.read_csv(filepath, nrows=0).columns.tolist()
+            columns += ["Duplicate ID"] if id_col is None else []
+            columns += [CLUSTER_COL if output == "clusters" else DUPLICATES_COL]
+        pd.DataFrame(columns=columns).to_csv(output_path, index=False)
 
-    # Apply the map
-    new_df["Potential Duplicates"] = new_df[_KEY].map(id_to_string_map).fillna("")
+    logger.info(
+        "%d records searched in %d partitions; %d %s found.",
+        rows_read,
+        len(written),
+        found,
+        "potential duplicate pairs" if output == "pairs" else "potential duplicates",
+    )
+    return found
 
-    new_df = new_df.sort_values(["Potential Duplicates", _KEY], ascending=False)
-    
-    # Final clean up
-    new_df.drop(columns=[c for c in ("_match_name", _KEY) if c in new_df.columns],
-                inplace=True)
 
-    new_df["Potential Duplicates"] = new_df["Potential Duplicates"].replace(
-        r"^\s*$", None, regex=True
+def _read_return(filepath: str, columns: list[str], sheet_name: str | int) -> dict:
+    """Reads only the columns needed for duplicate detection from one Excel file.
+
+    Runs in a worker process. Text columns are cleaned as in _prepare_records and
+    every column is sent back as a categorical (small integer codes plus each
+    distinct value once) rather than as a full object column.
+    """
+    wanted = set(columns)
+    df = pd.read_excel(filepath, sheet_name=sheet_name, usecols=lambda col: col in wanted)
+    for col in columns:
+        if col not in df.columns:
+            raise ColumnDoesNotExistError(f"'{col}' not found in {filepath} columns")
+
+    return {
+        col: pd.Categorical(_clean_text(df[col]) if df[col].dtype == "object" else df[col])
+        for col in columns
+    }
+
+
+def _union_columns(categoricals: list[pd.Categorical]) -> pd.Categorical:
+    """Joins one column's categoricals from every file into one categorical.
+
+    Categories are cast to object first, so a column read as dates in one file
+    and text in another can still be joined.
+    """
+    return union_categoricals([
+        pd.Categorical.from_codes(cat.codes, categories=pd.Index(cat.categories, dtype=object))
+        for cat in categoricals
+    ])
+
+
+def find_duplicates_in_files(
+    filepaths: list[str],
+    name_col: str | list[str],
+    date_of_birth_col: str,
+    postcode_col: str,
+    threshold: int = 80,
+    fuzzy_type: str = "permissive",
+    twin_protection: bool = True,
+    twin_protection_threshold: int = 70,
+    output: str = "string",
+    tile_size: int | None = None,
+    dob_tolerance: int | None = None,
+    sheet_name: str | int = 0,
+    max_workers: int | None = None,
+) -> pd.DataFrame:
+    """Attempts to find duplicate records across several Excel files at once, such as the returns from each school in a folder.
+    Use get_excel_filepaths_in_folder to get the list of files. Each file is read in a separate process, keeping only the name, date of birth and
+    postcode columns, and the records from every file are then searched together in the same way as find_duplicates, so a student appearing in two
+    files is found. Each record is tagged with the file and row it came from.
+
+    Note: on Windows (and in some notebooks), files are read in new processes, so scripts calling this function must protect their entry point with
+    `if __name__ == "__main__":`. Set max_workers=1 to read the files one at a time in the current process instead.
+
+    Args:
+        filepaths (list[str]): The Excel files to search, e.g. the output of get_excel_filepaths_in_folder. Every file must contain the columns below.
+        name_col (str | list[str]): The column or list of columns contain names. Pass a list in the order the columns should be joined to create a full name e.g. ['First Name', 'Middle Name', 'Last Name'].
+        date_of_birth_col (str): The column containing date of birth.
+        postcode_col (str): The column containing postcode.
+        threshold (int, optional): The threshold for fuzzy matching. The percentage match of the name. Defaults to 80.
+        fuzzy_type (str, optional): 'permissive' compares records with the same date of birth, 'strict' those with the same date of birth and postcode. Defaults to "permissive".
+        twin_protection (bool, optional): If True, this filters out suspected twins whose first names match by less than twin_protection_threshold from returned potential duplicates. Defaults to True.
+        twin_protection_threshold (int, optional): The threshold for first name matching when twin_protection is True. Defaults to 70.
+        output (str, optional): 'string', 'clusters' or 'pairs', as in find_duplicates. Defaults to "string".
+        tile_size (int, optional): Limits memory use on very large blocks, as in find_duplicates. Defaults to None.
+        dob_tolerance (int, optional): Also compare records with swapped or nearby dates of birth, as in find_duplicates. Defaults to None.
+        sheet_name (str | int, optional): The sheet to read from every file. Defaults to 0 (the first sheet).
+        max_workers (int, optional): The maximum number of processes used to read files. Defaults to None (one per CPU).
+
+    Raises:
+        TypeError: Raised if filepaths is not a list of filepaths.
+        FileNotFoundError: Raised if any of the files do not exist.
+        ValueError: Raised if filepaths is empty or repeats a file, or if threshold, fuzzy_type, output, tile_size or dob_tolerance are invalid.
+        ColumnDoesNotExistError: Raised if any of the columns passed as args are not in one of the files.
+
+    Returns:
+        A DataFrame with one row per record from every file: 'Source File' (the file name), 'Source Row' (the row number in the sheet, where the header is row 1), the name, date of birth and postcode columns, a 'Duplicate ID' made from the two (e.g. 'school_a.xlsx:12') and 'Potential Duplicates' (or 'Duplicate Cluster' if output='clusters').
+        If output='pairs', a DataFrame of matching pairs of Duplicate IDs as in find_duplicates.
+    """
+    # Error Handling
+    if isinstance(filepaths, str) or not isinstance(filepaths, (list, tuple)):
+        raise TypeError(
+            f"filepaths must be a list of filepaths, not {type(filepaths).__name__}"
+        )
+    if not filepaths:
+        raise ValueError("filepaths must contain at least one file.")
+    if len({os.path.abspath(fp) for fp in filepaths}) < len(filepaths):
+        raise ValueError("filepaths contains the same file more than once.")
+    for filepath in filepaths:
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"The file '{filepath}' does not exist.")
+    _check_settings(threshold, fuzzy_type, output, tile_size, dob_tolerance)
+
+    names = [name_col] if isinstance(name_col, str) else list(name_col)
+    col_list = names + [date_of_birth_col, postcode_col]
+    columns = list(dict.fromkeys(col_list))
+
+    if max_workers == 1 or len(filepaths) == 1:
+        files = [_read_return(fp, columns, sheet_name) for fp in filepaths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            files = list(pool.map(
+                _read_return,
+                filepaths,
+                [columns] * len(filepaths),
+                [sheet_name] * len(filepaths),
+            ))
+
+    # Label records by file name, unless two files in different folders share one
+    labels = [os.path.basename(fp) for fp in filepaths]
+    if len(set(labels)) < len(labels):
+        labels = [str(fp) for fp in filepaths]
+    lengths = [len(file[columns[0]]) for file in files]
+
+    new_df = pd.DataFrame({
+        SOURCE_FILE_COL: pd.Categorical.from_codes(
+            np.repeat(np.arange(len(labels)), lengths), categories=labels
+        ),
+        SOURCE_ROW_COL: np.concatenate(
+            [np.arange(2, n + 2, dtype=np.int32) for n in lengths]
+        ),
+    })
+    for col in columns:
+        new_df[col] = _union_columns([file[col] for file in files])
+
+    logger.debug(
+        "find_duplicates_in_files: %d records read from %d files", len(new_df), len(files)
     )
 
-    dupe_count = len(new_df) - new_df["Potential Duplicates"].isna().sum()
-    logger.info("%d records are potential duplicates.", dupe_count)
+    # Names are the only column needed as full strings, for scoring
+    name_parts = [new_df[col].astype(object).fillna("").astype(str) for col in names]
+    match_name = name_parts[0].str.cat(name_parts[1:], sep=" ") if len(names) > 1 else name_parts[0]
+    # As in _prepare_records, blank names can only be exact duplicates
+    new_df[_MATCH_NAME] = match_name.str.strip().replace("", None)
 
-    return new_df
+    id_col = "Duplicate ID"
+    new_df[id_col] = (
+        new_df[SOURCE_FILE_COL].astype(str) + ":" + new_df[SOURCE_ROW_COL].astype(str)
+    )
+    new_df[_KEY] = new_df[id_col]
+
+    pairs = _find_pairs(
+        new_df,
+        col_list,
+        _block_columns(date_of_birth_col, postcode_col, fuzzy_type),
+        threshold,
+        twin_protection,
+        twin_protection_threshold,
+        tile_size=tile_size,
+        dob_tolerance=dob_tolerance,
+    )
+    return _format_results(new_df, id_col, pairs, output)
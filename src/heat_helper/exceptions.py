@@ -5,7 +5,13 @@ from typing import Any
 ## Custom Errors
 class HeatHelperError(Exception):
     """Base class for all exceptions in this package."""
-    pass
+
+    def __reduce__(self):
+        # Rebuild from the original value when pickled (e.g. raised in a worker
+        # process), otherwise the message prefix is added a second time.
+        if hasattr(self, "value"):
+            return (self.__class__, (self.value,))
+        return super().__reduce__()
 
 
 class InvalidYearGroupError(HeatHelperError):
@@ -32,6 +38,14 @@ class InvalidPostcodeError(HeatHelperError):
         super().__init__(f"Invalid postcode format: '{value}'")
 
 
+class UnknownPostcodeError(HeatHelperError):
+    """Raised when a postcode is not in the reference postcodes and cannot be corrected to one."""
+
+    def __init__(self, value: Any):
+        self.value = value
+        super().__init__(f"Postcode not found in reference postcodes: '{value}'")
+
+
 class ColumnDoesNotExistError(HeatHelperError):
     """Raised when a column is not found in a dataframe."""
 
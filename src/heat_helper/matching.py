@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from rapidfuzz import process, fuzz
 
@@ -178,16 +179,98 @@ def perform_exact_match(
             return final_matched, unmatched
 
 
+def _name_part_scores(left_parts: list[pd.Series], right_parts: list[pd.Series]) -> np.ndarray:
+    """Score matrix of every left name part against every right name part, for one block.
+
+    Returns an array of shape (left part, right part, left row, right row). Missing or blank names score 0 rather than matching each other.
+    """
+    left = [part.fillna("").astype(str).str.strip().tolist() for part in left_parts]
+    right = [part.fillna("").astype(str).str.strip().tolist() for part in right_parts]
+    scores = np.zeros((len(left), len(right), len(left[0]), len(right[0])), dtype=np.float32)
+    for i, left_names in enumerate(left):
+        left_blank = np.array([name == "" for name in left_names])
+        for j, right_names in enumerate(right):
+            right_blank = np.array([name == "" for name in right_names])
+            block = process.cdist(left_names, right_names, scorer=fuzz.token_sort_ratio)
+            block[left_blank, :] = 0
+            block[:, right_blank] = 0
+            scores[i, j] = block
+    return scores
+
+
+def _fuzzy_match_name_parts(
+    unmatched_df: pd.DataFrame,
+    heat_df: pd.DataFrame,
+    left_filter_cols: list[str],
+    right_filter_cols: list[str],
+    left_name_cols: list[str],
+    right_name_cols: list[str],
+    name_weights: tuple[float, float],
+    threshold: int,
+    match_desc: str,
+) -> pd.DataFrame:
+    """The name part scoring of perform_fuzzy_match.
+
+    Within each block, first and last names are scored separately, along with a swapped score (first against last and last against first) for names entered in the wrong columns.
+    The part scores are combined with name_weights and each row takes its best HEAT record if the higher of the two combined scores reaches the threshold.
+    Returns the matches in the same layout as the single name column path, with a 'Names Swapped' column.
+    """
+    first_weight, last_weight = np.asarray(name_weights, dtype=float) / sum(name_weights)
+    left_groups = unmatched_df.groupby(left_filter_cols).groups
+    right_groups = heat_df.groupby(right_filter_cols).groups
+
+    source_index, heat_index, fuzzy_scores, swapped_names = [], [], [], []
+    for key, left_idx in left_groups.items():
+        if key not in right_groups:
+            continue
+        right_idx = right_groups[key]
+        scores = _name_part_scores(
+            [unmatched_df.loc[left_idx, col] for col in left_name_cols],
+            [heat_df.loc[right_idx, col] for col in right_name_cols],
+        )
+        direct = first_weight * scores[0, 0] + last_weight * scores[1, 1]
+        swapped = first_weight * scores[0, 1] + last_weight * scores[1, 0]
+        combined = np.maximum(direct, swapped)
+
+        # First best HEAT record per row, as extractOne would pick
+        best = combined.argmax(axis=1)
+        rows = np.arange(len(left_idx))
+        best_scores = combined[rows, best]
+        keep = best_scores >= threshold
+        source_index.extend(left_idx[keep])
+        heat_index.extend(right_idx[best[keep]])
+        fuzzy_scores.extend(np.round(best_scores[keep].astype(float), 2))
+        swapped_names.extend((swapped[rows, best] > direct[rows, best])[keep])
+
+    if not source_index:
+        return pd.DataFrame()
+
+    final_matches = pd.concat(
+        [
+            unmatched_df.loc[source_index].reset_index(drop=True),
+            heat_df.loc[heat_index].add_suffix(HEAT_SUFFIX).reset_index(drop=True),
+        ],
+        axis=1,
+    )
+    final_matches["Fuzzy Score"] = fuzzy_scores
+    final_matches["Names Swapped"] = swapped_names
+    final_matches["Match Type"] = match_desc
+    final_matches["__SOURCE_INDEX__"] = source_index
+    final_matches["__HEAT_INDEX__"] = heat_index
+    return final_matches
+
+
 def perform_fuzzy_match(
     unmatched_df: pd.DataFrame,
     heat_df: pd.DataFrame,
     left_filter_cols: list[str],
     right_filter_cols: list[str],
-    left_name_col: str,
-    right_name_col: str,
+    left_name_col: str | list[str],
+    right_name_col: str | list[str],
     match_desc: str,
     threshold: int = 80,
     heat_id_col: str | None = None,
+    name_weights: tuple[float, float] = (0.5, 0.5),
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
     """This function allows you to fuzzy match names of students in an external dataset to your HEAT Student Export to retrieve HEAT Student IDs.
     You can control the potential pool of fuzzy matches by specifying filter columns in both DataFrames e.g. only look for fuzzy matches where Date of Birth and Postcode matches.
@@ -199,14 +282,16 @@ def perform_fuzzy_match(
         heat_df (pd.DataFrame): The DataFrame containing your HEAT Student Export.
         left_filter_cols: Filter columns in unmatched_df. By specifying a column here it will be used to control the pool of possible fuzzy matches. For example, by setting Date of birth and postcode here, it will only fuzzy match 'Jo Smith' to 'Joanne Smith' if both records have the same date of birth and postcode.
         right_filter_cols: Corresponding filter columns in heat_df. Must match those set in left_filter_cols.
-        left_name_col: Column which contains the name information (to be matched) in unmatched_df.
-        right_name_col: Column which contains the name information in heat_df.
+        left_name_col: Column which contains the name information (to be matched) in unmatched_df. Or a list of two columns, [first name, last name], to score first and last names separately (see name_weights).
+        right_name_col: Column which contains the name information in heat_df. Must be a list of [first name, last name] columns if left_name_col is a list.
         match_desc: A description of the match; added to a 'Match Type' col in the returned matched DataFrame. Should be descriptive to help you verify matches later, especially if joining multiple returns of this function and exporting to a .csv or Excel file.
         threshold (optional): The acceptable percentage match for fuzzy matching. Higher is stricter and matches will be more similar. Defaults to 80.
         heat_id_col (optional): Defaults to None. The column in heat_df containing the HEAT Student ID. Not required for matching - it is only used so that, if one HEAT record is matched by several student rows, the warning can name the HEAT IDs affected. If omitted, the warning reports a count only.
+        name_weights (optional): Only used when the name columns are [first name, last name] lists. How much the first and last name scores count towards the Fuzzy Score, e.g. (0.3, 0.7) to put more weight on last names. Defaults to (0.5, 0.5). Names are also scored swapped (first against last), in case they were entered in the wrong columns, and the higher score is used. A 'Names Swapped' column shows which matches used the swapped score.
 
     Raises:
-        TypeError: Raised if unmatched_df or heat_df are not pandas DataFrames.
+        TypeError: Raised if unmatched_df or heat_df are not pandas DataFrames, or if only one of left_name_col and right_name_col is a list.
+        ValueError: Raised if name column lists do not have two columns, or if name_weights is not two non-negative numbers with a positive total.
         ColumnDoesNotExistError: Raised if columns specified as filters or name columns do not exist in their DataFrames, or if heat_id_col is supplied and does not exist in heat_df.
         FilterColumnMismatchError: Raised if unequal number of columns specified in left and right filters.
         FuzzyMatchIndexError: Raised when unmatched_df does not have a unique index and cannot be used for matching.
@@ -226,10 +311,30 @@ def perform_fuzzy_match(
     for col in right_filter_cols:
         if col not in heat_df.columns:
             raise ColumnDoesNotExistError(f"'{col}' not found in heat_df")
-    if left_name_col not in unmatched_df.columns:
-        raise ColumnDoesNotExistError(f"'{left_name_col}' not found in unmatched_df")
-    if right_name_col not in heat_df.columns:
-        raise ColumnDoesNotExistError(f"'{right_name_col}' not found in heat_df")
+    name_parts = isinstance(left_name_col, list)
+    if name_parts != isinstance(right_name_col, list):
+        raise TypeError(
+            "left_name_col and right_name_col must both be column names or both be [first name, last name] lists."
+        )
+    left_name_cols = left_name_col if name_parts else [left_name_col]
+    right_name_cols = right_name_col if name_parts else [right_name_col]
+    if name_parts:
+        if len(left_name_cols) != 2 or len(right_name_cols) != 2:
+            raise ValueError("Name column lists must contain two columns: [first name, last name].")
+        if (
+            len(name_weights) != 2
+            or any(weight < 0 for weight in name_weights)
+            or sum(name_weights) <= 0
+        ):
+            raise ValueError(
+                "name_weights must be two non-negative numbers (first name, last name) with a positive total."
+            )
+    for col in left_name_cols:
+        if col not in unmatched_df.columns:
+            raise ColumnDoesNotExistError(f"'{col}' not found in unmatched_df")
+    for col in right_name_cols:
+        if col not in heat_df.columns:
+            raise ColumnDoesNotExistError(f"'{col}' not found in heat_df")
     if heat_id_col is not None and heat_id_col not in heat_df.columns:
         raise ColumnDoesNotExistError(f"'{heat_id_col}' not found in heat_df")
     # Check filter cols are same length
@@ -273,46 +378,60 @@ def perform_fuzzy_match(
         unmatched_df = unmatched_df.copy()
         heat_df = heat_df.copy().reset_index(drop=True)
 
-        # create heat_df blocks for faster matching
-        grouped_heat = heat_df.groupby(right_filter_cols).groups
-
-        matched_results = []
-
-        # Go through each row in unmatched data
-        for idx, row in unmatched_df.iterrows():
-            search_values = row[left_filter_cols].tolist()
-            search_key = (
-                tuple(search_values) if len(search_values) > 1 else search_values[0]
+        if name_parts:
+            final_matches = _fuzzy_match_name_parts(
+                unmatched_df,
+                heat_df,
+                left_filter_cols,
+                right_filter_cols,
+                left_name_cols,
+                right_name_cols,
+                name_weights,
+                threshold,
+                match_desc,
             )
+        else:
+            # create heat_df blocks for faster matching
+            grouped_heat = heat_df.groupby(right_filter_cols).groups
 
-            # Does this block exist in the Heat data?
-            if search_key in grouped_heat:
-                # Get the indices of the rows in the Heat data that match this block
-                potential_match_indices = grouped_heat[search_key]
-                potential_matches = heat_df.loc[potential_match_indices]
-
-                # Fuzzy Match only within this specific block
-                choices = potential_matches[right_name_col].to_dict()  # {index: name}
+            matched_results = []
 
-                best_match = process.extractOne(
-                    query=row[left_name_col],
-                    choices=choices,
-                    scorer=fuzz.token_sort_ratio,
-                    score_cutoff=threshold,
+            # Go through each row in unmatched data
+            for idx, row in unmatched_df.iterrows():
+                search_values = row[left_filter_cols].tolist()
+                search_key = (
+                    tuple(search_values) if len(search_values) > 1 else search_values[0]
                 )
 
-                if best_match:
-                    name, score, heat_idx = best_match
-                    # Reconstruct the row
-                    res = pd.concat([row, heat_df.loc[heat_idx].add_suffix(HEAT_SUFFIX)])
-                    res["Fuzzy Score"] = round(score, 2)
-                    res["Match Type"] = match_desc
-                    res["__SOURCE_INDEX__"] = idx
-                    res["__HEAT_INDEX__"] = heat_idx
-                    matched_results.append(res)
+                # Does this block exist in the Heat data?
+                if search_key in grouped_heat:
+                    # Get the indices of the rows in the Heat data that match this block
+                    potential_match_indices = grouped_heat[search_key]
+                    potential_matches = heat_df.loc[potential_match_indices]
+
+                    # Fuzzy Match only within this specific block
+                    choices = potential_matches[right_name_col].to_dict()  # {index: name}
+
+                    best_match = process.extractOne(
+                        query=row[left_name_col],
+                        choices=choices,
+                        scorer=fuzz.token_sort_ratio,
+                        score_cutoff=threshold,
+                    )
+
+                    if best_match:
+                        name, score, heat_idx = best_match
+                        # Reconstruct the row
+                        res = pd.concat([row, heat_df.loc[heat_idx].add_suffix(HEAT_SUFFIX)])
+                        res["Fuzzy Score"] = round(score, 2)
+                        res["Match Type"] = match_desc
+                        res["__SOURCE_INDEX__"] = idx
+                        res["__HEAT_INDEX__"] = heat_idx
+                        matched_results.append(res)
+
+            final_matches = pd.DataFrame(matched_results)
 
         # final_matches processing
-        final_matches = pd.DataFrame(matched_results)
         if not final_matches.empty:
             final_matches.sort_values(
                 by="Fuzzy Score", ascending=False, inplace=True, ignore_index=True
@@ -1,49 +1,157 @@
 # Import internal libraries
 import re
 import unicodedata
+from functools import lru_cache
 
 # Import external libraries
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    _HAS_PYARROW = True
+except ImportError:  # pragma: no cover
+    _HAS_PYARROW = False
+
 # Import helper functions
-from .core import _string_contains_int, PUNCTUATION
+from .core import (
+    _DIGITS,
+    _factorize_distinct,
+    _string_contains_int,
+    _take_distinct,
+    NICKNAMES,
+    PUNCTUATION,
+)
 from .logger import get_logger, log_series_summary
 
 logger = get_logger(__name__)
 
-def format_name(text: str, errors: str = "raise") -> str | None:
+# Patterns used by format_name, compiled once and shared by the scalar and Series paths
+_HYPHEN_SPACES = re.compile(r"\s*-\s*")  # Cleans spaces around hyphens
+_WHITESPACE = re.compile(r"\s+")  # Cleans any number of spaces -> one space
+_APOSTROPHE_LETTER = re.compile(r"(?<!\bO)'([A-Z])\b")
+_MC_PREFIX = re.compile(r"\b(Mc)([a-z])")
+
+
+def _lower_apostrophe_letter(match: re.Match) -> str:
+    return "'" + match.group(1).lower()
+
+
+def _upper_after_mc(match: re.Match) -> str:
+    return match.group(1) + match.group(2).upper()
+
+
+def _text_mask(series: pd.Series, message: str, errors: str) -> pd.Series:
+    """Marks which values of a Series are strings, for the Series paths of the cleaners.
+
+    With errors='raise' the first non-string value raises the same TypeError as
+    the scalar function would.
+    """
+    is_text = pd.Series(
+        [isinstance(value, str) for value in series], index=series.index, dtype=bool
+    )
+    if errors not in ("ignore", "coerce") and not is_text.all():
+        bad = series[~is_text].iloc[0]
+        raise TypeError(f"{message} must be a string, not {type(bad).__name__}")
+    return is_text
+
+
+def _series_result(
+    series: pd.Series, is_text: pd.Series, cleaned: pd.Series, errors: str
+) -> pd.Series:
+    """Combines cleaned strings with the non-string values, handled as errors= says.
+
+    Non-strings keep their original value under 'ignore' and become None under
+    'coerce', matching the scalar functions.
+    """
+    result = series.astype(object)
+    result[is_text] = cleaned
+    if errors == "coerce":
+        result[~is_text] = None
+    return result
+
+
+def _clean_series(
+    series: pd.Series,
+    clean,
+    func_name: str,
+    errors: str,
+    message: str = "Text",
+    done_label: str = "cleaned",
+) -> pd.Series:
+    """Series path shared by the name cleaners.
+
+    Each distinct value is handled once: clean is called with a Series of the
+    distinct strings and returns their cleaned values (in the same order), the
+    non-strings are handled as errors= says, and the results are mapped back to
+    every row. Logs one summary line.
+    """
+    codes, distinct = _factorize_distinct(series)
+    is_text = _text_mask(distinct, message, errors)
+    cleaned = clean(distinct[is_text])
+    result = _take_distinct(series, codes, _series_result(distinct, is_text, cleaned, errors))
+
+    not_text = int((~is_text.to_numpy())[codes].sum())
+    log_series_summary(
+        logger,
+        func_name,
+        len(series),
+        **{done_label: len(series) - not_text},
+        coerced=not_text if errors == "coerce" else 0,
+        ignored=not_text if errors == "ignore" else 0,
+    )
+    return result
+
+
+def _format_name_series(names: pd.Series) -> pd.Series:
+    """The rules of format_name applied with pandas string methods."""
+    working = (
+        names.str.strip().str.title()
+        .str.replace(_WHITESPACE, " ", regex=True)
+    )
+    # Each remaining rule only runs on the names containing its literal trigger
+    for trigger, pattern, replace in (
+        ("-", _HYPHEN_SPACES, "-"),
+        ("'", _APOSTROPHE_LETTER, _lower_apostrophe_letter),
+        ("Mc", _MC_PREFIX, _upper_after_mc),
+    ):
+        affected = working.str.contains(trigger, regex=False)
+        if affected.any():
+            working[affected] = working[affected].str.replace(pattern, replace, regex=True)
+    return working
+
+
+def format_name(text: str | pd.Series, errors: str = "raise") -> str | pd.Series | None:
     """Cleans the formatting of names. Strips extra whitespaces, converts to title case (with exceptions for names like McDonald) and removes any spaces around hyphens.
     Converting to title case will make any letters following an apostrophe capitals so names like O'Reilly are preserved.
     There is no rule for names which begin with 'Mac' as following letter capitalisation is inconsistent and cannot be inferred.
 
+    Also accepts a pandas Series (DataFrame column). Each distinct name is cleaned once, with pandas string methods, which gives the same results as applying the function to each value but much faster.
+
     Args:
-        text: The name you wish to clean.
-        errors (optional): Default = 'raise' which raises all errors. 'ignore' ignores errors and returns original value, 'coerce' returns None.
+        text: The name you wish to clean, or a Series of names.
+        errors (optional): Default = 'raise' which raises all errors. 'ignore' ignores errors and returns original value, 'coerce' returns None. For a Series, this applies to each value.
 
     Raises:
-        TypeError: Raised if text is not a string.
+        TypeError: Raised if text (or, with errors='raise', any value in a Series) is not a string.
 
     Returns:
-        Cleaned text.
+        Cleaned text, or a Series of cleaned text with the same index.
     """
-    replacements = (
-        (r"\s*-\s*", "-"),  # Cleans spaces around hyphens
-        (r"\s+", " "),  # Cleans any number of spaces -> one space
-    )
+    if isinstance(text, pd.Series):
+        return _clean_series(text, _format_name_series, "format_name", errors, done_label="formatted")
+
     try:
         if not isinstance(text, str):
             raise TypeError(f"Text must be a string, not {type(text).__name__}")
         working_text = text.strip().title()
-        for pattern, replacement in replacements:
-            working_text = re.sub(pattern, replacement, working_text)
+        working_text = _HYPHEN_SPACES.sub("-", working_text)
+        working_text = _WHITESPACE.sub(" ", working_text)
         # Makes a single letter following an apostrophe lowercase
         # Preserves capitalisation after Mc names
-        working_text = re.sub(
-            r"(?<!\bO)'([A-Z])\b", lambda m: "'" + m.group(1).lower(), working_text
-        )
-        working_text = re.sub(
-                    r"\b(Mc)([a-z])", lambda m: m.group(1) + m.group(2).upper(), working_text
-                )
+        working_text = _APOSTROPHE_LETTER.sub(_lower_apostrophe_letter, working_text)
+        working_text = _MC_PREFIX.sub(_upper_after_mc, working_text)
 
         return working_text
     except TypeError:
@@ -56,22 +164,50 @@ def format_name(text: str, errors: str = "raise") -> str | None:
         raise
 
 
+def _find_numbers_series(texts: pd.Series) -> pd.Series:
+    """The check of find_numbers_in_text applied with pandas string methods."""
+    return texts.str.contains(_DIGITS, regex=True)
+
+
+def _remove_numbers_series(texts: pd.Series) -> pd.Series:
+    """The rules of remove_numbers applied with pandas string methods.
+
+    Like the scalar function, only text which contains numbers is stripped.
+    """
+    has_numbers = _find_numbers_series(texts)
+    cleaned = texts.copy()
+    cleaned[has_numbers] = texts[has_numbers].str.replace(_DIGITS, "", regex=True).str.strip()
+    return cleaned
+
+
 def find_numbers_in_text(
-    text: str, errors: str = "raise", convert_to_string: bool = False
-) -> bool | str | None:
+    text: str | pd.Series, errors: str = "raise", convert_to_string: bool = False
+) -> bool | str | pd.Series | None:
     """Checks if one or more numbers are present in a string. Numbers do not have to be consecutive.
 
+    Also accepts a pandas Series (DataFrame column) and returns a boolean mask, which can be used to filter the rows containing numbers. Each distinct value is checked once.
+
     Args:
-        text: The text to check for numbers.
-        errors (optional): Default = 'raise' which raises all errors. 'ignore' ignores errors and returns original value, 'coerce' returns None.
+        text: The text to check for numbers, or a Series of text.
+        errors (optional): Default = 'raise' which raises all errors. 'ignore' ignores errors and returns original value, 'coerce' returns None. For a Series, this applies to each value.
         convert_to_string (optional): Tells the function to convert text datatype to string, if possible. Defaults to False.
 
     Raises:
-        TypeError: Raised if text datatype is not string.
+        TypeError: Raised if text (or, with errors='raise', any value in a Series) is not a string.
 
     Returns:
-        True if string contains one or more numbers (0-9) or False if no numbers present.
+        True if string contains one or more numbers (0-9) or False if no numbers present. For a Series, a Series with the same index using the pandas 'boolean' dtype, where coerced values are <NA>. With errors='ignore', non-strings keep their original value so the Series has object dtype.
     """
+    if isinstance(text, pd.Series):
+        if convert_to_string:
+            text = text.astype(str)
+        result = _clean_series(
+            text, _find_numbers_series, "find_numbers_in_text", errors, done_label="checked"
+        )
+        if errors == "ignore" and not result.map(lambda value: isinstance(value, bool)).all():
+            return result
+        return result.astype("boolean")
+
     try:
         if convert_to_string:
             text = str(text)
@@ -90,28 +226,35 @@ def find_numbers_in_text(
 
 
 def remove_numbers(
-    text: str, errors: str = "raise", convert_to_string: bool = False
-) -> str | None:
+    text: str | pd.Series, errors: str = "raise", convert_to_string: bool = False
+) -> str | pd.Series | None:
     """Removes one or more numbers from a string (text). Numbers do not have to be consecutive.
 
+    Also accepts a pandas Series (DataFrame column). Each distinct value is cleaned once, with pandas string methods, which gives the same results as applying the function to each value but much faster.
+
     Args:
-        text: The string you want to remove numbers from e.g. 'Jane Doe 43'
-        errors (optional): Default = 'raise' which raises all errors. 'ignore' ignores errors and returns original value, 'coerce' returns None.
+        text: The string you want to remove numbers from e.g. 'Jane Doe 43', or a Series of strings.
+        errors (optional): Default = 'raise' which raises all errors. 'ignore' ignores errors and returns original value, 'coerce' returns None. For a Series, this applies to each value.
         convert_to_string (optional): Tells the function to convert text datatype to string, if possible. Defaults to False.
 
     Raises:
-        TypeError: Raised if text is not a string.
+        TypeError: Raised if text (or, with errors='raise', any value in a Series) is not a string.
 
     Returns:
-        Text with numbers removed.
+        Text with numbers removed, or a Series of text with the same index.
     """
+    if isinstance(text, pd.Series):
+        if convert_to_string:
+            text = text.astype(str)
+        return _clean_series(text, _remove_numbers_series, "remove_numbers", errors)
+
     try:
         if convert_to_string:
             text = str(text)
         if not isinstance(text, str):
             raise TypeError(f"Text must be a string, not {type(text).__name__}")
         if _string_contains_int(text):
-            clean = re.sub(r"[0-9]+", "", text)
+            clean = _DIGITS.sub("", text)
             return clean.strip()
         else:
             return text
@@ -125,6 +268,55 @@ def remove_numbers(
         raise
 
 
+# Python's \s as an RE2 character class, so the Arrow path splits on the same whitespace
+_ARROW_WHITESPACE = r"[\t-\r\x1c-\x1f\x85\p{Z}]+"
+
+
+def _is_arrow_string(series: pd.Series) -> bool:
+    dtype = series.dtype
+    if isinstance(dtype, pd.StringDtype):
+        return dtype.storage == "pyarrow"
+    if isinstance(dtype, pd.ArrowDtype):
+        return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+    return False
+
+
+def _arrow_name_part(part: pd.Series):
+    """One name part as an Arrow string array: null, blank and 'nan' become '', then stripped."""
+    array = pa.array(part.astype("string[pyarrow]", copy=False).array)
+    array = pc.utf8_trim_whitespace(array.fill_null(""))
+    return pc.if_else(pc.equal(pc.utf8_lower(array), "nan"), "", array)
+
+
+def _join_names_arrow(
+    first: pd.Series, middle: pd.Series | None, last: pd.Series
+) -> pd.Series:
+    """The DataFrame mode of create_full_name, kept in Arrow string arrays throughout.
+
+    Returns the same dtype as the name parts if they are all Arrow-backed
+    strings, otherwise object dtype like the pandas path. middle is None when no
+    middle name was given.
+    """
+    parts = [first, last] if middle is None else [first, middle, last]
+    arrays = [_arrow_name_part(part) for part in parts]
+    full_name = pc.binary_join_element_wise(*arrays, pa.scalar(" ", arrays[0].type))
+    full_name = pc.utf8_trim_whitespace(
+        pc.replace_substring_regex(full_name, _ARROW_WHITESPACE, " ")
+    )
+    full_name = pc.if_else(pc.equal(full_name, ""), pa.scalar(None, full_name.type), full_name)
+
+    # Same name as pandas gives when adding the parts (the default middle name has none)
+    same_name = middle is not None and first.name == middle.name == last.name
+    result = pd.Series(
+        pd.array(full_name, dtype="string[pyarrow]"),
+        index=first.index,
+        name=first.name if same_name else None,
+    )
+    if all(_is_arrow_string(part) for part in parts):
+        return result.astype(first.dtype, copy=False)
+    return result.astype("object")
+
+
 def create_full_name(
     first_name: str | pd.Series,
     last_name: str | pd.Series,
@@ -143,6 +335,11 @@ def create_full_name(
     usable full name is built from first + last. Mixing Series and str across
     arguments is not allowed.
 
+    If the optional pyarrow dependency is installed, DataFrame mode works on
+    Arrow string arrays, which is much faster and uses less memory. Series of
+    Arrow-backed strings (e.g. dtype "string[pyarrow]") are returned with the
+    same dtype; anything else is returned as object dtype, as without pyarrow.
+
     Args:
         first_name: First name. str (scalar mode) or pd.Series (DataFrame mode).
         last_name: Last name. Must be the same type as first_name.
@@ -199,25 +396,31 @@ def create_full_name(
                     "(e.g. df.reset_index(drop=True)) before calling."
                 )
 
-        def _clean_part(part):
-            # Coerce to text, null/blank/"nan" -> "", then strip.
-            cleaned = part.astype("string").fillna("").str.strip()
-            return cleaned.mask(cleaned.str.lower() == "nan", "")
-
-        first = _clean_part(first_name)
-        middle = _clean_part(middle_name)
-        last = _clean_part(last_name)
-
-        full_name_pd = (first + " " + middle + " " + last)
-        full_name_pd = (
-            full_name_pd.str.replace(r"\s+", " ", regex=True)
-            .str.strip()
-            .astype("object")
-        )
+        if _HAS_PYARROW:
+            full_name_pd = _join_names_arrow(
+                first_name, None if middle_absent else middle_name, last_name
+            )
+            empty_count = int(full_name_pd.isna().sum())
+        else:
+            def _clean_part(part):
+                # Coerce to text, null/blank/"nan" -> "", then strip.
+                cleaned = part.astype("string").fillna("").str.strip()
+                return cleaned.mask(cleaned.str.lower() == "nan", "")
+
+            first = _clean_part(first_name)
+            middle = _clean_part(middle_name)
+            last = _clean_part(last_name)
+
+            full_name_pd = (first + " " + middle + " " + last)
+            full_name_pd = (
+                full_name_pd.str.replace(r"\s+", " ", regex=True)
+                .str.strip()
+                .astype("object")
+            )
 
-        empty_mask = full_name_pd == ""
-        empty_count = int(empty_mask.sum())
-        full_name_pd = full_name_pd.mask(empty_mask, pd.NA)
+            empty_mask = full_name_pd == ""
+            empty_count = int(empty_mask.sum())
+            full_name_pd = full_name_pd.mask(empty_mask, pd.NA)
 
         log_series_summary(
             logger,
@@ -241,28 +444,68 @@ def create_full_name(
         )
 
     parts = [p.strip() for p in (first_name, middle_name, last_name)]
-    full_name = re.sub(r"\s+", " ", " ".join(parts)).strip()
+    full_name = _WHITESPACE.sub(" ", " ".join(parts)).strip()
     return full_name if full_name else None
 
 
-def remove_diacritics(input_text: str, errors: str = "raise") -> str | None:
+def _strip_diacritics_nfkd(text: str) -> str:
+    """The full diacritic removal: normalise to NFKD and drop the combining marks."""
+    nfkd_form = unicodedata.normalize("NFKD", text)
+    return "".join([c for c in nfkd_form if unicodedata.category(c) != "Mn"])
+
+
+# remove_diacritics' answer for each Latin-1 Supplement and Latin Extended-A letter
+# (U+00C0 to U+017F), worked out once with the full algorithm. The characters in
+# a string are decomposed independently, so if translating with this table gives
+# plain ASCII, it is the same text the full algorithm would have produced.
+_DIACRITICS_TABLE = {
+    code: _strip_diacritics_nfkd(chr(code))
+    for code in range(0x00C0, 0x0180)
+    if _strip_diacritics_nfkd(chr(code)) != chr(code)
+}
+
+
+def _remove_diacritics_text(text: str) -> str:
+    """remove_diacritics for a string: the ASCII and translation table fast
+    paths, falling back to the full algorithm."""
+    # Most names are plain ASCII, which has no diacritics to remove
+    if text.isascii():
+        return text
+    translated = text.translate(_DIACRITICS_TABLE)
+    if translated.isascii():
+        return translated
+    return _strip_diacritics_nfkd(text)
+
+
+def remove_diacritics(input_text: str | pd.Series, errors: str = "raise") -> str | pd.Series | None:
     """Removes diacritics (accented letters) from text. Uses python's built-in unicodedata library and normalises to NFKD before removal.
+    Plain ASCII text is returned straight away, and common accented letters (e.g. é, ñ, ł) are looked up in a table rather than normalised, which gives the same result faster.
+
+    Also accepts a pandas Series (DataFrame column), in which case each distinct value is only cleaned once.
 
     Args:
-        input_text: The text you want to remove diacritics from.
-        errors (optional): Default = 'raise' which raises all errors. 'ignore' ignores errors and returns original value, 'coerce' returns None.
+        input_text: The text you want to remove diacritics from, or a Series of text.
+        errors (optional): Default = 'raise' which raises all errors. 'ignore' ignores errors and returns original value, 'coerce' returns None. For a Series, this applies to each value.
 
     Raises:
-        TypeError: Raised if input_text is not a string.
+        TypeError: Raised if input_text (or, with errors='raise', any value in a Series) is not a string.
 
     Returns:
-        Text with accents removed e.g. 'Chloë' -> 'Chloe'.
+        Text with accents removed e.g. 'Chloë' -> 'Chloe', or a Series of text with the same index.
     """
+    if isinstance(input_text, pd.Series):
+        return _clean_series(
+            input_text,
+            lambda texts: [_remove_diacritics_text(text) for text in texts],
+            "remove_diacritics",
+            errors,
+            message="Input",
+        )
+
     try:
         if not isinstance(input_text, str):
             raise TypeError(f"Input must be a string, not {type(input_text).__name__}")
-        nfkd_form = unicodedata.normalize("NFKD", input_text)
-        return "".join([c for c in nfkd_form if unicodedata.category(c) != "Mn"])
+        return _remove_diacritics_text(input_text)
     except TypeError:
         if errors == "coerce":
             logger.debug("remove_diacritics: non-string input %r coerced to None", input_text)
@@ -273,28 +516,53 @@ def remove_diacritics(input_text: str, errors: str = "raise") -> str | None:
         raise
 
 
+@lru_cache(maxsize=32)
+def _punctuation_table(punctuation: str) -> dict:
+    """Translation table turning each character of punctuation into a space, built once per punctuation string."""
+    return str.maketrans(punctuation, " " * len(punctuation))
+
+
+def _remove_punctuation_series(texts: pd.Series, punctuation: str) -> pd.Series:
+    """remove_punctuation for a Series of strings, with pandas string methods."""
+    return (
+        texts.str.translate(_punctuation_table(punctuation))
+        .str.replace(_WHITESPACE, " ", regex=True)
+        .str.strip()
+    )
+
+
 def remove_punctuation(
-    text: str, punctuation: str = PUNCTUATION, errors: str = "raise"
-) -> str | None:
+    text: str | pd.Series, punctuation: str = PUNCTUATION, errors: str = "raise"
+) -> str | pd.Series | None:
     r"""Removes all punctuation except for hyphens and apostrophes from text. Useful for cleaning names.
 
+    Also accepts a pandas Series (DataFrame column), in which case each distinct value is only cleaned once.
+
     Args:
-        text (str): Text you wish to remove punctuation from.
+        text (str | pd.Series): Text you wish to remove punctuation from, or a Series of text.
         punctuation (optional): String containing all punctuation except for hyphens and apostrophes. Can be overridden with your own version if you want to exclude other types of punctuation. Should be one string of all chars to remove. Default includes the following chars: !@#£$%^&*()_=+`~,.<>/?;:"\|[]
-        errors (optional): Default = 'raise' which raises all errors. 'ignore' ignores errors and returns original value, 'coerce' returns None.
+        errors (optional): Default = 'raise' which raises all errors. 'ignore' ignores errors and returns original value, 'coerce' returns None. For a Series, this applies to each value.
 
     Raises:
-        TypeError: Raised if text is not a string.
+        TypeError: Raised if text (or, with errors='raise', any value in a Series) is not a string.
 
     Returns:
-        Text with all punctuation except hyphens and apostrophes removed e.g. 'Jane! Doe.' -> 'Jane Doe'
+        Text with all punctuation except hyphens and apostrophes removed e.g. 'Jane! Doe.' -> 'Jane Doe', or a Series of text with the same index.
     """
+    if isinstance(text, pd.Series):
+        return _clean_series(
+            text,
+            lambda texts: _remove_punctuation_series(texts, punctuation),
+            "remove_punctuation",
+            errors,
+            message="Input",
+        )
+
     try:
         if not isinstance(text, str):
             raise TypeError(f"Input must be a string, not {type(text).__name__}")
-        table = str.maketrans(punctuation, " " * len(punctuation))
-        text = text.strip().translate(table)
-        cleaned = re.sub(r"\s+", " ", text).strip()
+        text = text.strip().translate(_punctuation_table(punctuation))
+        cleaned = _WHITESPACE.sub(" ", text).strip()
         return cleaned
     except TypeError:
         if errors == "coerce":
@@ -304,3 +572,142 @@ def remove_punctuation(
             logger.debug("remove_punctuation: non-string input %r ignored, returning original", text)
             return text
         raise
+
+
+# Steps clean_names can fuse, in the order they are usually chained
+CLEANING_STEPS = ("remove_numbers", "remove_diacritics", "remove_punctuation", "format_name")
+
+
+def _fused_step(step: str, punctuation: str):
+    """Returns one step of clean_names as a str -> str function.
+
+    Each is the matching public function without its own stripping and
+    whitespace collapsing, which clean_names does once at the end instead.
+    Spacing does not change what any step does to the letters, so the result
+    is the same as chaining the public functions.
+    """
+    if step == "remove_numbers":
+        return lambda text: _DIGITS.sub("", text)
+    if step == "remove_diacritics":
+        return _remove_diacritics_text
+    if step == "remove_punctuation":
+        table = _punctuation_table(punctuation)
+        return lambda text: text.translate(table)
+
+    def _format(text):
+        text = _HYPHEN_SPACES.sub("-", text.title())
+        text = _APOSTROPHE_LETTER.sub(_lower_apostrophe_letter, text)
+        return _MC_PREFIX.sub(_upper_after_mc, text)
+    return _format
+
+
+def clean_names(
+    series: pd.Series,
+    steps: list[str] | None = None,
+    punctuation: str = PUNCTUATION,
+    errors: str = "raise",
+) -> pd.Series:
+    """Cleans a Series (DataFrame column) of names with several of the name cleaning functions in one pass.
+    Gives the same result as calling remove_numbers, remove_diacritics, remove_punctuation and format_name one after another, but each name is
+    only read once, and extra whitespace is cleaned once at the end rather than after every step. Because of this, leading, trailing and repeated
+    spaces are always cleaned, even if the last step would not usually clean them (e.g. steps=['remove_numbers']).
+
+    Args:
+        series: The Series of names you wish to clean.
+        steps (optional): The cleaning steps to apply, in order. Any of 'remove_numbers', 'remove_diacritics', 'remove_punctuation' and 'format_name'. Defaults to None, which applies all four in that order.
+        punctuation (optional): The characters removed by 'remove_punctuation'. Defaults to the same characters as remove_punctuation.
+        errors (optional): Default = 'raise' which raises all errors. 'ignore' ignores errors and returns original value, 'coerce' returns None. Applies to each value.
+
+    Raises:
+        TypeError: Raised if series is not a pandas Series, or (with errors='raise') if any value in it is not a string.
+        ValueError: Raised if steps is empty or contains an unknown step.
+
+    Returns:
+        A Series of cleaned names with the same index.
+    """
+    if not isinstance(series, pd.Series):
+        raise TypeError(f"series must be a pandas Series, not {type(series).__name__}")
+    steps = list(CLEANING_STEPS) if steps is None else list(steps)
+    if not steps:
+        raise ValueError("steps must contain at least one cleaning step")
+    unknown = [step for step in steps if step not in CLEANING_STEPS]
+    if unknown:
+        raise ValueError(f"Unknown cleaning step(s) {unknown}. Use any of {list(CLEANING_STEPS)}")
+
+    functions = [_fused_step(step, punctuation) for step in steps]
+
+    def _clean(text):
+        for function in functions:
+            text = function(text)
+        return _WHITESPACE.sub(" ", text).strip()
+
+    return _clean_series(
+        series, lambda names: [_clean(text) for text in names], "clean_names", errors
+    )
+
+
+def _add_nicknames(lookup: dict[str, str], nicknames: dict) -> dict[str, str]:
+    """Adds a dict of formal name -> nicknames to a lookup of lowercase name -> formal name."""
+    for canonical, aliases in nicknames.items():
+        if isinstance(aliases, str):
+            aliases = (aliases,)
+        lookup[canonical.strip().lower()] = canonical
+        for nickname in aliases:
+            lookup[nickname.strip().lower()] = canonical
+    return lookup
+
+
+_NICKNAME_LOOKUP = _add_nicknames({}, NICKNAMES)
+
+
+def _nickname_lookup(aliases: dict | None) -> dict[str, str]:
+    """Lowercase first name or nickname -> canonical first name, with aliases added over the bundled NICKNAMES."""
+    if aliases is None:
+        return _NICKNAME_LOOKUP
+    if not isinstance(aliases, dict):
+        raise TypeError(f"aliases must be a dict, not {type(aliases).__name__}")
+    return _add_nicknames(dict(_NICKNAME_LOOKUP), aliases)
+
+
+def canonical_first_name(
+    text: str | pd.Series, aliases: dict | None = None, errors: str = "raise"
+) -> str | pd.Series | None:
+    """Replaces common nicknames with the formal first name they are short for, e.g. 'Mike' -> 'Michael' and 'Bex' -> 'Rebecca'.
+    Use it on the first names of both DataFrames before matching, so students recorded under a nickname on one side can be found by exact matching rather than fuzzy matching.
+    Case and surrounding whitespace are ignored when looking names up. Names which are not nicknames are returned unchanged, so clean them first (e.g. with format_name) for consistent results.
+    Nicknames shared by more than one name or gender (e.g. 'Alex', 'Sam', 'Dan', 'Fred') are not included, as a wrong alias would make two different students match exactly.
+
+    Also accepts a pandas Series (DataFrame column). Each distinct name is looked up once.
+
+    Args:
+        text: The first name you wish to look up, or a Series of first names.
+        aliases (optional): Extra nicknames as a dict of formal name -> list of nicknames, e.g. {'Rebecca': ['Bekah']}. These are added to the bundled list and take priority over it. Defaults to None.
+        errors (optional): Default = 'raise' which raises all errors. 'ignore' ignores errors and returns original value, 'coerce' returns None. For a Series, this applies to each value.
+
+    Raises:
+        TypeError: Raised if aliases is not a dict, or if text (or, with errors='raise', any value in a Series) is not a string.
+
+    Returns:
+        The formal first name, or the original name if it is not a known nickname. For a Series, a Series with the same index.
+    """
+    lookup = _nickname_lookup(aliases)
+
+    if isinstance(text, pd.Series):
+        def _canonical(names: pd.Series) -> pd.Series:
+            canonical = names.str.strip().str.lower().map(lookup)
+            return canonical.where(canonical.notna(), names)
+
+        return _clean_series(text, _canonical, "canonical_first_name", errors, done_label="checked")
+
+    try:
+        if not isinstance(text, str):
+            raise TypeError(f"Text must be a string, not {type(text).__name__}")
+        return lookup.get(text.strip().lower(), text)
+    except TypeError:
+        if errors == "ignore":
+            logger.debug("canonical_first_name: non-string input %r ignored, returning original", text)
+            return text
+        if errors == "coerce":
+            logger.debug("canonical_first_name: non-string input %r coerced to None", text)
+            return None
+        raise
@@ -1,28 +1,109 @@
 # Import internal libraries
+import json
+import os
 import re
+import string
+from functools import lru_cache
+from itertools import product
+
+# Import external libraries
+import numpy as np
+import pandas as pd
 
 # Import helper functions
-from heat_helper.core import _is_valid_postcode
-from heat_helper.exceptions import InvalidPostcodeError
-from .logger import get_logger
+from heat_helper.core import _POSTCODE, _factorize_distinct, _take_distinct
+from heat_helper.exceptions import (
+    ColumnDoesNotExistError,
+    InvalidPostcodeError,
+    UnknownPostcodeError,
+)
+from .logger import get_logger, log_series_summary
 
 logger = get_logger(__name__)
 
+_WHITESPACE = re.compile(r"\s+")
+# Area, the rest of the outcode, the sector digit and the unit letters of a formatted postcode
+_POSTCODE_PARTS = re.compile(r"^([A-Z]{1,2})([0-9][A-Z0-9]?) ([0-9])([A-Z]{2})$")
+_POSTCODE_PART_COLUMNS = ["Postcode Area", "Postcode District", "Postcode Sector", "Outcode", "Incode"]
+
+# Characters commonly misread or mistyped for each other, used by correct_postcode
+_OCR_CONFUSIONS = {
+    "0": "O", "O": "0", "1": "IL", "I": "1", "L": "1", "5": "S", "S": "5",
+    "8": "B", "B": "8", "2": "Z", "Z": "2", "6": "G", "G": "6",
+}
+_POSTCODE_CHARACTERS = string.ascii_uppercase + string.digits
+# POSTCODE_REGEX without the space, to filter correction candidates before formatting them
+_COMPACT_POSTCODE = re.compile(r"[A-Z]{1,2}[0-9][A-Z0-9]?[0-9][A-Z]{2}")
+
+# Files of a postcode index written by build_postcode_index
+_INDEX_META = "meta.json"
+_INDEX_KEYS = "postcodes.npy"
+
+
+def _format_postcode_series(postcodes: pd.Series, errors: str, categorical: bool) -> pd.Series:
+    """The Series path of format_postcode, on each distinct postcode with pandas string methods."""
+    codes, distinct = _factorize_distinct(postcodes)
+    is_text = np.array([isinstance(value, str) for value in distinct], dtype=bool)
+    # 'coerce' turns non-strings into strings and tries them like the scalar function
+    usable = np.ones(len(distinct), dtype=bool) if errors == "coerce" else is_text
+    candidates = distinct[usable].map(str)
+
+    clean = candidates.str.replace(_WHITESPACE, "", regex=True).str.upper().str.strip()
+    formatted = clean.str[:-3] + " " + clean.str[-3:]
+    valid = np.zeros(len(distinct), dtype=bool)
+    valid[usable] = (clean.str.len().between(5, 7) & formatted.str.fullmatch(_POSTCODE)).to_numpy(dtype=bool)
+
+    if errors not in ("ignore", "coerce") and not valid.all():
+        bad = distinct.iloc[int(np.argmin(valid))]
+        if not isinstance(bad, str):
+            raise TypeError(f"Postcode must be a string, not {type(bad).__name__}")
+        raise InvalidPostcodeError(bad)
 
-def format_postcode(postcode: str, errors: str = "raise") -> str | None:
+    results = distinct.to_numpy(dtype=object, copy=True)
+    results[valid] = formatted[valid[usable]].to_numpy(dtype=object)
+    if errors == "coerce":
+        results[~valid] = None
+
+    formatted_count = int(valid[codes].sum())
+    log_series_summary(
+        logger,
+        "format_postcode",
+        len(postcodes),
+        formatted=formatted_count,
+        unresolved=len(postcodes) - formatted_count,
+    )
+    if categorical:
+        distinct_categories = pd.Categorical(results)
+        return pd.Series(
+            pd.Categorical.from_codes(distinct_categories.codes[codes], distinct_categories.categories),
+            index=postcodes.index,
+            name=postcodes.name,
+        )
+    return _take_distinct(postcodes, codes, results)
+
+
+def format_postcode(
+    postcode: str | pd.Series, errors: str = "raise", categorical: bool = False
+) -> str | pd.Series | None:
     """Attempts to clean a postcode to conform to UK standard.
 
+    Also accepts a pandas Series (DataFrame column). Each distinct postcode is cleaned once, with pandas string methods, which gives the same results as applying the function to each value but much faster.
+
     Args:
-        postcode: Text you want to clean.
-        errors: default = 'raise' which raises all errors. 'ignore' returns original value, 'coerce' attempts to turn postcode into string to run the function, if can't be run returns None.
+        postcode: Text you want to clean, or a Series of postcodes.
+        errors: default = 'raise' which raises all errors. 'ignore' returns original value, 'coerce' attempts to turn postcode into string to run the function, if can't be run returns None. For a Series, this applies to each value.
+        categorical (optional): Only used for a Series. If True, returns a Series with the 'category' dtype, which uses much less memory when postcodes repeat. Coerced values become NaN. Defaults to False.
 
     Raises:
         TypeError: Raised if postcode is not a string.
         InvalidPostcodeError: Raised if postcode is not a valid length (5 to 7 characters once spaces are removed) or does not match the UK postcode format.
 
     Returns:
-        Cleaned postcode.
+        Cleaned postcode, or a Series of cleaned postcodes with the same index.
     """
+    if isinstance(postcode, pd.Series):
+        return _format_postcode_series(postcode, errors, categorical)
+
     # checks is postcode is a string and returns original if not
     try:
         if not isinstance(postcode, str):
@@ -33,14 +114,14 @@ def format_postcode(postcode: str, errors: str = "raise") -> str | None:
                     f"Postcode must be a string, not {type(postcode).__name__}"
                 )
 
-        clean = re.sub(r"\s+", "", postcode).upper().strip()
+        clean = _WHITESPACE.sub("", postcode).upper().strip()
 
         # A UK postcode without its space is 5-7 chars (e.g. M11AA .. EC1A1BB)
         if not (5 <= len(clean) <= 7):
             raise InvalidPostcodeError(postcode)
 
         formatted = f"{clean[:-3]} {clean[-3:]}"
-        if not _is_valid_postcode(formatted):
+        if _POSTCODE.match(formatted) is None:
             raise InvalidPostcodeError(postcode)
         return formatted
         
@@ -52,3 +133,338 @@ def format_postcode(postcode: str, errors: str = "raise") -> str | None:
             logger.debug("format_postcode: invalid postcode %r coerced to None", postcode)
             return None
         raise
+
+
+def split_postcode(postcodes: pd.Series) -> pd.DataFrame:
+    """Splits formatted postcodes into the parts used for grouping and reporting, e.g. 'SW1A 1AA' gives:
+    Postcode Area 'SW', Postcode District 'SW1A', Postcode Sector 'SW1A 1', Outcode 'SW1A' and Incode '1AA'. Postcode District and Outcode are the same value, as both names are in common use.
+
+    Postcodes must already be formatted (e.g. with format_postcode). Values which are not a formatted postcode (including missing values) give missing values in every column.
+    Each column has the pandas 'category' dtype, which uses much less memory than text when values repeat.
+
+    Args:
+        postcodes: A Series (DataFrame column) of formatted postcodes.
+
+    Raises:
+        TypeError: Raised if postcodes is not a pandas Series.
+
+    Returns:
+        A DataFrame with the same index as postcodes and the columns 'Postcode Area', 'Postcode District', 'Postcode Sector', 'Outcode' and 'Incode'.
+    """
+    if not isinstance(postcodes, pd.Series):
+        raise TypeError(f"postcodes must be a pandas Series, not {type(postcodes).__name__}")
+
+    # Work on each distinct postcode, then expand the parts to every row through category codes
+    codes, distinct = pd.factorize(postcodes)
+    parts = pd.Series(distinct, dtype=object).str.extract(_POSTCODE_PARTS)
+    outcode = parts[0] + parts[1]
+    distinct_columns = [parts[0], outcode, outcode + " " + parts[2], outcode, parts[2] + parts[3]]
+
+    columns = {}
+    for name, values in zip(_POSTCODE_PART_COLUMNS, distinct_columns):
+        categories = pd.Categorical(values)
+        # Missing postcodes have code -1, which picks the -1 (missing) added at the end
+        row_codes = np.append(categories.codes, -1)[codes]
+        columns[name] = pd.Categorical.from_codes(row_codes, categories.categories)
+    split = pd.DataFrame(columns, index=postcodes.index)
+
+    found = int(split["Outcode"].notna().sum())
+    log_series_summary(logger, "split_postcode", len(postcodes), split=found, unresolved=len(postcodes) - found)
+    return split
+
+
+def _fixed_width_array(values: pd.Series) -> np.ndarray:
+    """Text as a fixed width numpy array: one byte per character if it is all ASCII, else unicode."""
+    if values.map(str.isascii).all():
+        return values.to_numpy(dtype=bytes)
+    return values.to_numpy(dtype=str)
+
+
+def build_postcode_index(
+    csv_path: str,
+    index_dir: str,
+    postcode_col: str = "pcds",
+    columns: list[str] | None = None,
+    terminated_col: str | None = None,
+) -> int:
+    """Builds a local postcode index from a postcode directory CSV, such as the ONS Postcode Directory, for use with postcode_exists and lookup_postcode.
+    The index is a folder of sorted numpy arrays (one for the postcodes and one per attribute column) which are memory-mapped when used, so lookups start almost instantly and only read the parts of the files they need.
+    No network access is needed: you download the CSV once and rebuild the index when a new release comes out.
+
+    Args:
+        csv_path: Path to the postcode directory CSV.
+        index_dir: Folder to write the index to. It is created if needed, and any index already in it is replaced.
+        postcode_col (optional): The column containing postcodes. Defaults to 'pcds', the ONS Postcode Directory column with one space between the outcode and incode. Postcodes are formatted with format_postcode, and rows without a valid one are left out.
+        columns (optional): Attribute columns to store for lookup_postcode, e.g. ['lsoa21', 'msoa21', 'lad']. Defaults to None, which stores no attributes (enough for postcode_exists).
+        terminated_col (optional): A column which has a value for postcodes no longer in use, e.g. 'doterm' in the ONS Postcode Directory. If given, these postcodes are left out. Defaults to None, which keeps every postcode.
+
+    Raises:
+        ColumnDoesNotExistError: Raised if postcode_col, terminated_col or any of columns are not in the CSV.
+
+    Returns:
+        The number of postcodes in the index.
+    """
+    columns = list(columns or [])
+    usecols = [postcode_col, *columns] + ([terminated_col] if terminated_col else [])
+    header = pd.read_csv(csv_path, nrows=0).columns
+    for col in usecols:
+        if col not in header:
+            raise ColumnDoesNotExistError(f"'{col}' not found in {csv_path}")
+
+    directory = pd.read_csv(csv_path, usecols=list(dict.fromkeys(usecols)), dtype=str, keep_default_na=False)
+    if terminated_col:
+        directory = directory[directory[terminated_col].str.strip() == ""]
+    directory = directory.assign(
+        **{postcode_col: format_postcode(directory[postcode_col], errors="coerce")}
+    )
+    directory = (
+        directory.dropna(subset=[postcode_col])
+        .drop_duplicates(subset=postcode_col)
+        .sort_values(postcode_col, ignore_index=True)
+    )
+
+    os.makedirs(index_dir, exist_ok=True)
+    np.save(os.path.join(index_dir, _INDEX_KEYS), directory[postcode_col].to_numpy(dtype="S8"))
+    files = {}
+    for i, col in enumerate(columns):
+        files[col] = f"column_{i}.npy"
+        np.save(os.path.join(index_dir, files[col]), _fixed_width_array(directory[col].str.strip()))
+    # Written last, so an interrupted build is not mistaken for a complete index
+    with open(os.path.join(index_dir, _INDEX_META), "w") as f:
+        json.dump(
+            {"source": os.path.basename(csv_path), "postcodes": len(directory), "columns": files},
+            f,
+            indent=2,
+        )
+
+    logger.info("build_postcode_index: %d postcodes indexed from %s", len(directory), csv_path)
+    return len(directory)
+
+
+@lru_cache(maxsize=8)
+def _open_postcode_index(index_dir: str, modified: int) -> tuple[np.ndarray, dict]:
+    """Memory-maps a postcode index. modified (the meta file's mtime) is only part of the cache key, so a rebuilt index is reopened."""
+    with open(os.path.join(index_dir, _INDEX_META)) as f:
+        meta = json.load(f)
+    keys = np.load(os.path.join(index_dir, _INDEX_KEYS), mmap_mode="r")
+    columns = {
+        col: np.load(os.path.join(index_dir, filename), mmap_mode="r")
+        for col, filename in meta["columns"].items()
+    }
+    return keys, columns
+
+
+def _postcode_index_rows(postcodes: pd.Series, index_dir: str, func_name: str) -> tuple[np.ndarray, np.ndarray, dict]:
+    """Finds each distinct postcode in the index.
+
+    Returns the codes of postcodes (as from pd.factorize, -1 for missing), the index row of each distinct postcode (-1 if not found) and the index's attribute columns.
+    """
+    if not isinstance(postcodes, pd.Series):
+        raise TypeError(f"postcodes must be a pandas Series, not {type(postcodes).__name__}")
+    keys, columns = _open_postcode_index(
+        os.path.abspath(index_dir), os.stat(os.path.join(index_dir, _INDEX_META)).st_mtime_ns
+    )
+
+    codes, distinct = pd.factorize(format_postcode(postcodes, errors="coerce"))
+    queries = np.asarray(distinct, dtype="S8")
+    rows = np.searchsorted(keys, queries)
+    found = rows < len(keys)
+    found[found] = keys[rows[found]] == queries[found]
+    rows[~found] = -1
+
+    found_count = int(np.append(found, False)[codes].sum())
+    log_series_summary(logger, func_name, len(postcodes), found=found_count, not_found=len(postcodes) - found_count)
+    return codes, rows, columns
+
+
+def postcode_exists(postcodes: pd.Series, index_dir: str) -> pd.Series:
+    """Checks whether each postcode in a Series is in a local postcode index built with build_postcode_index.
+    Unlike format_postcode, this finds postcodes which are correctly formatted but do not exist.
+
+    Postcodes are formatted with format_postcode first, so they do not need to be cleaned beforehand. Anything which cannot be formatted as a postcode is not found.
+
+    Args:
+        postcodes: A Series (DataFrame column) of postcodes.
+        index_dir: The folder containing the index.
+
+    Raises:
+        TypeError: Raised if postcodes is not a pandas Series.
+        FileNotFoundError: Raised if index_dir does not contain a postcode index.
+
+    Returns:
+        A Series of True/False with the same index as postcodes.
+    """
+    codes, rows, _ = _postcode_index_rows(postcodes, index_dir, "postcode_exists")
+    found = np.append(rows >= 0, False)[codes]
+    return pd.Series(found, index=postcodes.index, name=postcodes.name)
+
+
+def lookup_postcode(postcodes: pd.Series, index_dir: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """Looks up attributes of each postcode in a Series, such as LSOA or local authority codes, from a local postcode index built with build_postcode_index.
+
+    Postcodes are formatted with format_postcode first, so they do not need to be cleaned beforehand. Postcodes not in the index (or blank in the postcode directory) get missing values.
+    Each column has the pandas 'category' dtype, which uses much less memory than text when values repeat.
+
+    Args:
+        postcodes: A Series (DataFrame column) of postcodes.
+        index_dir: The folder containing the index.
+        columns (optional): The attribute columns to return. Defaults to None, which returns every column stored in the index.
+
+    Raises:
+        TypeError: Raised if postcodes is not a pandas Series.
+        FileNotFoundError: Raised if index_dir does not contain a postcode index.
+        ColumnDoesNotExistError: Raised if any of columns were not stored in the index.
+
+    Returns:
+        A DataFrame with the same index as postcodes and one column per attribute.
+    """
+    codes, rows, stored = _postcode_index_rows(postcodes, index_dir, "lookup_postcode")
+    columns = list(stored) if columns is None else list(columns)
+    for col in columns:
+        if col not in stored:
+            raise ColumnDoesNotExistError(f"'{col}' not found in postcode index columns {list(stored)}")
+
+    found = rows >= 0
+    result = {}
+    for col in columns:
+        values = np.full(len(rows), None, dtype=object)
+        found_values = stored[col][rows[found]]
+        if found_values.dtype.kind == "S":
+            found_values = np.char.decode(found_values, "ascii")
+        values[found] = found_values
+        categories = pd.Categorical(values)
+        categories = categories.remove_categories([""]) if "" in categories.categories else categories
+        result[col] = pd.Categorical.from_codes(np.append(categories.codes, -1)[codes], categories.categories)
+    return pd.DataFrame(result, index=postcodes.index)
+
+
+def _ocr_candidates(compact: str) -> set[str]:
+    """Every way of swapping characters in a postcode (without spaces) for ones they are often confused with."""
+    options = [char + _OCR_CONFUSIONS.get(char, "") for char in compact]
+    return {"".join(chars) for chars in product(*options)} - {compact}
+
+
+def _edit_candidates(compact: str) -> set[str]:
+    """Every postcode (without spaces) one deletion, swap of neighbours, substitution or insertion away."""
+    splits = [(compact[:i], compact[i:]) for i in range(len(compact) + 1)]
+    deletes = [a + b[1:] for a, b in splits if b]
+    transposes = [a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1]
+    replaces = [a + char + b[1:] for a, b in splits if b for char in _POSTCODE_CHARACTERS]
+    inserts = [a + char + b for a, b in splits for char in _POSTCODE_CHARACTERS]
+    return set(deletes + transposes + replaces + inserts) - {compact}
+
+
+def _reference_membership(reference):
+    """Returns a function which checks an array of formatted postcodes against the reference postcodes."""
+    if isinstance(reference, (str, os.PathLike)):
+        index_dir = os.fspath(reference)
+        keys, _ = _open_postcode_index(
+            os.path.abspath(index_dir), os.stat(os.path.join(index_dir, _INDEX_META)).st_mtime_ns
+        )
+
+        def _in_index(candidates: np.ndarray) -> np.ndarray:
+            queries = candidates.astype("S8")
+            rows = np.searchsorted(keys, queries)
+            found = rows < len(keys)
+            found[found] = keys[rows[found]] == queries[found]
+            return found
+
+        return _in_index
+
+    if isinstance(reference, (pd.Series, pd.Index, np.ndarray, list, tuple, set, frozenset)):
+        valid = pd.Index(format_postcode(pd.Series(list(reference), dtype=object), errors="coerce").dropna().unique())
+        return lambda candidates: pd.Index(candidates, dtype=object).isin(valid)
+    raise TypeError(
+        f"reference must be a postcode index folder or a collection of postcodes, not {type(reference).__name__}"
+    )
+
+
+def _find_corrections(compacts: dict[int, str], in_reference, make_candidates) -> tuple[dict[int, str], set[int]]:
+    """Generates candidates for each bad postcode (by position), checks them all against the reference in one go,
+    and returns the positions with exactly one correction, plus the positions with more than one (which are ambiguous).
+    """
+    owners, candidates = [], []
+    for position, compact in compacts.items():
+        well_formed = list(filter(_COMPACT_POSTCODE.fullmatch, make_candidates(compact)))
+        owners.extend([position] * len(well_formed))
+        candidates.extend(well_formed)
+    if not candidates:
+        return {}, set()
+    candidates = np.array([f"{candidate[:-3]} {candidate[-3:]}" for candidate in candidates], dtype=object)
+    owners = np.array(owners)
+    hits = in_reference(candidates)
+
+    found = pd.Series(candidates[hits]).groupby(owners[hits]).unique()
+    corrections = {position: matches[0] for position, matches in found.items() if len(matches) == 1}
+    return corrections, set(found.index) - set(corrections)
+
+
+def correct_postcode(postcodes: pd.Series, reference, errors: str = "raise") -> pd.Series:
+    """Corrects postcodes with one wrong character, by finding the real postcode they were most likely meant to be.
+    Postcodes are formatted with format_postcode, and any which are badly formatted or not in the reference postcodes are corrected:
+    first by swapping characters which are often confused (O and 0, I and 1, S and 5, etc., in any combination), then, if that finds nothing, by trying every single deletion, insertion, substitution or swap of neighbouring characters.
+    A correction is only made if exactly one reference postcode is found; if there are several, the postcode is treated as unresolved rather than guessed.
+
+    Each distinct bad postcode is only corrected once, and all of the candidate postcodes are checked against the reference together.
+
+    Args:
+        postcodes: A Series (DataFrame column) of postcodes.
+        reference: The postcodes which exist. Either the folder of an index made with build_postcode_index, or a collection of postcodes (e.g. a list or Series, such as the postcode column of your HEAT Student Export).
+        errors (optional): Default = 'raise' which raises all errors. 'ignore' returns the original value for postcodes which cannot be corrected, 'coerce' returns None. Applies to each value.
+
+    Raises:
+        TypeError: Raised if postcodes is not a pandas Series, if reference is not an index folder or collection of postcodes, or (with errors='raise') if any postcode is not a string.
+        UnknownPostcodeError: Raised (with errors='raise') if a postcode is not in the reference and cannot be corrected.
+
+    Returns:
+        A Series of formatted postcodes with the same index as postcodes.
+    """
+    if not isinstance(postcodes, pd.Series):
+        raise TypeError(f"postcodes must be a pandas Series, not {type(postcodes).__name__}")
+    in_reference = _reference_membership(reference)
+
+    codes, distinct = _factorize_distinct(postcodes)
+    is_text = np.array([isinstance(value, str) for value in distinct], dtype=bool)
+    if errors not in ("ignore", "coerce") and not is_text.all():
+        bad = distinct[~is_text].iloc[0]
+        raise TypeError(f"Postcode must be a string, not {type(bad).__name__}")
+
+    formatted = format_postcode(distinct.where(is_text, None), errors="coerce").to_numpy(dtype=object)
+    known = np.zeros(len(distinct), dtype=bool)
+    has_format = pd.notna(formatted)
+    known[has_format] = in_reference(formatted[has_format].astype(str))
+
+    # Only distinct strings which are not known postcodes need correcting
+    compacts = {
+        position: _WHITESPACE.sub("", distinct.iloc[position]).upper()
+        for position in np.flatnonzero(is_text & ~known)
+    }
+    compacts = {position: compact for position, compact in compacts.items() if 4 <= len(compact) <= 8}
+    corrections, ambiguous = _find_corrections(compacts, in_reference, _ocr_candidates)
+    remaining = {p: c for p, c in compacts.items() if p not in corrections and p not in ambiguous}
+    edit_corrections, _ = _find_corrections(remaining, in_reference, _edit_candidates)
+    corrections.update(edit_corrections)
+
+    results = np.where(known, formatted, None).astype(object)
+    for position, correction in corrections.items():
+        results[position] = correction
+    resolved = known.copy()
+    resolved[list(corrections)] = True
+
+    if errors not in ("ignore", "coerce") and not resolved.all():
+        raise UnknownPostcodeError(distinct.iloc[int(np.argmin(resolved))])
+    if errors == "ignore":
+        results[~resolved] = distinct.to_numpy(dtype=object)[~resolved]
+
+    corrected = np.zeros(len(distinct), dtype=bool)
+    corrected[list(corrections)] = True
+    log_series_summary(
+        logger,
+        "correct_postcode",
+        len(postcodes),
+        valid=int(known[codes].sum()),
+        corrected=int(corrected[codes].sum()),
+        unresolved=int((~resolved)[codes].sum()),
+    )
+    return _take_distinct(postcodes, codes, results)
+
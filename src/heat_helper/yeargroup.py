@@ -1,27 +1,61 @@
 # Internal python libraries
 from datetime import date
 
+# Import external libraries
+import numpy as np
+import pandas as pd
+
 # Import helper functions
 from heat_helper.exceptions import InvalidYearGroupError, FELevelError
-from heat_helper.core import _parse_year_group_to_int, CURRENT_ACADEMIC_YEAR_START
-from .logger import get_logger
+from heat_helper.core import (
+    _factorize_distinct,
+    _parse_year_group_to_int,
+    _take_distinct,
+    CURRENT_ACADEMIC_YEAR_START,
+)
+from .logger import get_logger, log_series_summary
 
 logger = get_logger(__name__)
 
-def clean_year_group(year_group: str | int, errors: str = "raise") -> str | int | None:
+# Every value clean_year_group can return for a valid year group
+_YEAR_GROUP_LABELS = frozenset(["Reception"] + [f"Year {i}" for i in range(1, 14)])
+
+# Categories returned by calculate_year_group_from_date for a Series, in school order
+_YEAR_GROUP_FROM_DATE_LABELS = ["Student too young for school", "Reception"] + [f"Year {i}" for i in range(1, 14)]
+
+
+def clean_year_group(
+    year_group: str | int | pd.Series, errors: str = "raise"
+) -> str | int | pd.Series | None:
     """Takes school year groups and cleans them to have the consistent format 'Year i'.
 
+    Also accepts a pandas Series (DataFrame column), in which case each distinct year group is only cleaned once.
+
     Args:
-        year_group: Text you wish to clean. Numbers entered will be cast to strings if possible.
-        errors: default = 'raise' which raises all errors. 'ignore' returns original value, 'coerce' returns None.
+        year_group: Text you wish to clean. Numbers entered will be cast to strings if possible. Or a Series of year groups.
+        errors: default = 'raise' which raises all errors. 'ignore' returns original value, 'coerce' returns None. For a Series, this applies to each value.
 
     Raises:
         InvalidYearGroupError: Raised when `year group` input cannot be parsed or is out of range.
         TypeError: Raised when `year group` input cannot be parsed to a valid int.
 
     Returns:
-        Cleaned year group in the format 'Year i'.
+        Cleaned year group in the format 'Year i', or a Series of cleaned year groups with the same index.
     """
+    if isinstance(year_group, pd.Series):
+        codes, distinct = _factorize_distinct(year_group)
+        results = [clean_year_group(value, errors=errors) for value in distinct]
+        cleaned = pd.Series(results, dtype=object).isin(_YEAR_GROUP_LABELS).to_numpy()
+        n_cleaned = int(cleaned[codes].sum())
+        log_series_summary(
+            logger,
+            "clean_year_group",
+            len(year_group),
+            cleaned=n_cleaned,
+            unresolved=len(year_group) - n_cleaned,
+        )
+        return _take_distinct(year_group, codes, results)
+
     try:
         y_num = _parse_year_group_to_int(year_group)
         return "Reception" if y_num == 0 else f"Year {y_num}"
@@ -35,25 +69,89 @@ def clean_year_group(year_group: str | int, errors: str = "raise") -> str | int
         raise
 
 
+def _year_group_from_date_series(
+    dates: pd.Series, start_of_academic_year: int, errors: str
+) -> pd.Series:
+    """Series path of calculate_year_group_from_date. Works out every year group at once in numpy and flags bad rows with masks rather than exceptions."""
+    if pd.api.types.is_datetime64_any_dtype(dates.dtype):
+        converted = dates
+        not_date = dates.isna().to_numpy()
+    else:
+        values = dates.to_numpy(dtype=object)
+        # NaT is a date subclass, so missing values are checked for separately
+        not_date = np.fromiter(
+            (not isinstance(value, date) or value is pd.NaT for value in values),
+            dtype=bool,
+            count=len(values),
+        )
+        values[not_date] = None
+        converted = pd.to_datetime(pd.Series(values, index=dates.index), errors="coerce")
+
+    months = converted.dt.month.fillna(1).to_numpy(dtype=np.int64)
+    years = converted.dt.year.fillna(0).to_numpy(dtype=np.int64)
+    # Dates pandas cannot hold (before 1677 or after 2262) take their year and month
+    # from the original date, so they are too old or too young just like the scalar path
+    out_of_bounds = np.flatnonzero(~not_date & converted.isna().to_numpy())
+    if len(out_of_bounds):
+        originals = dates.iloc[out_of_bounds]
+        years[out_of_bounds] = [value.year for value in originals]
+        months[out_of_bounds] = [value.month for value in originals]
+    year_groups = start_of_academic_year - years - np.where(months >= 9, 5, 4)
+    too_old = ~not_date & (year_groups > 13)
+
+    unresolved = not_date | too_old
+    if unresolved.any() and errors != "ignore":
+        first = np.flatnonzero(unresolved)[0]
+        value = dates.iloc[first]
+        if not_date[first]:
+            raise TypeError(f"Input must be a date, not {type(value).__name__}")
+        # The scalar path raises InvalidYearGroupError with the right year group
+        calculate_year_group_from_date(value, start_of_academic_year)
+
+    # Code 0 is 'Student too young for school', 1 is 'Reception', 2 is 'Year 1' and so on
+    codes = np.clip(year_groups, -1, 13) + 1
+    codes[unresolved] = -1
+    n_unresolved = int(unresolved.sum())
+    if n_unresolved:
+        logger.debug("calculate_year_group_from_date: %d non-valid inputs ignored, returning None", n_unresolved)
+    log_series_summary(
+        logger,
+        "calculate_year_group_from_date",
+        len(dates),
+        calculated=len(dates) - n_unresolved,
+        unresolved=n_unresolved,
+    )
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=_YEAR_GROUP_FROM_DATE_LABELS),
+        index=dates.index,
+        name=dates.name,
+    )
+
+
 def calculate_year_group_from_date(
-    input_date: date,
+    input_date: date | pd.Series,
     start_of_academic_year: int = CURRENT_ACADEMIC_YEAR_START,
     errors: str = "raise",
-) -> str | None:
+) -> str | pd.Series | None:
     """Calculates school year group from date of birth for the English school system. Returns 'Year i' or 'Reception', or 'Student too young for school' if date of birth is not of school age.
 
+    Also accepts a pandas Series (DataFrame column) of dates, in which case the year groups are calculated for the whole column at once and returned as a categorical Series.
+
     Args:
-        input_date: Date of birth you wish to know the school year for.
+        input_date: Date of birth you wish to know the school year for. Or a Series of dates of birth (datetime64 or date objects).
         start_of_academic_year (optional): The school year in which you want to calculate the year group for. Allows you to calculate a year group for any academic year not just current e.g. for 2025/26 school year enter 2025. Default is start of current academic year.
-        errors (optional): default = 'raise' which raises all errors. 'ignore' returns None.
+        errors (optional): default = 'raise' which raises all errors. 'ignore' returns None. For a Series, this applies to each value, and missing dates are treated as errors.
 
     Raises:
         TypeError: Raised if input_date is not a date.
         InvalidYearGroupError: Raised when the calculated year group is out of range (greater than Year 13).
 
     Returns:
-        Returns 'Year i', 'Reception', 'Student too young for school' or None if errors='ignore'.
+        Returns 'Year i', 'Reception', 'Student too young for school' or None if errors='ignore'. For a Series, a categorical Series of these with the same index, with missing values where errors were ignored.
     """
+    if isinstance(input_date, pd.Series):
+        return _year_group_from_date_series(input_date, start_of_academic_year, errors)
+
     try:
         if not isinstance(input_date, date):
             raise TypeError(f"Input must be a date, not {type(input_date).__name__}")
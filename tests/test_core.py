@@ -1,10 +1,13 @@
 import pytest
+import numpy as np
 import pandas as pd
 from datetime import date
 from pandas.testing import assert_series_equal
 from heat_helper.core import (
     _calc_current_academic_year_start,
-    _parse_year_group_to_int
+    _factorize_distinct,
+    _parse_year_group_to_int,
+    _take_distinct,
 )
 from heat_helper.exceptions import InvalidYearGroupError
 
@@ -73,4 +76,17 @@ def test_parse_year_group_to_int_series_error_propagation():
     input_series = pd.Series(["Year 7", "InvalidInput"])
     
     with pytest.raises(InvalidYearGroupError):
-        _parse_year_group_to_int(input_series)
\ No newline at end of file
+        _parse_year_group_to_int(input_series)
+
+def test_factorize_distinct_keeps_types_apart():
+    # pandas alone treats 1, 1.0 and True (and None/NaN) as the same value
+    series = pd.Series([1, 1.0, True, None, np.nan, "1", 1, "1"])
+    codes, distinct = _factorize_distinct(series)
+    assert codes.tolist() == [0, 1, 2, 3, 4, 5, 0, 5]
+    assert [type(v) for v in distinct] == [int, float, bool, type(None), float, str]
+
+def test_take_distinct_maps_back_to_every_row():
+    series = pd.Series(["b", "a", "b"], index=[7, 8, 9], name="col")
+    codes, distinct = _factorize_distinct(series)
+    result = _take_distinct(series, codes, [value.upper() for value in distinct])
+    assert_series_equal(result, pd.Series(["B", "A", "B"], index=[7, 8, 9], name="col", dtype=object))
\ No newline at end of file
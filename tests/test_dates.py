@@ -4,7 +4,7 @@ from heat_helper.dates import (
     calculate_dob_range_from_year_group,
     reverse_date,
 )
-from heat_helper.exceptions import InvalidYearGroupError
+from heat_helper.exceptions import FELevelError, InvalidYearGroupError
 import pandas as pd
 
 
@@ -98,6 +98,8 @@ def test_calculate_dob_range_series_input():
     # Check types
     assert isinstance(start_series, pd.Series)
     assert isinstance(end_series, pd.Series)
+    assert start_series.dtype == "datetime64[ns]"
+    assert end_series.dtype == "datetime64[ns]"
     
     # Check Index preservation
     pd.testing.assert_index_equal(start_series.index, year_series.index)
@@ -105,12 +107,12 @@ def test_calculate_dob_range_series_input():
     
     # Check specific values
     # For Year 1 (student_a) in 2025: DOB range should be 2019-09-01 to 2020-08-31
-    assert start_series["student_a"] == date(2019, 9, 1)
-    assert end_series["student_a"] == date(2020, 8, 31)
+    assert start_series["student_a"] == pd.Timestamp(2019, 9, 1)
+    assert end_series["student_a"] == pd.Timestamp(2020, 8, 31)
     
     # For Year 3 (student_c) in 2025: DOB range should be 2017-09-01 to 2018-08-31
-    assert start_series["student_c"] == date(2017, 9, 1)
-    assert end_series["student_c"] == date(2018, 8, 31)
+    assert start_series["student_c"] == pd.Timestamp(2017, 9, 1)
+    assert end_series["student_c"] == pd.Timestamp(2018, 8, 31)
 
 def test_calculate_dob_range_series_with_errors_coerce():
     """
@@ -127,7 +129,33 @@ def test_calculate_dob_range_series_with_errors_coerce():
     )
     
     # First record should be valid
-    assert starts[0] == date(2019, 9, 1)
-    # Second record should be (None, None) flattened into the Series
-    assert starts[1] is None
-    assert ends[1] is None
\ No newline at end of file
+    assert starts[0] == pd.Timestamp(2019, 9, 1)
+    # Second record should be NaT in both Series
+    assert pd.isna(starts[1])
+    assert pd.isna(ends[1])
+
+
+def test_calculate_dob_range_series_matches_scalar():
+    year_series = pd.Series(["Reception", "Y1", 13, "Year 7", "Y1", 2.0])
+    starts, ends = calculate_dob_range_from_year_group(year_series, start_year=2024)
+    for year_group, start, end in zip(year_series, starts, ends):
+        assert (start.date(), end.date()) == calculate_dob_range_from_year_group(year_group, 2024)
+
+
+def test_calculate_dob_range_series_raises_on_first_bad_value():
+    with pytest.raises(FELevelError):
+        calculate_dob_range_from_year_group(pd.Series(["Year 7", "Level 3", "Year 15"]), 2025)
+    with pytest.raises(TypeError):
+        calculate_dob_range_from_year_group(pd.Series(["Year 7", None]), 2025)
+
+
+def test_calculate_dob_range_series_out_of_pandas_range():
+    # Year 1 in 3000/01 is born in 2994, past the last date datetime64[ns] can hold
+    with pytest.raises(ValueError, match="outside the range pandas can hold"):
+        calculate_dob_range_from_year_group(pd.Series(["Year 1"]), start_year=3000)
+    starts, ends = calculate_dob_range_from_year_group(pd.Series(["Year 1", "Year 13"]), start_year=2268, errors="coerce")
+    # Year 1 (2262/63) does not fit, Year 13 (2250/51) does
+    assert pd.isna(starts[0]) and pd.isna(ends[0])
+    assert starts[1] == pd.Timestamp(2250, 9, 1)
+    assert ends[1] == pd.Timestamp(2251, 8, 31)
+
@@ -1,7 +1,15 @@
 import pytest
 import pandas as pd
 
-from heat_helper.duplicates import find_duplicates
+from heat_helper.duplicates import (
+    find_duplicates,
+    build_duplicate_index,
+    find_new_duplicates,
+    find_heat_duplicates,
+    resolve_duplicates,
+    find_duplicates_in_csv,
+    find_duplicates_in_files,
+)
 from heat_helper.exceptions import ColumnDoesNotExistError
 
 @pytest.fixture
@@ -127,4 +135,433 @@ def test_single_row_block_coverage():
     }
     df = pd.DataFrame(data)
     result = find_duplicates(df, "name", "dob", "postcode")
-    assert result["Potential Duplicates"].isna().all()
\ No newline at end of file
+    assert result["Potential Duplicates"].isna().all()
+
+def test_exact_matches_with_typed_columns():
+    # Non-string key columns are hashed natively; missing dates never match exactly
+    data = {
+        "name": ["", "", "", ""],
+        "dob": pd.to_datetime(["2000-01-01", "2000-01-01", None, None]),
+        "postcode": ["A1 1AA"] * 4,
+    }
+    result = find_duplicates(pd.DataFrame(data), "name", "dob", "postcode", output="pairs")
+    assert list(zip(result["id_a"], result["id_b"], result["reason"])) == [("#1", "#2", "exact")]
+
+def test_missing_names_are_never_fuzzy_matched():
+    data = {
+        "name": [None, None, "Jo Bloggs"],
+        "dob": ["2000-01-01"] * 3,
+        "postcode": ["A1 1AA", "B1 1BB", "A1 1AA"],
+    }
+    result = find_duplicates(pd.DataFrame(data), "name", "dob", "postcode", threshold=0)
+    assert result["Potential Duplicates"].isna().all()
+
+def test_invalid_output():
+    df = pd.DataFrame({"n": [1], "d": [1], "p": [1]})
+    with pytest.raises(ValueError, match="output must be"):
+        find_duplicates(df, "n", "d", "p", output="list")
+
+def test_output_clusters(sample_df):
+    result = find_duplicates(
+        sample_df, ["first_name", "last_name"], "dob", "postcode", output="clusters"
+    )
+    # Input order kept, integer cluster IDs, <NA> for records with no duplicates
+    assert list(result.index) == list(sample_df.index)
+    assert "Potential Duplicates" not in result.columns
+    assert result["Duplicate Cluster"].dtype == "Int64"
+    assert result["Duplicate Cluster"].tolist()[:2] == [1, 1]
+    assert result["Duplicate Cluster"].iloc[2:].isna().all()
+
+def test_output_pairs():
+    data = {
+        "name": ["Alpha", "Alphe", "Alphi", "Alpha"],
+        "dob": ["2000-01-01"] * 4,
+        "postcode": ["Z1"] * 4,
+    }
+    pairs = find_duplicates(pd.DataFrame(data), "name", "dob", "postcode",
+                            threshold=70, output="pairs")
+    assert list(pairs.columns) == ["id_a", "id_b", "score", "reason"]
+    as_tuples = set(zip(pairs["id_a"], pairs["id_b"], pairs["reason"]))
+    assert ("#1", "#4", "exact") in as_tuples
+    assert ("#1", "#2", "fuzzy") in as_tuples
+    # Each pair is reported once
+    assert len(as_tuples) == len(pairs) == 6
+    assert (pairs.loc[pairs["reason"] == "exact", "score"] == 100).all()
+
+def test_tile_size_gives_same_results():
+    data = {
+        "name": ["Alpha Beta", "Alpha Betta", "Gamma Delta", "Alfa Beta", "Gamma Delt", "Zeta"],
+        "dob": ["2000-01-01"] * 6,
+        "postcode": ["Z1"] * 6,
+    }
+    df = pd.DataFrame(data)
+    whole = find_duplicates(df, "name", "dob", "postcode", threshold=70, output="pairs")
+    for tile_size in (1, 2, 4):
+        tiled = find_duplicates(df, "name", "dob", "postcode", threshold=70,
+                                output="pairs", tile_size=tile_size)
+        pd.testing.assert_frame_equal(
+            tiled.sort_values(["id_a", "id_b"], ignore_index=True),
+            whole.sort_values(["id_a", "id_b"], ignore_index=True),
+        )
+
+def test_invalid_tile_size():
+    df = pd.DataFrame({"n": [1], "d": [1], "p": [1]})
+    with pytest.raises(ValueError, match="tile_size must be"):
+        find_duplicates(df, "n", "d", "p", tile_size=0)
+
+def test_dob_tolerance_swapped_and_near_dates():
+    df = pd.DataFrame({
+        "name": ["John Smith", "Jon Smith", "John Smith", "John Smith", "Paul Jones"],
+        "dob": ["2010-03-04", "2010-04-03", "06/03/2010", "2010-03-09", "2010-04-03"],
+        "postcode": ["A1", "A1", "A1", "A1", "A1"],
+    })
+    # Without a tolerance, no dates of birth match exactly
+    assert find_duplicates(df, "name", "dob", "postcode", output="pairs").empty
+
+    pairs = find_duplicates(df, "name", "dob", "postcode", dob_tolerance=2, output="pairs")
+    found = {(a, b): reason for a, b, reason in zip(pairs["id_a"], pairs["id_b"], pairs["reason"])}
+    # #4 is 5 days out, and Paul Jones shares a date of birth but not a name
+    assert found == {("#1", "#2"): "dob_swap", ("#1", "#3"): "dob_near"}
+
+    swaps_only = find_duplicates(df, "name", "dob", "postcode", dob_tolerance=0, output="pairs")
+    assert swaps_only["reason"].tolist() == ["dob_swap"]
+
+def test_dob_tolerance_mixed_date_formats():
+    df = pd.DataFrame({
+        "name": ["John Smith", "Jon Smith", "John Smith"],
+        "dob": ["01/02/2010", "2010-02-01", "01/02/2010"],
+        "postcode": ["A1", "A1", "A1"],
+    })
+    # The same date written two ways is in two different blocks
+    assert find_duplicates(df, "name", "dob", "postcode", output="pairs")[["id_a", "id_b"]].values.tolist() == [["#1", "#3"]]
+
+    pairs = find_duplicates(df, "name", "dob", "postcode", dob_tolerance=0, output="pairs")
+    found = {(a, b): reason for a, b, reason in zip(pairs["id_a"], pairs["id_b"], pairs["reason"])}
+    # #1 and #3 share the raw value, so they are only reported once, as exact
+    assert found == {("#1", "#3"): "exact", ("#1", "#2"): "dob_near", ("#2", "#3"): "dob_near"}
+
+def test_dob_tolerance_strict_requires_postcode():
+    df = pd.DataFrame({
+        "name": ["John Smith", "John Smith", "Jane Doe", "Jane Doe"],
+        "dob": pd.to_datetime(["2010-03-04", "2010-03-05", "2011-01-01", "2011-01-02"]),
+        "postcode": ["A1", "A1", "A1", "B2"],
+    })
+    result = find_duplicates(df, "name", "dob", "postcode", fuzzy_type="strict", dob_tolerance=1)
+    assert result.set_index("Duplicate ID")["Potential Duplicates"].to_dict() == {
+        "#1": "#1, #2", "#2": "#1, #2", "#3": None, "#4": None
+    }
+
+def test_invalid_dob_tolerance():
+    df = pd.DataFrame({"n": [1], "d": [1], "p": [1]})
+    for bad in (-1, 1.5, True):
+        with pytest.raises(ValueError, match="dob_tolerance must be"):
+            find_duplicates(df, "n", "d", "p", dob_tolerance=bad)
+
+## --- 4. Incremental Duplicate Index ---
+
+@pytest.fixture
+def master_and_new():
+    master = pd.DataFrame({
+        "id": ["M1", "M2", "M3", "M4"],
+        "name": ["John Doe", "Jon Doe", "Alice Brown", "Zed Jones"],
+        "dob": ["1990-01-01", "1990-01-01", "1992-10-10", "1985-05-05"],
+        "postcode": ["SW1 1AA", "SW1 1AA", "N1 1LL", "E1 6AN"],
+    })
+    new = pd.DataFrame({
+        "id": ["N1", "N2", "N3"],
+        "name": ["Johnny Doe", "Alice Browne", "Brand New"],
+        "dob": ["1990-01-01", "1992-10-10", "2001-02-02"],
+        "postcode": ["SW1 1AA", "N1 1LL", "M1 1AA"],
+    })
+    return master, new
+
+def test_build_duplicate_index_records_master_clusters(master_and_new):
+    master, _ = master_and_new
+    index = build_duplicate_index(master, "name", "dob", "postcode", "id")
+    clusters = dict(zip(index["id"], index["Potential Duplicates"]))
+    assert clusters["M1"] == "M1, M2"
+    assert clusters["M3"] is None
+
+def test_find_new_duplicates_matches_full_run(master_and_new):
+    master, new = master_and_new
+    index = build_duplicate_index(master, "name", "dob", "postcode", "id", threshold=70)
+    updates, updated_index = find_new_duplicates(
+        new, index, "name", "dob", "postcode", "id", threshold=70
+    )
+    full = find_duplicates(
+        pd.concat([master, new], ignore_index=True), "name", "dob", "postcode",
+        id_col="id", threshold=70,
+    )
+    expected = full.set_index("id")["Potential Duplicates"].sort_index()
+    actual = updated_index.set_index("id")["Potential Duplicates"].sort_index()
+    assert expected.fillna("").equals(actual.fillna(""))
+
+    # Only records in clusters that gained a new member are returned
+    assert set(updates["id"]) == {"M1", "M2", "N1", "M3", "N2"}
+    assert updates.loc[updates["id"] == "N1", "New Record"].item()
+    assert not updates.loc[updates["id"] == "M1", "New Record"].item()
+
+def test_find_new_duplicates_rejects_existing_ids(master_and_new):
+    master, new = master_and_new
+    index = build_duplicate_index(master, "name", "dob", "postcode", "id")
+    new.loc[0, "id"] = "M1"
+    with pytest.raises(ValueError, match="already in the index"):
+        find_new_duplicates(new, index, "name", "dob", "postcode", "id")
+
+def test_find_new_duplicates_checks_index_columns(master_and_new):
+    master, new = master_and_new
+    index = build_duplicate_index(master, "name", "dob", "postcode", "id")
+    with pytest.raises(ColumnDoesNotExistError):
+        find_new_duplicates(new, index.drop(columns="Potential Duplicates"),
+                            "name", "dob", "postcode", "id")
+
+
+## --- 5. Duplicates Against HEAT ---
+
+@pytest.fixture
+def heat_export():
+    return pd.DataFrame({
+        "Student HEAT ID": [101, 102, 103, 104],
+        "First Name": ["John", "Jonathan", "Robert", "Alice"],
+        "Last Name": ["Doe", "Doe", "Doe", "Brown"],
+        "Date of Birth": ["1990-01-01", "1990-01-01", "1990-01-01", "1992-10-10"],
+        "Postcode": ["SW1 1AA", "SW1 1AA", "SW1 1AA", "N1 1LL"],
+    })
+
+def test_find_heat_duplicates_only_scores_new_against_heat(sample_df, heat_export):
+    result = find_heat_duplicates(
+        sample_df, heat_export,
+        ["first_name", "last_name"], "dob", "postcode",
+        ["First Name", "Last Name"], "Date of Birth", "Postcode",
+        threshold=70,
+    )
+    # Original order and columns kept
+    assert list(result.index) == list(sample_df.index)
+    assert list(result.columns) == list(sample_df.columns) + ["Potential HEAT Duplicates"]
+    dupes = result["Potential HEAT Duplicates"].tolist()
+    # John Doe matches John Doe, but not Robert Doe (twin protection)
+    assert dupes[0] == "101"
+    assert dupes[3] is None
+    assert dupes[4] == "104"
+
+def test_find_heat_duplicates_strict_requires_postcode(sample_df, heat_export):
+    heat = heat_export.assign(Postcode="ZZ9 9ZZ")
+    result = find_heat_duplicates(
+        sample_df, heat,
+        ["first_name", "last_name"], "dob", "postcode",
+        ["First Name", "Last Name"], "Date of Birth", "Postcode",
+        fuzzy_type="strict",
+    )
+    assert result["Potential HEAT Duplicates"].isna().all()
+
+def test_find_heat_duplicates_errors(sample_df, heat_export):
+    with pytest.raises(TypeError):
+        find_heat_duplicates(sample_df, "heat", "first_name", "dob", "postcode",
+                             "First Name", "Date of Birth", "Postcode")
+    with pytest.raises(ColumnDoesNotExistError):
+        find_heat_duplicates(sample_df, heat_export, "first_name", "dob", "postcode",
+                             "First Name", "Date of Birth", "Postcode", heat_id_col="ID")
+
+
+## --- 6. Resolving Duplicates ---
+
+@pytest.fixture
+def clustered_df():
+    return pd.DataFrame({
+        "name": ["Jo Bloggs", "Joe Bloggs", "Jo Blogs", "Ann Other"],
+        "postcode": [None, "AA1 1AA", "BB1 1BB", "CC1 1CC"],
+        "school": ["X", "Y", "Y", None],
+        "email": [None, None, "jo@example.com", None],
+        "updated": ["2020-01-01", "2024-01-01", "2022-01-01", "2020-01-01"],
+        "Potential Duplicates": ["#1, #2, #3"] * 3 + [None],
+    }, index=[10, 11, 12, 13])
+
+def test_resolve_duplicates_first_rule(clustered_df):
+    result = resolve_duplicates(clustered_df)
+    # Most complete record survives (row 12), singles are untouched
+    assert list(result.index) == [12, 13]
+    survivor = result.loc[12]
+    assert survivor["name"] == "Jo Blogs"
+    assert survivor["email"] == "jo@example.com"
+    assert result.loc[13].equals(clustered_df.loc[13])
+
+def test_resolve_duplicates_fills_gaps_from_other_records(clustered_df):
+    df = clustered_df.copy()
+    df.loc[12, ["postcode", "email"]] = None
+    df.loc[10, ["school", "email"]] = [None, "jo@example.com"]
+    result = resolve_duplicates(df)
+    # Row 11 is now the most complete; its missing email comes from row 10
+    assert list(result.index) == [11, 13]
+    assert result.loc[11, "email"] == "jo@example.com"
+
+def test_resolve_duplicates_column_rules(clustered_df):
+    result = resolve_duplicates(
+        clustered_df,
+        rules={"postcode": "most_recent", "school": "most_frequent"},
+        date_col="updated",
+    )
+    survivor = result.loc[12]
+    assert survivor["postcode"] == "AA1 1AA"
+    assert survivor["school"] == "Y"
+
+def test_resolve_duplicates_with_cluster_ids(clustered_df):
+    df = clustered_df.drop(columns="Potential Duplicates")
+    df["Duplicate Cluster"] = pd.array([1, 1, 1, None], dtype="Int64")
+    result = resolve_duplicates(df, cluster_col="Duplicate Cluster")
+    assert list(result.index) == [12, 13]
+
+def test_resolve_duplicates_on_find_duplicates_output():
+    df = pd.DataFrame({
+        "name": ["Jo Bloggs", "Joe Bloggs", "Jo Blogs", "Ann Other"],
+        "dob": pd.to_datetime(["2010-01-01"] * 3 + ["2011-01-01"]),
+        "postcode": [None, "A1 1AA", None, "B1 1BB"],
+        "school": ["X", None, None, "Y"],
+        "email": ["jo@example.com", None, None, None],
+        "id": [1, 2, 3, 4],
+    })
+    found = find_duplicates(df, "name", "dob", "postcode", id_col="id")
+    # find_duplicates fills the missing postcodes with blanks
+    assert (found["postcode"] == "").sum() == 2
+    result = resolve_duplicates(found)
+    survivor = result[result["Potential Duplicates"].notna()].iloc[0]
+    # Jo Bloggs is the most complete record; the blank postcode is filled from Joe Bloggs
+    assert survivor["id"] == 1
+    assert survivor["postcode"] == "A1 1AA"
+    assert survivor["email"] == "jo@example.com"
+
+def test_resolve_duplicates_errors(clustered_df):
+    with pytest.raises(ColumnDoesNotExistError):
+        resolve_duplicates(clustered_df, cluster_col="Cluster")
+    with pytest.raises(ValueError, match="Invalid rule"):
+        resolve_duplicates(clustered_df, rules={"school": "longest"})
+    with pytest.raises(ValueError, match="date_col must be set"):
+        resolve_duplicates(clustered_df, rules={"school": "most_recent"})
+
+
+## --- 7. Out-of-core Duplicates ---
+
+def _ids_to_clusters(df):
+    return df.set_index("Duplicate ID")["Potential Duplicates"].fillna("").sort_index()
+
+@pytest.mark.parametrize("fuzzy_type", ["permissive", "strict"])
+def test_find_duplicates_in_csv_matches_in_memory(tmp_path, fuzzy_type):
+    df = pd.DataFrame({
+        "name": ["John Doe", "Jon Doe", "Jane Doe", "John Smith", "Alice Brown",
+                 "Alice Browne", "Bob Stone", "Rob Stone", "John Doe", "Zed Zee"],
+        "dob": ["1990-01-01", "1990-01-01", "1990-01-01", "1985-05-05", "1992-10-10",
+                "1992-10-10", "2000-02-02", "2000-02-02", " 1990-01-01", "2001-01-01"],
+        "postcode": ["SW1 1AA", "SW1 1AA", "SW1 1AA", "E1 6AN", "N1 1LL",
+                     "N2 2LL", "M1 1AA", "M1 1AA", "E1 6AN", "B1 1BB"],
+    })
+    source = tmp_path / "students.csv"
+    target = tmp_path / "results.csv"
+    df.to_csv(source, index=False)
+
+    count = find_duplicates_in_csv(
+        str(source), str(target), "name", "dob", "postcode",
+        fuzzy_type=fuzzy_type, chunksize=3, partitions=4,
+    )
+    expected = find_duplicates(pd.read_csv(source, dtype=str), "name", "dob", "postcode",
+                               fuzzy_type=fuzzy_type)
+    actual = pd.read_csv(target, dtype=str)
+    assert _ids_to_clusters(actual).equals(_ids_to_clusters(expected))
+    assert count == expected["Potential Duplicates"].notna().sum()
+
+def test_find_duplicates_in_csv_cluster_ids_unique_across_partitions(tmp_path):
+    df = pd.DataFrame({
+        "name": ["John Doe", "Jon Doe", "Alice Brown", "Alice Browne"],
+        "dob": ["1990-01-01", "1990-01-01", "1992-10-10", "1992-10-10"],
+        "postcode": ["A1 1AA"] * 4,
+    })
+    source = tmp_path / "students.csv"
+    df.to_csv(source, index=False)
+    find_duplicates_in_csv(str(source), str(tmp_path / "out.csv"), "name", "dob",
+                           "postcode", output="clusters", partitions=8)
+    result = pd.read_csv(tmp_path / "out.csv")
+    assert result["Duplicate Cluster"].nunique() == 2
+
+def test_find_duplicates_in_csv_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        find_duplicates_in_csv(str(tmp_path / "missing.csv"), str(tmp_path / "out.csv"),
+                               "name", "dob", "postcode")
+    source = tmp_path / "students.csv"
+    pd.DataFrame({"name": ["A"], "dob": ["2000-01-01"]}).to_csv(source, index=False)
+    with pytest.raises(ValueError, match="must be different"):
+        find_duplicates_in_csv(str(source), str(source), "name", "dob", "postcode")
+    with pytest.raises(ColumnDoesNotExistError):
+        find_duplicates_in_csv(str(source), str(tmp_path / "out.csv"),
+                               "name", "dob", "postcode")
+
+
+## --- 8. Duplicates Across Files ---
+
+@pytest.fixture
+def school_returns(tmp_path):
+    school_a = pd.DataFrame({
+        "first": ["John", "Amy", "Sam"],
+        "last": ["Smith", "Lee", "Jones"],
+        "dob": pd.to_datetime(["2010-01-01", "2011-02-02", "2012-03-03"]),
+        "postcode": ["A1 1AA", "B2 2BB", "C3 3CC"],
+        "school": ["A", "A", "A"],
+    })
+    school_b = pd.DataFrame({
+        "first": ["Jon", " Amy ", "Zed"],
+        "last": ["Smith", "Lee", "Zee"],
+        "dob": pd.to_datetime(["2010-01-01", "2011-02-02", "2001-01-01"]),
+        "postcode": ["A1 1AA", "X9 9XX", "C3 3CC"],
+    })
+    school_a.to_excel(tmp_path / "school_a.xlsx", index=False)
+    school_b.to_excel(tmp_path / "school_b.xlsx", index=False)
+    return [str(tmp_path / "school_a.xlsx"), str(tmp_path / "school_b.xlsx")]
+
+def test_find_duplicates_in_files_tags_source(school_returns):
+    result = find_duplicates_in_files(school_returns, ["first", "last"], "dob", "postcode")
+    # Only the columns needed are read
+    assert "school" not in result.columns
+    assert result["Source File"].dtype == "category"
+    found = result.set_index("Duplicate ID")["Potential Duplicates"]
+    assert found["school_a.xlsx:2"] == "school_a.xlsx:2, school_b.xlsx:2"
+    assert found["school_b.xlsx:3"] == "school_a.xlsx:3, school_b.xlsx:3"
+    assert pd.isna(found["school_b.xlsx:4"])
+    row = result[result["Duplicate ID"] == "school_b.xlsx:3"].iloc[0]
+    assert (row["Source File"], row["Source Row"], row["first"]) == ("school_b.xlsx", 3, "Amy")
+
+def test_find_duplicates_in_files_matches_combined_frame(school_returns):
+    pairs = find_duplicates_in_files(school_returns, ["first", "last"], "dob", "postcode",
+                                     fuzzy_type="strict", output="pairs", max_workers=1)
+    combined = pd.concat([pd.read_excel(fp) for fp in school_returns], ignore_index=True)
+    expected = find_duplicates(combined, ["first", "last"], "dob", "postcode",
+                               fuzzy_type="strict", output="pairs")
+    assert pairs[["id_a", "id_b"]].values.tolist() == [["school_a.xlsx:2", "school_b.xlsx:2"]]
+    assert pairs["score"].tolist() == expected["score"].tolist()
+
+def test_find_duplicates_in_files_errors(school_returns, tmp_path):
+    with pytest.raises(TypeError):
+        find_duplicates_in_files(school_returns[0], "first", "dob", "postcode")
+    with pytest.raises(ValueError, match="at least one"):
+        find_duplicates_in_files([], "first", "dob", "postcode")
+    with pytest.raises(ValueError, match="more than once"):
+        find_duplicates_in_files(school_returns * 2, "first", "dob", "postcode")
+    with pytest.raises(FileNotFoundError):
+        find_duplicates_in_files([str(tmp_path / "missing.xlsx")], "first", "dob", "postcode")
+    with pytest.raises(ColumnDoesNotExistError, match="'school' not found"):
+        find_duplicates_in_files(school_returns, "first", "dob", "school")
+
+@pytest.mark.parametrize("name_col", [["first", "last"], "first"])
+def test_find_duplicates_in_files_blank_names_match_combined_frame(tmp_path, name_col):
+    # Both blank-name pairs share a DOB; only the first pair also shares a postcode
+    for name, postcodes in [("a", ["AA1 1AA", "BB2 2BB"]), ("b", ["AA1 1AA", "CC3 3CC"])]:
+        pd.DataFrame({
+            "first": [None, None, name.upper()], "last": [None, None, "Smith"],
+            "dob": ["2010-01-01", "2011-01-01", "2012-01-01"], "postcode": postcodes + ["DD4 4DD"],
+        }).to_excel(tmp_path / f"{name}.xlsx", index=False)
+    files = [str(tmp_path / "a.xlsx"), str(tmp_path / "b.xlsx")]
+
+    pairs = find_duplicates_in_files(files, name_col, "dob", "postcode", output="pairs", max_workers=1)
+    combined = pd.concat([pd.read_excel(fp) for fp in files], ignore_index=True)
+    expected = find_duplicates(combined, name_col, "dob", "postcode", output="pairs")
+    # Blank names are exact duplicates only, never fuzzy matches
+    assert pairs[["id_a", "id_b"]].values.tolist() == [["a.xlsx:2", "b.xlsx:2"]]
+    assert expected[["id_a", "id_b", "score", "reason"]].values.tolist() == [["#1", "#4", 100, "exact"]]
+    assert pairs[["score", "reason"]].values.tolist() == expected[["score", "reason"]].values.tolist()
+
@@ -631,6 +631,92 @@ def test_fuzzy_helper_columns_not_returned(shared_heat_record, unmatched_data, h
         assert "__HEAT_INDEX__" not in frame.columns
 
 
+# --- Name part scoring ---
+
+
+@pytest.fixture
+def name_parts_data():
+    unmatched = pd.DataFrame(
+        {
+            "First": ["Jane", "Smith", "Mike", None],
+            "Last": ["Doe", "John", "Jones", "Brown"],
+            "DOB": ["2008-09-02", "2009-01-01", "2009-07-25", "2008-11-13"],
+        },
+        index=[10, 11, 12, 13],
+    )
+    heat = pd.DataFrame(
+        {
+            "ID": ["H1", "H2", "H3", "H4"],
+            "First Name": ["Jane", "John", "Michael", "Sarah"],
+            "Last Name": ["Doe", "Smith", "Jones", "Brown"],
+            "Birth Date": ["2008-09-02", "2009-01-01", "2009-07-25", "2008-11-13"],
+        }
+    )
+    return unmatched, heat
+
+
+def _fuzzy_parts(unmatched, heat, **kwargs):
+    return perform_fuzzy_match(
+        unmatched,
+        heat,
+        ["DOB"],
+        ["Birth Date"],
+        ["First", "Last"],
+        ["First Name", "Last Name"],
+        "Name parts",
+        **kwargs,
+    )
+
+
+def test_fuzzy_match_name_parts_scores_swapped_names(name_parts_data):
+    unmatched, heat = name_parts_data
+    matches, remaining = _fuzzy_parts(unmatched, heat, threshold=70)
+
+    by_id = matches.set_index("HEAT: ID")
+    assert by_id.loc["H1", "Fuzzy Score"] == 100
+    assert not by_id.loc["H1", "Names Swapped"]
+    # 'Smith John' was entered with first and last names the wrong way round
+    assert by_id.loc["H2", "Fuzzy Score"] == 100
+    assert by_id.loc["H2", "Names Swapped"]
+    assert by_id.loc["H3", "Fuzzy Score"] == pytest.approx(77.27)
+    # A missing first name scores 0 for that part, so only the last name counts
+    assert remaining.index.tolist() == [13]
+    assert matches["Match Type"].eq("Name parts").all()
+
+
+def test_fuzzy_match_name_parts_weights(name_parts_data):
+    unmatched, heat = name_parts_data
+    matches, remaining = _fuzzy_parts(unmatched, heat, threshold=70, name_weights=(0.3, 0.7))
+
+    by_id = matches.set_index("HEAT: ID")
+    assert by_id.loc["H3", "Fuzzy Score"] == pytest.approx(86.36)
+    assert by_id.loc["H4", "Fuzzy Score"] == 70
+    assert remaining.empty
+
+
+def test_fuzzy_match_name_parts_matches_string_path_on_order(name_parts_data):
+    """Equal best scores pick the first HEAT record, as extractOne does."""
+    unmatched, heat = name_parts_data
+    heat = pd.concat([heat, heat.iloc[[0]].assign(ID="H5")], ignore_index=True)
+    matches, _ = _fuzzy_parts(unmatched.iloc[[0]], heat)
+    assert matches["HEAT: ID"].tolist() == ["H1"]
+
+
+@pytest.mark.parametrize(
+    "left, right, kwargs, error, message",
+    [
+        (["First", "Last"], "Last Name", {}, TypeError, "both be column names or both be"),
+        (["First"], ["First Name"], {}, ValueError, "two columns"),
+        (["First", "Last"], ["First Name", "Last Name"], {"name_weights": (0, 0)}, ValueError, "positive total"),
+        (["First", "Wrong"], ["First Name", "Last Name"], {}, ColumnDoesNotExistError, "'Wrong' not found in unmatched_df"),
+    ],
+)
+def test_fuzzy_match_name_parts_errors(name_parts_data, left, right, kwargs, error, message):
+    unmatched, heat = name_parts_data
+    with pytest.raises(error, match=message):
+        perform_fuzzy_match(unmatched, heat, ["DOB"], ["Birth Date"], left, right, "T", **kwargs)
+
+
 # ---- FUZZY MATCHING SCHOOL DOB RANGE TESTE
 
 
@@ -1,3 +1,5 @@
+import logging
+
 import pytest
 import pandas as pd
 from heat_helper.names import (
@@ -6,14 +8,14 @@ from heat_helper.names import (
     remove_numbers,
     remove_diacritics,
     create_full_name,
-    remove_punctuation
+    remove_punctuation,
+    clean_names,
+    canonical_first_name,
 )
 
 
 # --- FORMAT NAMES TESTS ---
-@pytest.mark.parametrize(
-    "name, clean_name",
-    [
+FORMAT_NAME_CASES = [
         ("JANE DOE", "Jane Doe"),
         ("jane DOE", "Jane Doe"),
         ("Jane - Jane Doe", "Jane-Jane Doe"),
@@ -35,8 +37,10 @@ from heat_helper.names import (
         ("D'ARCY", "D'Arcy"),
         ("anne-marie o'donnell", "Anne-Marie O'Donnell"), 
         ("MCDONALD", "McDonald"),
-    ],
-)
+]
+
+
+@pytest.mark.parametrize("name, clean_name", FORMAT_NAME_CASES)
 def test_format_names(name, clean_name):
     assert format_name(name) == clean_name
 
@@ -57,6 +61,37 @@ def test_format_name_coerce_errors():
     assert format_name(12, errors="coerce") == None
 
 
+def test_format_name_series_matches_scalar():
+    names, expected = zip(*FORMAT_NAME_CASES)
+    series = pd.Series(names, index=range(10, 10 + len(names)), name="First Name")
+    result = format_name(series)
+    assert result.tolist() == list(expected)
+    assert result.index.equals(series.index)
+    assert result.name == "First Name"
+
+
+@pytest.mark.parametrize("errors, expected", [
+    ("ignore", ["Jane Doe", 12, None]),
+    ("coerce", ["Jane Doe", None, None]),
+])
+def test_format_name_series_errors(errors, expected):
+    series = pd.Series(["JANE DOE", 12, None])
+    assert format_name(series, errors=errors).tolist() == expected
+
+
+def test_format_name_series_raises_on_any_non_string():
+    with pytest.raises(TypeError, match="Text must be a string, not int"):
+        format_name(pd.Series(["Jane", 12]))
+
+
+def test_format_name_series_logs_one_summary(caplog):
+    with caplog.at_level(logging.INFO, logger="heat_helper.names"):
+        format_name(pd.Series(["jane", "JOHN", 3]), errors="coerce")
+    assert [r.getMessage() for r in caplog.records] == [
+        "format_name: 3 values processed (2 formatted, 1 coerced)"
+    ]
+
+
 # FIND NUMBERS IN TEXT
 @pytest.mark.parametrize(
     "num_name, clean_num_name",
@@ -95,6 +130,28 @@ def test_find_numbers_coerce():
     assert find_numbers_in_text(123, errors="coerce") == None
 
 
+def test_find_numbers_series_returns_boolean_mask():
+    series = pd.Series(["Jane Doe", "Jane Doe 21", "J4ne", "Jane Doe"], index=[5, 6, 7, 8])
+    result = find_numbers_in_text(series)
+    assert str(result.dtype) == "boolean"
+    assert result.tolist() == [False, True, True, False]
+    assert result.index.equals(series.index)
+
+
+@pytest.mark.parametrize("errors, expected", [
+    ("ignore", [True, 12, None]),
+    ("coerce", [True, pd.NA, pd.NA]),
+])
+def test_find_numbers_series_errors(errors, expected):
+    result = find_numbers_in_text(pd.Series(["Jane 1", 12, None]), errors=errors)
+    assert result.tolist() == expected
+
+
+def test_find_numbers_series_convert():
+    result = find_numbers_in_text(pd.Series(["Jane", 12]), convert_to_string=True)
+    assert result.tolist() == [False, True]
+
+
 # REMOVE NUMBERS
 def test_remove_numbers_error():
     with pytest.raises(
@@ -132,6 +189,24 @@ def test_remove_numbers_coerce():
     assert remove_numbers(123, errors="coerce") == None
 
 
+def test_remove_numbers_series_matches_scalar():
+    names = ["Jane Doe", "Jane Doe 21", "1 Jane Doe 79", "  23 Jane", "  Jane  "]
+    assert remove_numbers(pd.Series(names)).tolist() == [remove_numbers(n) for n in names]
+
+
+@pytest.mark.parametrize("errors, expected", [
+    ("ignore", ["Jane", 12, None]),
+    ("coerce", ["Jane", None, None]),
+])
+def test_remove_numbers_series_errors(errors, expected):
+    assert remove_numbers(pd.Series(["Jane 4", 12, None]), errors=errors).tolist() == expected
+
+
+def test_remove_numbers_series_raises_on_any_non_string():
+    with pytest.raises(TypeError, match="Text must be a string, not int"):
+        remove_numbers(pd.Series(["Jane", 12]))
+
+
 # DIACRITICS
 def test_basic_diacritics():
     """Test standard European accents."""
@@ -194,6 +269,31 @@ def test_create_full_name_pandas():
     pd.testing.assert_series_equal(result, expected)
 
 
+@pytest.mark.parametrize("with_middle", [False, True])
+def test_create_full_name_arrow_matches_pandas(monkeypatch, with_middle):
+    pytest.importorskip("pyarrow")
+    import heat_helper.names as names
+
+    first = pd.Series([" Jane ", None, "nan", 12, "Mary\u00a0Ann", ""], name="First")
+    last = pd.Series(["Doe", "Smith", None, "Khan", "Jones", "  "], name="First")
+    middle = pd.Series(["Ann", "", "Lou", None, "NaN", " "], name="First")
+    args = (first, last, middle) if with_middle else (first, last)
+
+    arrow_result = create_full_name(*args)
+    monkeypatch.setattr(names, "_HAS_PYARROW", False)
+    pd.testing.assert_series_equal(arrow_result, create_full_name(*args))
+
+
+def test_create_full_name_keeps_arrow_dtype():
+    pytest.importorskip("pyarrow")
+    fnames = pd.Series(["Jane", None]).astype("string[pyarrow]")
+    lnames = pd.Series(["Doe", None]).astype("string[pyarrow]")
+    result = create_full_name(fnames, lnames)
+
+    expected = pd.Series(["Jane Doe", pd.NA], dtype="string[pyarrow]")
+    pd.testing.assert_series_equal(result, expected)
+
+
 # Test Remove punctuation
 def test_punctuation_replacement_with_space():
     """
@@ -236,4 +336,119 @@ def test_raise_on_invalid_type():
 def test_custom_punctuation_override():
     """Ensures the function respects the 'punctuation' argument if provided."""
     # Only remove the '@', leave the '!'
-    assert remove_punctuation("user@host!", punctuation="@") == "user host!"
\ No newline at end of file
+    assert remove_punctuation("user@host!", punctuation="@") == "user host!"
+
+def test_remove_diacritics_fast_paths_match_full_algorithm():
+    from heat_helper.names import _strip_diacritics_nfkd
+
+    latin = "".join(chr(code) for code in range(0x00C0, 0x0180))
+    texts = [latin, "Siân Ó Súilleabháin", "Łukasz Dvořák", "ǅemal", "e\u0301", "Jane Doe"]
+    texts += list(latin)
+    for text in texts:
+        assert remove_diacritics(text) == _strip_diacritics_nfkd(text)
+    assert remove_diacritics(pd.Series(texts)).tolist() == [_strip_diacritics_nfkd(t) for t in texts]
+
+
+def test_remove_diacritics_and_punctuation_series():
+    texts = pd.Series(["Chloë!", "Zoë...Smith", "Chloë!", 5])
+    assert remove_diacritics(texts, errors="coerce").tolist() == ["Chloe!", "Zoe...Smith", "Chloe!", None]
+    assert remove_punctuation(texts, errors="ignore").tolist() == ["Chloë", "Zoë Smith", "Chloë", 5]
+    with pytest.raises(TypeError, match="Input must be a string, not int"):
+        remove_diacritics(texts)
+
+
+def test_remove_punctuation_series_custom_punctuation_and_cached_table():
+    from heat_helper.names import _punctuation_table
+
+    texts = pd.Series(["Jane!  Doe.", " O'Reilly-Smith ", "a\tb", "Jane!  Doe."])
+    result = remove_punctuation(texts, punctuation="!.")
+    assert result.tolist() == [remove_punctuation(t, punctuation="!.") for t in texts]
+    assert result.tolist() == ["Jane Doe", "O'Reilly-Smith", "a b", "Jane Doe"]
+    assert _punctuation_table("!.") is _punctuation_table("!.")
+
+
+# CLEAN NAMES
+MESSY_NAMES = pd.Series([
+    "JANE DOE 2", "chloë  o'neill.", "sarah - jane smith", " mcdonald!! ",
+    "Zoë 4 Smith", "o'connor-mcdonald", "...", "",
+])
+
+
+def test_clean_names_matches_chained_functions():
+    chained = (
+        MESSY_NAMES.apply(remove_numbers)
+        .apply(remove_diacritics)
+        .apply(remove_punctuation)
+        .apply(format_name)
+    )
+    assert clean_names(MESSY_NAMES).tolist() == chained.tolist()
+
+
+def test_clean_names_custom_steps():
+    result = clean_names(MESSY_NAMES, steps=["remove_punctuation", "format_name"])
+    chained = MESSY_NAMES.apply(remove_punctuation).apply(format_name)
+    assert result.tolist() == chained.tolist()
+    # Spaces are always cleaned at the end, even when the last step would not
+    assert clean_names(pd.Series(["Jane 4 Doe"]), steps=["remove_numbers"]).tolist() == ["Jane Doe"]
+
+
+def test_clean_names_errors():
+    messy = pd.Series(["JANE DOE", None, 12], index=[5, 6, 7])
+    assert clean_names(messy, errors="coerce").tolist() == ["Jane Doe", None, None]
+    ignored = clean_names(messy, errors="ignore")
+    assert ignored.tolist() == ["Jane Doe", None, 12]
+    assert ignored.index.equals(messy.index)
+    with pytest.raises(TypeError, match="Text must be a string, not NoneType"):
+        clean_names(messy)
+    with pytest.raises(TypeError, match="series must be a pandas Series"):
+        clean_names("Jane Doe")
+    with pytest.raises(ValueError, match="Unknown cleaning step"):
+        clean_names(messy, steps=["remove_numbers", "shout"])
+    with pytest.raises(ValueError, match="at least one"):
+        clean_names(messy, steps=[])
+
+
+# CANONICAL FIRST NAME
+@pytest.mark.parametrize("name, expected", [
+    ("Mike", "Michael"),
+    (" bex ", "Rebecca"),
+    ("MICHAEL", "Michael"),
+    ("Alex", "Alex"),
+    ("Jane", "Jane"),
+    # Nicknames for more than one name or gender are returned unchanged
+    ("Dan", "Dan"),
+    ("Fred", "Fred"),
+    ("Ed", "Ed"),
+    ("Nick", "Nick"),
+    ("Steph", "Steph"),
+])
+def test_canonical_first_name(name, expected):
+    assert canonical_first_name(name) == expected
+
+
+def test_canonical_first_name_series_matches_scalar():
+    names = pd.Series(["Mike", "Jane", "Bob", "Mike", "Tom"], index=[3, 4, 5, 6, 7])
+    result = canonical_first_name(names)
+    assert result.tolist() == [canonical_first_name(name) for name in names]
+    assert result.index.equals(names.index)
+
+
+def test_canonical_first_name_aliases_extend_and_override():
+    names = pd.Series(["Bekah", "Bex", "Mike"])
+    aliases = {"Rebecca": ["Bekah"], "Mikhail": "mike"}
+    assert canonical_first_name(names, aliases=aliases).tolist() == ["Rebecca", "Rebecca", "Mikhail"]
+
+
+@pytest.mark.parametrize("errors, expected", [
+    ("ignore", ["Michael", 12, None]),
+    ("coerce", ["Michael", None, None]),
+])
+def test_canonical_first_name_series_errors(errors, expected):
+    assert canonical_first_name(pd.Series(["Mike", 12, None]), errors=errors).tolist() == expected
+
+
+def test_canonical_first_name_errors():
+    with pytest.raises(TypeError, match="Text must be a string, not int"):
+        canonical_first_name(12)
+    with pytest.raises(TypeError, match="aliases must be a dict, not list"):
+        canonical_first_name("Mike", aliases=["Bekah"])
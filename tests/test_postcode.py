@@ -1,6 +1,17 @@
+import os
+
+import numpy as np
 import pytest
-from heat_helper.postcode import format_postcode
-from heat_helper.exceptions import InvalidPostcodeError
+import pandas as pd
+from heat_helper.postcode import (
+    format_postcode,
+    split_postcode,
+    build_postcode_index,
+    postcode_exists,
+    lookup_postcode,
+    correct_postcode,
+)
+from heat_helper.exceptions import ColumnDoesNotExistError, InvalidPostcodeError, UnknownPostcodeError
 from heat_helper.core import _is_valid_postcode
 
 
@@ -72,4 +83,171 @@ def test_postcode_type_safety():
     ],
 )
 def test_is_valid_postcode_logic(postcode, expected):
-    assert _is_valid_postcode(postcode) == expected
\ No newline at end of file
+    assert _is_valid_postcode(postcode) == expected
+
+def test_format_postcode_series_matches_scalar():
+    postcodes = pd.Series(["st55bg", " sw1a1aa ", "st55bg", "NOT A POSTCODE", 12, None], index=list("abcdef"))
+    for errors in ("ignore", "coerce"):
+        result = format_postcode(postcodes, errors=errors)
+        assert result.tolist() == postcodes.apply(format_postcode, errors=errors).tolist()
+        assert result.index.equals(postcodes.index)
+    with pytest.raises(InvalidPostcodeError):
+        format_postcode(postcodes)
+
+
+def test_format_postcode_series_raises_first_bad_value():
+    with pytest.raises(TypeError, match="Postcode must be a string, not int"):
+        format_postcode(pd.Series(["st55bg", 12, "ABC1 1AA"]))
+    with pytest.raises(InvalidPostcodeError):
+        format_postcode(pd.Series(["st55bg", "ABC1 1AA", 12]))
+
+
+def test_format_postcode_series_categorical():
+    postcodes = pd.Series(["st55bg", "ST5 5BG", "sw1a1aa", "ST1", None], name="Postcode")
+    result = format_postcode(postcodes, errors="coerce", categorical=True)
+    assert isinstance(result.dtype, pd.CategoricalDtype)
+    assert sorted(result.cat.categories) == ["ST5 5BG", "SW1A 1AA"]
+    assert result.tolist()[:3] == ["ST5 5BG", "ST5 5BG", "SW1A 1AA"]
+    assert result.isna().tolist() == [False, False, False, True, True]
+    assert result.name == "Postcode"
+
+
+def test_split_postcode():
+    postcodes = pd.Series(["SW1A 1AA", "M1 1AE", None, "sw1a1aa", "SW1A 1AA"], index=list("abcde"))
+    result = split_postcode(postcodes)
+    assert result.index.equals(postcodes.index)
+    assert result.loc["a"].tolist() == ["SW", "SW1A", "SW1A 1", "SW1A", "1AA"]
+    assert result.loc["b"].tolist() == ["M", "M1", "M1 1", "M1", "1AE"]
+    # Missing and unformatted postcodes give missing parts
+    assert result.loc[["c", "d"]].isna().all().all()
+    assert all(isinstance(dtype, pd.CategoricalDtype) for dtype in result.dtypes)
+
+
+def test_split_postcode_all_missing():
+    result = split_postcode(pd.Series([None, None]))
+    assert result.isna().all().all()
+    assert list(result.columns) == ["Postcode Area", "Postcode District", "Postcode Sector", "Outcode", "Incode"]
+
+
+def test_split_postcode_type_error():
+    with pytest.raises(TypeError, match="postcodes must be a pandas Series, not str"):
+        split_postcode("SW1A 1AA")
+
+
+# --- Local postcode index ---
+
+
+@pytest.fixture
+def postcode_index(tmp_path):
+    """A small ONS-style postcode directory, indexed."""
+    csv_path = tmp_path / "onspd.csv"
+    pd.DataFrame(
+        {
+            "pcds": ["SW1A 1AA", "ST5 5BG", "M1 1AE", "EC1A 1BB", "not valid"],
+            "doterm": ["", "", "", "201501", ""],
+            "lsoa21": ["E01004736", "E01029451", "", "E01032739", "E01000001"],
+            "lad": ["E09000033", "E07000195", "E08000003", "E09000001", "E09000001"],
+        }
+    ).to_csv(csv_path, index=False)
+    index_dir = tmp_path / "index"
+    count = build_postcode_index(
+        str(csv_path), str(index_dir), columns=["lsoa21", "lad"], terminated_col="doterm"
+    )
+    return str(index_dir), count
+
+
+def test_build_postcode_index(postcode_index):
+    index_dir, count = postcode_index
+    # The terminated and invalid rows are left out
+    assert count == 3
+    keys = np.load(f"{index_dir}/postcodes.npy")
+    assert keys.tolist() == [b"M1 1AE", b"ST5 5BG", b"SW1A 1AA"]
+
+
+def test_build_postcode_index_missing_column(tmp_path):
+    csv_path = tmp_path / "onspd.csv"
+    pd.DataFrame({"pcds": ["SW1A 1AA"]}).to_csv(csv_path, index=False)
+    with pytest.raises(ColumnDoesNotExistError, match="'lsoa21' not found"):
+        build_postcode_index(str(csv_path), str(tmp_path / "index"), columns=["lsoa21"])
+
+
+def test_postcode_exists(postcode_index):
+    index_dir, _ = postcode_index
+    postcodes = pd.Series(["sw1a1aa", "SW1A 1AB", "EC1A 1BB", None, "M1 1AE", 12], index=list("abcdef"))
+    result = postcode_exists(postcodes, index_dir)
+    assert result.tolist() == [True, False, False, False, True, False]
+    assert result.index.equals(postcodes.index)
+
+
+def test_lookup_postcode(postcode_index):
+    index_dir, _ = postcode_index
+    postcodes = pd.Series(["st5 5bg", "ZZ1 1ZZ", "M1 1AE", "ST5 5BG"])
+    result = lookup_postcode(postcodes, index_dir)
+    assert list(result.columns) == ["lsoa21", "lad"]
+    assert result["lad"].tolist()[2:] == ["E08000003", "E07000195"]
+    assert result.loc[0].tolist() == ["E01029451", "E07000195"]
+    # Unknown postcodes and blank attributes are missing
+    assert result.loc[1].isna().all()
+    assert pd.isna(result.loc[2, "lsoa21"])
+    assert all(isinstance(dtype, pd.CategoricalDtype) for dtype in result.dtypes)
+
+    assert list(lookup_postcode(postcodes, index_dir, columns=["lad"]).columns) == ["lad"]
+    with pytest.raises(ColumnDoesNotExistError, match="'msoa21' not found"):
+        lookup_postcode(postcodes, index_dir, columns=["msoa21"])
+
+
+def test_postcode_index_rebuilt_is_reread(postcode_index, tmp_path):
+    index_dir, _ = postcode_index
+    assert not postcode_exists(pd.Series(["B33 8TH"]), index_dir).iloc[0]
+    csv_path = tmp_path / "new.csv"
+    pd.DataFrame({"pcds": ["B33 8TH"]}).to_csv(csv_path, index=False)
+    build_postcode_index(str(csv_path), index_dir)
+    # A rebuild in the same instant as the first build would share its modification time
+    os.utime(f"{index_dir}/meta.json", ns=(1, 1))
+    assert postcode_exists(pd.Series(["B33 8TH"]), index_dir).iloc[0]
+
+
+# --- Correct postcode ---
+
+REFERENCE_POSTCODES = ["SW1A 1AA", "ST5 5BG", "M1 1AE", "EC1A 1BB", "B33 8TH", "W1A 0AX", "W1A 0AY"]
+
+
+@pytest.mark.parametrize(
+    "postcode, expected",
+    [
+        ("sw1a1aa", "SW1A 1AA"),  # Already a reference postcode
+        ("5T5 5BG", "ST5 5BG"),  # S read as 5
+        ("EC1A IBB", "EC1A 1BB"),  # 1 read as I
+        ("W1A OAX", "W1A 0AX"),  # 0 read as O
+        ("M1 1EA", "M1 1AE"),  # Neighbouring characters swapped
+        ("B33 8T", "B33 8TH"),  # Character missing
+        ("W1A 0AZ", None),  # Could be W1A 0AX or W1A 0AY
+        ("ZZ9 9ZZ", None),  # Nothing close
+    ],
+)
+def test_correct_postcode(postcode, expected):
+    result = correct_postcode(pd.Series([postcode]), REFERENCE_POSTCODES, errors="coerce")
+    assert result.iloc[0] == expected
+
+
+def test_correct_postcode_errors():
+    postcodes = pd.Series(["5T5 5BG", "ZZ9 9ZZ", None], index=list("abc"))
+    assert correct_postcode(postcodes, REFERENCE_POSTCODES, errors="ignore").tolist() == ["ST5 5BG", "ZZ9 9ZZ", None]
+    assert correct_postcode(postcodes, REFERENCE_POSTCODES, errors="coerce").index.equals(postcodes.index)
+    with pytest.raises(TypeError, match="Postcode must be a string, not NoneType"):
+        correct_postcode(postcodes, REFERENCE_POSTCODES)
+    with pytest.raises(UnknownPostcodeError, match="ZZ9 9ZZ"):
+        correct_postcode(postcodes.iloc[:2], REFERENCE_POSTCODES)
+
+
+def test_correct_postcode_against_index(postcode_index):
+    index_dir, _ = postcode_index
+    postcodes = pd.Series(["5T5 5BG", "M1 1AE", "EC1A 1BB"])
+    # EC1A 1BB was left out of the index as it is terminated
+    assert correct_postcode(postcodes, index_dir, errors="coerce").tolist() == ["ST5 5BG", "M1 1AE", None]
+
+
+def test_correct_postcode_bad_reference():
+    with pytest.raises(TypeError, match="reference must be a postcode index folder"):
+        correct_postcode(pd.Series(["ST5 5BG"]), 12)
+
@@ -1,4 +1,5 @@
 import pytest
+import pandas as pd
 from datetime import date
 from heat_helper.yeargroup import clean_year_group, calculate_year_group_from_date
 from heat_helper.exceptions import InvalidYearGroupError, FELevelError
@@ -43,6 +44,16 @@ def test_clean_year_group_coerce():
     assert clean_year_group("Unknown", errors="coerce") is None
 
 
+def test_clean_year_group_series():
+    year_groups = pd.Series(["Year 7", "y7", 7, 7.0, True, "R", "Unknown", None])
+    coerced = clean_year_group(year_groups, errors="coerce")
+    assert coerced.tolist() == ["Year 7", "Year 7", "Year 7", "Year 7", None, "Reception", None, None]
+    ignored = clean_year_group(year_groups, errors="ignore")
+    assert ignored.tolist() == year_groups.apply(clean_year_group, errors="ignore").tolist()
+    with pytest.raises(TypeError):
+        clean_year_group(year_groups)
+
+
 def test_fe_level():
     with pytest.raises(FELevelError):
         clean_year_group("FE Level 3")
@@ -90,3 +101,51 @@ def test_calculate_year_group_boundaries_and_offsets():
     
     # Born June 2020: offset 4. 2025 - 2020 - 4 = Year 1.
     assert calculate_year_group_from_date(date(2020, 6, 1), 2025) == "Year 1"
+
+
+def test_calculate_year_group_series():
+    dates = pd.Series(
+        pd.to_datetime(["2020-09-01", "2020-01-01", "2024-01-01", "2013-08-31", "2013-09-01"]),
+        index=list("abcde"),
+    )
+    result = calculate_year_group_from_date(dates, 2025)
+    assert isinstance(result.dtype, pd.CategoricalDtype)
+    assert result.index.equals(dates.index)
+    assert result.tolist() == ["Reception", "Year 1", "Student too young for school", "Year 8", "Year 7"]
+
+
+def test_calculate_year_group_series_matches_scalar():
+    dates = pd.Series([date(2008, 12, 25), date(2014, 2, 20), date(2019, 9, 1), date(2025, 1, 1)])
+    result = calculate_year_group_from_date(dates, 2025)
+    assert result.tolist() == [calculate_year_group_from_date(d, 2025) for d in dates]
+
+
+def test_calculate_year_group_series_errors():
+    dates = pd.Series([date(2020, 1, 1), None, "2020-01-01", date(2005, 10, 1), date(1500, 1, 1)])
+    result = calculate_year_group_from_date(dates, 2025, errors="ignore")
+    assert result.iloc[0] == "Year 1"
+    assert result.iloc[1:].isna().all()
+
+    with pytest.raises(TypeError, match="not NoneType"):
+        calculate_year_group_from_date(dates, 2025)
+    with pytest.raises(InvalidYearGroupError, match="Year 15"):
+        calculate_year_group_from_date(dates.iloc[[0, 3]], 2025)
+    with pytest.raises(TypeError, match="not NaTType"):
+        calculate_year_group_from_date(pd.Series(pd.to_datetime(["2020-01-01", None])), 2025)
+
+
+@pytest.mark.parametrize("errors", ["raise", "ignore"])
+def test_calculate_year_group_series_dates_pandas_cannot_hold(errors):
+    # Both dates are outside the datetime64[ns] range (1677 to 2262)
+    dates = pd.Series([date(3000, 1, 1), date(2020, 1, 1)])
+    result = calculate_year_group_from_date(dates, 2025, errors=errors)
+    assert result.tolist() == ["Student too young for school", "Year 1"]
+    assert calculate_year_group_from_date(date(3000, 1, 1), 2025, errors=errors) == "Student too young for school"
+
+
+def test_calculate_year_group_series_date_before_1677():
+    dates = pd.Series([date(1500, 1, 1)])
+    assert calculate_year_group_from_date(dates, 2025, errors="ignore").isna().all()
+    with pytest.raises(InvalidYearGroupError, match="Year 521"):
+        calculate_year_group_from_date(dates, 2025)
+